@@ -5,6 +5,11 @@ from PyQt6.QtCore import QObject, pyqtSignal, QThread
 
 from src.backend.audio_stream import AudioService
 from src.backend.llm_service import LLMService
+from src.backend.streaming_transcriber import StreamingTranscriber
+from src.backend.transcription import TranscriptionError
+from src.backend.speculation import SpeculativeAnswer
+from src.backend.utterance_queue import UtteranceQueue
+from src.backend.cancellation import CancelToken
 from src.backend.database import DatabaseManager
 from src.backend.config import load_config
 from src.ui.wizard import SetupWizard
@@ -14,55 +19,113 @@ from src.ui.overlay import OverlayWindow
 class LLMWorker(QObject):
     """Worker to handle blocking LLM calls."""
     transcription_ready = pyqtSignal(str)
+    transcription_failed = pyqtSignal(str)
     answer_chunk = pyqtSignal(str)
-    answer_complete = pyqtSignal(str) # New signal for DB saving
+    turn_complete = pyqtSignal(str, str) # Question and answer, for DB saving (not sent when cancelled)
     finished = pyqtSignal()
 
-    def __init__(self, llm_service, audio_bytes):
+    def __init__(self, llm_service, transcript_future=None, speculation=None):
         super().__init__()
         self.llm_service = llm_service
-        self.audio_bytes = audio_bytes
+        self.transcript_future = transcript_future
+        self.speculation = speculation # Adopted SpeculativeAnswer, already transcribing/generating
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        """Aborts the answer (preempted by a newer question or the stop hotkey). The turn isn't kept."""
+        self.cancel_token.cancel()
+        if self.speculation:
+            self.speculation.cancel()
 
     def run(self):
-        # 1. Transcribe
-        transcription_obj = self.llm_service.transcribe(self.audio_bytes)
-        if hasattr(transcription_obj, 'text'):
-            text = transcription_obj.text
+        # 1. Transcribe (partial windows were already sent while the speaker was talking)
+        if self.speculation:
+            text = self.speculation.transcript() # None if transcription failed
         else:
-            text = str(transcription_obj) # Error string
+            try:
+                text = self.transcript_future.result()
+            except TranscriptionError:
+                text = None
+
+        if self.cancel_token.cancelled:
+            # Preempted or stopped before the question was transcribed: nothing to show or keep
+            self.finished.emit()
+            return
+
+        if text is None:
+            # Every transcription backend failed: there is no question to answer
+            self.transcription_failed.emit("[Couldn't transcribe the question - transcription unavailable]")
+            self.finished.emit()
+            return
 
         self.transcription_ready.emit(text)
+        if self.speculation:
+            chunks = self.speculation.stream()
+        else:
+            chunks = self.llm_service.generate_answer(text, cancel_token=self.cancel_token)
 
         # 2. Generate
         full_answer = ""
-        for chunk in self.llm_service.generate_answer(text):
+        for chunk in chunks:
+            if self.cancel_token.cancelled:
+                break
             full_answer += chunk
             self.answer_chunk.emit(chunk)
 
-        self.answer_complete.emit(full_answer)
+        if self.cancel_token.cancelled:
+            # The question and partial answer stay on screen but, like the history, the database doesn't keep them
+            self.finished.emit()
+            return
+
+        if self.speculation and self.speculation.succeeded:
+            self.llm_service.record_turn(text, full_answer)
+
+        self.turn_complete.emit(text, full_answer)
         self.finished.emit()
 
 class RegenerationWorker(QObject):
     """Worker to handle regeneration of the last answer."""
     answer_chunk = pyqtSignal(str)
-    answer_complete = pyqtSignal(str)
+    answer_complete = pyqtSignal(str) # The new answer, for DB saving (not sent when cancelled or failed)
+    answer_restored = pyqtSignal(str) # The previous answer, which stands when regeneration doesn't finish
     finished = pyqtSignal()
 
-    def __init__(self, llm_service, query):
+    def __init__(self, llm_service, query, previous_answer):
         super().__init__()
         self.llm_service = llm_service
         self.query = query
+        self.previous_answer = previous_answer
+        self.cancel_token = CancelToken()
+
+    def cancel(self):
+        self.cancel_token.cancel()
 
     def run(self):
         full_answer = ""
         # Provide variation instruction
         instruction = "Provide a variation or alternative phrasing for this response. Keep the same core meaning but change the delivery."
 
-        for chunk in self.llm_service.generate_answer(self.query, system_instruction=instruction):
+        # The turn being regenerated is out of the history; it goes back once we know which answer stands
+        chunks = self.llm_service.generate_answer(self.query, system_instruction=instruction, record_history=False,
+                                                  cancel_token=self.cancel_token)
+        succeeded = False
+        while not self.cancel_token.cancelled:
+            try:
+                chunk = next(chunks)
+            except StopIteration as stop:
+                succeeded = bool(stop.value)
+                break
             full_answer += chunk
             self.answer_chunk.emit(chunk)
+        chunks.close()
 
-        self.answer_complete.emit(full_answer)
+        if succeeded and not self.cancel_token.cancelled:
+            self.llm_service.record_turn(self.query, full_answer)
+            self.answer_complete.emit(full_answer)
+        else:
+            # Cancelled or every model failed: keep the previous answer
+            self.llm_service.record_turn(self.query, self.previous_answer)
+            self.answer_restored.emit(self.previous_answer)
         self.finished.emit()
 
 class ReportWorker(QObject):
@@ -92,6 +155,12 @@ class StartupWorker(QObject):
         is_connected = self.llm_service.verify_primary_connection()
         self.primary_connected.emit(is_connected)
 
+        # 3. Load the local Whisper model (if configured) so the first failover doesn't wait for it
+        self.llm_service.transcriber.prepare()
+
+        # 4. Load the tokenizer for prompt budgets
+        self.llm_service.prompt_builder.counter.prepare()
+
         self.finished.emit()
 
 class MainController(QObject):
@@ -109,23 +178,68 @@ class MainController(QObject):
         self.overlay.toggle_listening.connect(self.handle_listening_toggle)
         self.overlay.end_interview.connect(self.handle_end_interview)
         self.overlay.regenerate_requested.connect(self.handle_regeneration)
+        self.overlay.stop_requested.connect(self.stop_answer)
 
         # Backend
         self.llm_service = LLMService(
             db_manager=self.db,
             groq_key=self.config.get("groq_api_key"),
             openrouter_key=self.config.get("openrouter_api_key"),
-            zhipu_key=self.config.get("zhipu_api_key")
+            zhipu_key=self.config.get("zhipu_api_key"),
+            audio_codec=self.config.get("audio_codec", "wav"),
+            local_whisper_model_path=self.config.get("local_whisper_model_path"),
+            transcription_backends=self.config.get("transcription_backends", ["groq"]),
+            groq_timeout_s=self.config.get("groq_transcription_timeout_s"),
+            transcription_cache_size=self.config.get("transcription_cache_size", 0),
+            persist_transcription_cache=self.config.get("persist_transcription_cache", False),
+            hedge_after_ms=self.config.get("hedge_after_ms", 0),
+            adaptive_model_order=self.config.get("adaptive_model_order", False),
+            connect_timeout_s=self.config.get("llm_connect_timeout_s"),
+            first_token_timeout_s=self.config.get("llm_first_token_timeout_s"),
+            stall_timeout_s=self.config.get("llm_stall_timeout_s"),
+            http_keepalive_s=self.config.get("http_keepalive_s", 120),
+            http_warm_interval_s=self.config.get("http_warm_interval_s"),
+            prompt_budgets=self.config.get("prompt_budgets")
         )
         # Load context if available
         self.reload_context()
 
-        self.audio_service = AudioService()
+        self.transcriber = StreamingTranscriber(self.llm_service)
+
+        self.speculation = None
+
+        # Questions asked while an answer is still streaming wait here (0 = drop them)
+        self.utterance_queue = UtteranceQueue(
+            max_pending=self.config.get("utterance_queue_size", 0),
+            policy=self.config.get("utterance_queue_policy", "merge")
+        )
+
+        self.audio_service = AudioService(
+            streaming_window_ms=self.config.get("streaming_window_ms", 0),
+            speculative_silence_ms=self.config.get("speculative_silence_ms", 0),
+            vad_aggressiveness=self.config.get("vad_aggressiveness", 3),
+            adaptive_endpointing=self.config.get("adaptive_endpointing", False),
+            energy_gate_rms=self.config.get("energy_gate_rms", 0),
+            level_rate_hz=self.config.get("level_meter_hz", 0),
+            preroll_ms=self.config.get("preroll_ms", 0),
+            max_utterance_ms=self.config.get("max_utterance_ms", 30000),
+            native_rate=self.config.get("native_rate_capture", False),
+            channel=self.config.get("interviewer_channel", 0),
+            noise_suppression=self.config.get("noise_suppression", False),
+            auto_gain=self.config.get("auto_gain", False)
+        )
         self.audio_service.speaking_started.connect(self.on_speech_start)
         self.audio_service.speaking_stopped.connect(self.on_speech_stop)
+        self.audio_service.audio_segment.connect(self.transcriber.feed)
+        self.audio_service.speculative_endpoint.connect(self.on_speculative_endpoint)
+        self.audio_service.speculation_cancelled.connect(self.cancel_speculation)
         self.audio_service.audio_captured.connect(self.on_audio_captured)
         self.audio_service.audio_level.connect(self.overlay.update_audio_level)
 
+        # Own microphone on its own VAD: the candidate's answers are logged, never transcribed
+        self.mic_service = self.create_mic_service()
+        self.own_speech_bytes = 0
+
         self.worker_thread = None
 
         # Apply audio device config
@@ -139,6 +253,38 @@ class MainController(QObject):
         # Async Startup
         self.run_startup_tasks()
 
+    def create_mic_service(self):
+        mic_channel = self.config.get("mic_channel")
+        mic_device = self.config.get("mic_device_index")
+        if mic_channel is None and mic_device is None:
+            return None
+
+        mic_service = AudioService(
+            vad_aggressiveness=self.config.get("vad_aggressiveness", 3),
+            adaptive_endpointing=self.config.get("adaptive_endpointing", False),
+            energy_gate_rms=self.config.get("energy_gate_rms", 0),
+            max_utterance_ms=self.config.get("max_utterance_ms", 30000),
+            native_rate=self.config.get("native_rate_capture", False),
+            noise_suppression=self.config.get("noise_suppression", False),
+            auto_gain=self.config.get("auto_gain", False),
+            speaker="candidate"
+        )
+        if mic_channel is not None:
+            # Same device (e.g. 2ch aggregate): one stream, channels endpointed separately
+            self.audio_service.attach_channel(mic_service, mic_channel)
+        else:
+            mic_service.set_device(mic_device)
+        mic_service.audio_segment.connect(self.on_own_speech_segment)
+        mic_service.audio_captured.connect(self.on_own_speech)
+        return mic_service
+
+    def capture_services(self):
+        """Services with a stream of their own (an attached mic channel follows its source)."""
+        services = [self.audio_service]
+        if self.mic_service and self.mic_service.source is None:
+            services.append(self.mic_service)
+        return services
+
     def run_startup_tasks(self):
         self.overlay.set_full_text("Loading Knowledge Base... Please wait.")
         self.startup_thread = QThread()
@@ -195,10 +341,14 @@ class MainController(QObject):
 
     def handle_listening_toggle(self, should_listen):
         if should_listen:
-            self.audio_service.start()
+            for service in self.capture_services():
+                service.start()
             self.overlay.set_status("listening")
         else:
-            self.audio_service.stop()
+            for service in self.capture_services():
+                service.stop()
+            self.cancel_speculation()
+            self.transcriber.reset() # Drop windows of an utterance cut off by muting
             self.overlay.set_status("idle")
 
     def on_speech_start(self):
@@ -215,7 +365,9 @@ class MainController(QObject):
         except RuntimeError:
             self.report_thread = None
 
-        self.audio_service.stop()
+        for service in self.capture_services():
+            service.stop()
+        self.utterance_queue.clear()
         self.overlay.set_status("processing")
         self.overlay.set_full_text("Generating interview report... Please wait.")
 
@@ -229,86 +381,146 @@ class MainController(QObject):
         self.report_worker.finished.connect(QApplication.instance().quit)
         self.report_thread.start()
 
+    def on_own_speech_segment(self, audio_bytes):
+        self.own_speech_bytes += len(audio_bytes)
+
+    def on_own_speech(self, audio_bytes):
+        """Candidate finished speaking: store only the duration, skip transcription."""
+        total = self.own_speech_bytes + len(audio_bytes)
+        self.own_speech_bytes = 0
+        duration_ms = total / 2 / self.mic_service.sample_rate * 1000
+        self.db.save_speech_event(self.current_interview_id, "candidate", duration_ms)
+
+    def is_busy(self):
+        try:
+            return bool(self.worker_thread and self.worker_thread.isRunning())
+        except RuntimeError:
+            # Thread object might be deleted but reference exists
+            self.worker_thread = None
+            return False
+
+    def on_speculative_endpoint(self, audio_bytes):
+        """Short pause: start answering now, in case the question really ended."""
+        if self.is_busy():
+            return
+        self.cancel_speculation()
+        self.speculation = SpeculativeAnswer(self.llm_service, self.transcriber.preview(audio_bytes)).start()
+
+    def stop_answer(self):
+        """Hotkey: abort the answer being generated and free the worker for the next question."""
+        self.cancel_speculation()
+        if self.is_busy():
+            self.worker.cancel()
+
+    def cancel_speculation(self):
+        if self.speculation:
+            self.speculation.cancel()
+            self.speculation = None
+
     def on_audio_captured(self, audio_bytes):
         # Prevent overlapping processing and handle safe thread checks
-        try:
-            if self.worker_thread and self.worker_thread.isRunning():
+        if self.is_busy():
+            self.cancel_speculation()
+            if not self.utterance_queue.enabled:
+                self.transcriber.reset()
                 return
-        except RuntimeError:
-             # Thread object might be deleted but reference exists
-             self.worker_thread = None
+            # Transcribe now, overlapping the current answer; answer once it is done
+            if self.utterance_queue.push(self.transcriber.finish(audio_bytes)):
+                self.worker.cancel()
+            return
+
+        if self.speculation:
+            # Endpoint confirmed: adopt the work started at the pause
+            speculation = self.speculation
+            self.speculation = None
+            self.transcriber.reset()
+            self.start_answer(speculation=speculation)
+        else:
+            self.start_answer(self.transcriber.finish(audio_bytes))
 
+    def start_answer(self, transcript_future=None, speculation=None):
         self.overlay.set_status("processing")
         # Removed clear_text to keep history
 
         # Run LLM in separate thread
         self.worker_thread = QThread()
-        self.worker = LLMWorker(self.llm_service, audio_bytes)
+        self.worker = LLMWorker(self.llm_service, transcript_future, speculation=speculation)
         self.worker.moveToThread(self.worker_thread)
 
         self.worker_thread.started.connect(self.worker.run)
         self.worker.transcription_ready.connect(self.overlay.add_transcription)
-        self.worker.transcription_ready.connect(self.save_user_transcript)
+        self.worker.transcription_failed.connect(self.overlay.add_transcription)
         self.worker.answer_chunk.connect(self.overlay.add_answer_chunk)
-        self.worker.answer_complete.connect(self.save_ai_transcript)
+        self.worker.turn_complete.connect(self.save_turn)
         self.worker.finished.connect(self.worker_thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
+        self.connect_worker_thread()
+
+        self.worker_thread.start()
+
+    def connect_worker_thread(self):
         self.worker_thread.finished.connect(self.worker_thread.deleteLater)
         self.worker_thread.finished.connect(self.cleanup_thread)
         self.worker_thread.finished.connect(lambda: self.overlay.set_status("listening" if self.overlay.is_listening else "idle"))
+        self.worker_thread.finished.connect(self.answer_next_utterance)
 
-        self.worker_thread.start()
+    def answer_next_utterance(self):
+        """Starts on the oldest question that arrived while the last answer was streaming."""
+        if self.is_busy():
+            return
+        transcript = self.utterance_queue.pop()
+        if transcript is not None:
+            self.start_answer(transcript)
 
-    def save_user_transcript(self, text):
-        self.db.save_transcript(self.current_interview_id, "user", text)
+    def save_turn(self, question, answer):
+        self.db.save_transcript(self.current_interview_id, "user", question)
+        self.save_ai_transcript(answer)
 
     def save_ai_transcript(self, text):
         self.db.save_transcript(self.current_interview_id, "ai", text)
 
+    def replace_ai_transcript(self, text):
+        # The user query remains valid, so we keep it. We only replace the AI answer.
+        self.db.delete_last_transcript(self.current_interview_id, "ai")
+        self.save_ai_transcript(text)
+
+    def restore_ai_message(self, text):
+        self.overlay.reset_last_ai_message()
+        self.overlay.add_answer_chunk(text)
+
     def cleanup_thread(self):
         self.worker_thread = None
 
     def handle_regeneration(self):
         """Regenerates the last AI response."""
         # Check if busy
-        try:
-            if self.worker_thread and self.worker_thread.isRunning():
-                return
-        except RuntimeError:
-            self.worker_thread = None
+        if self.is_busy():
+            return
+        self.cancel_speculation()
 
-        # Undo last turn
+        # Undo last turn; the worker puts it back with whichever answer stands
+        history = self.llm_service.transcript_history
+        previous_answer = history[-1]["content"] if history else ""
         last_query = self.llm_service.undo_last_turn()
         if not last_query:
             return # Nothing to regenerate
 
-        # Fix State Corruption:
-        # undo_last_turn removed the User query from memory, but it still exists in DB.
-        # We need to add it back to memory so history is [..., User, AI_New] after regeneration.
-        # We append directly to list to avoid triggering a DB save.
-        self.llm_service.transcript_history.append({"role": "user", "content": last_query})
-
-        # Clean up database: Remove the duplicate AI response that we are about to regenerate
-        # The user query remains valid, so we keep it. We only replace the AI answer.
-        self.db.delete_last_transcript(self.current_interview_id, "ai")
-
         # Update UI
         self.overlay.reset_last_ai_message()
         self.overlay.set_status("processing")
 
         # Start Worker
         self.worker_thread = QThread()
-        self.worker = RegenerationWorker(self.llm_service, last_query)
+        self.worker = RegenerationWorker(self.llm_service, last_query, previous_answer)
         self.worker.moveToThread(self.worker_thread)
 
         self.worker_thread.started.connect(self.worker.run)
         self.worker.answer_chunk.connect(self.overlay.add_answer_chunk)
-        self.worker.answer_complete.connect(self.save_ai_transcript) # Save the new version
+        self.worker.answer_complete.connect(self.replace_ai_transcript) # Save the new version
+        self.worker.answer_restored.connect(self.restore_ai_message)
         self.worker.finished.connect(self.worker_thread.quit)
         self.worker.finished.connect(self.worker.deleteLater)
-        self.worker_thread.finished.connect(self.worker_thread.deleteLater)
-        self.worker_thread.finished.connect(self.cleanup_thread)
-        self.worker_thread.finished.connect(lambda: self.overlay.set_status("listening" if self.overlay.is_listening else "idle"))
+        self.connect_worker_thread()
 
         self.worker_thread.start()
 
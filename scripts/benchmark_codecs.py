@@ -0,0 +1,62 @@
+import sys
+import os
+import time
+import wave
+import logging
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+logging.getLogger("AudioCodec").setLevel(logging.WARNING)
+
+from src.backend.audio_codec import ENCODERS
+
+SAMPLE_RATE = 16000
+DURATION_S = 15
+ITERATIONS = 20
+UPLINK_KBPS = 1000 # Hotel Wi-Fi class uplink
+
+def synthesize_speech_like(duration_s):
+    """Voiced harmonics with syllable-rate modulation, pauses and a little noise."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SAMPLE_RATE * duration_s)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.3 * t) > -0.6)
+    signal = voiced * envelope + 0.01 * rng.standard_normal(t.size)
+    return (signal / np.abs(signal).max() * 12000).astype(np.int16).tobytes()
+
+def load_wav(path):
+    with wave.open(path, 'rb') as wf:
+        if wf.getframerate() != SAMPLE_RATE or wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise SystemExit("Expected 16 kHz, 16-bit mono WAV")
+        return wf.readframes(wf.getnframes())
+
+def benchmark(pcm):
+    print(f"Input: {len(pcm) / 2 / SAMPLE_RATE:.1f}s of 16 kHz mono PCM ({len(pcm)} bytes)")
+    print(f"{'Codec':<8} | {'Bytes':>9} | {'vs WAV':>7} | {'Encode ms':>9} | {'Upload ms @' + str(UPLINK_KBPS) + 'kbps':>20}")
+    print("-" * 66)
+
+    wav_size = None
+    for name, encoder_cls in ENCODERS.items():
+        encoder = encoder_cls()
+        if not encoder.available():
+            print(f"{name:<8} | unavailable (install soundfile)")
+            continue
+
+        payload = encoder.encode(pcm, SAMPLE_RATE) # Warm-up
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            payload = encoder.encode(pcm, SAMPLE_RATE)
+        encode_ms = (time.perf_counter() - start) / ITERATIONS * 1000
+
+        size = len(payload)
+        wav_size = wav_size or size
+        upload_ms = size * 8 / UPLINK_KBPS
+        print(f"{name:<8} | {size:>9} | {size / wav_size:>6.0%} | {encode_ms:>9.2f} | {upload_ms:>20.0f}")
+
+if __name__ == "__main__":
+    pcm = load_wav(sys.argv[1]) if len(sys.argv) > 1 else synthesize_speech_like(DURATION_S)
+    benchmark(pcm)
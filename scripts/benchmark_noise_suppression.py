@@ -0,0 +1,59 @@
+import sys
+import os
+import time
+import numpy as np
+import webrtcvad
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.noise_suppression import SpectralSubtractor, AutoGain
+
+SAMPLE_RATE = 16000
+FRAME = 320 # 20ms
+DURATION_S = 60
+VAD_MODE = 2
+
+def colored_noise(seconds, rms, rng):
+    """Low-frequency heavy hum/hiss, like a laptop fan picked up over a call."""
+    white = rng.standard_normal(int(SAMPLE_RATE * seconds))
+    spectrum = np.fft.rfft(white)
+    freqs = np.fft.rfftfreq(white.size, 1 / SAMPLE_RATE)
+    spectrum /= np.sqrt(np.maximum(freqs, 50.0)) # ~1/f
+    noise = np.fft.irfft(spectrum, n=white.size)
+    return noise / np.sqrt(np.mean(noise ** 2)) * rms
+
+def count_triggers(samples, condition=None):
+    """Frames webrtcvad calls speech, run the same way AudioService does."""
+    vad = webrtcvad.Vad(VAD_MODE)
+    hits = 0
+    timings = []
+    for i in range(0, samples.size - FRAME + 1, FRAME):
+        frame = samples[i:i + FRAME]
+        if condition:
+            start = time.perf_counter()
+            frame = condition(frame)
+            timings.append(time.perf_counter() - start)
+        hits += vad.is_speech(frame.astype(np.int16).tobytes(), SAMPLE_RATE)
+    return hits, timings
+
+def make_conditioner():
+    denoiser = SpectralSubtractor(FRAME)
+    agc = AutoGain()
+    def condition(frame):
+        x = denoiser.process(frame)
+        x = agc.process(x, np.sqrt(np.dot(x, x) / x.size))
+        return np.clip(np.rint(x), -32768, 32767)
+    return condition
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    frames = DURATION_S * SAMPLE_RATE // FRAME
+    print(f"{DURATION_S}s of speech-free loopback noise, webrtcvad mode {VAD_MODE}:")
+    print(f"{'Noise RMS':>9} | {'Raw triggers':>12} | {'Cleaned triggers':>16} | {'us/frame':>8}")
+    print("-" * 56)
+    for rms in (100, 300, 1000, 3000):
+        noise = np.clip(colored_noise(DURATION_S, rms, rng), -32768, 32767)
+        raw, _ = count_triggers(noise)
+        cleaned, timings = count_triggers(noise, make_conditioner())
+        print(f"{rms:>9} | {raw:>5} ({raw / frames:4.0%}) | {cleaned:>9} ({cleaned / frames:4.0%}) | {np.mean(timings) * 1e6:>8.1f}")
@@ -0,0 +1,36 @@
+import sys
+import os
+import time
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.resampler import PolyphaseResampler
+
+TARGET_RATE = 16000
+FRAME_MS = 20
+BLOCKS = 5000 # 100s of audio
+
+def benchmark(in_rate):
+    block_size = int(in_rate * FRAME_MS / 1000)
+    rng = np.random.default_rng(0)
+    block = (rng.standard_normal(block_size) * 3000).astype(np.int16)
+    resampler = PolyphaseResampler(in_rate, TARGET_RATE)
+
+    timings = np.empty(BLOCKS)
+    for i in range(BLOCKS):
+        start = time.perf_counter()
+        resampler.process(block)
+        timings[i] = time.perf_counter() - start
+
+    mean_us = timings.mean() * 1e6
+    p99_us = np.percentile(timings, 99) * 1e6
+    budget_pct = p99_us / (FRAME_MS * 1000) * 100
+    print(f"{in_rate:>6} Hz -> {TARGET_RATE} Hz | block {block_size:>4} | "
+          f"mean {mean_us:7.1f} us | p99 {p99_us:7.1f} us | {budget_pct:5.2f}% of {FRAME_MS} ms budget")
+
+if __name__ == "__main__":
+    print("Polyphase resampler, per 20 ms capture block:")
+    for rate in (44100, 48000, 96000):
+        benchmark(rate)
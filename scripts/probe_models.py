@@ -0,0 +1,141 @@
+import sys
+import os
+import json
+import time
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from openai import OpenAI
+from dotenv import load_dotenv
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.database import DatabaseManager, DB_FILE
+from src.backend.llm_service import BACKUP_MODELS
+from src.backend.model_ranking import ModelRanker, probe_model
+
+# Load env to get keys
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ModelProbe")
+
+# Candidate list of free models to test
+# Including some likely candidates based on common free tiers
+CANDIDATE_MODELS = [
+    "meta-llama/llama-3.2-3b-instruct:free",
+    "google/gemma-2-9b-it:free",
+    "meta-llama/llama-3.3-70b-instruct:free",
+    "nousresearch/hermes-3-llama-3.1-405b:free",
+    "qwen/qwen-2.5-vl-7b-instruct:free",
+    "microsoft/phi-3-mini-128k-instruct:free",
+    "mistralai/mistral-7b-instruct:free",
+    "openchat/openchat-7b:free",
+    "gryphe/mythomax-l2-13b:free"
+]
+
+STUB_MODELS = ["stub-fast", "stub-slow", "stub-missing"]
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Minimal OpenAI-compatible /chat/completions for trying the probe offline.
+
+    Streams a few words per request. Model names containing "slow" wait before the first
+    token, "missing" answers 404 like an unknown model on OpenRouter.
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        model = body.get("model", "")
+        if "missing" in model:
+            self._send_json(404, {"error": {"message": f"No endpoints found for {model}", "code": 404}})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        time.sleep(0.8 if "slow" in model else 0.05)
+        for word in ["Hello", " from", " the", " local", " stand-in."]:
+            chunk = {"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": model,
+                     "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(0.02)
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+def classify_error(error_msg):
+    if "404" in error_msg:
+        return "404 FAIL"
+    if "429" in error_msg:
+        return "429 RATE"
+    return "ERR"
+
+def probe_models(client, models, ranker, prompt, max_tokens):
+    print(f"{'Model Name':<50} | {'Status':<10} | {'TTFT ms':>8} | {'tok/s':>6} | {'Response/Error'}")
+    print("-" * 110)
+
+    for model in models:
+        try:
+            ttft_ms, tokens_per_s, text = probe_model(client, model, prompt, max_tokens)
+            ranker.record(model, ttft_ms, tokens_per_s)
+            rate = f"{tokens_per_s:.1f}" if tokens_per_s else "-"
+            print(f"{model:<50} | PASS       | {ttft_ms:>8.0f} | {rate:>6} | {text.strip()[:30]}")
+        except Exception as e:
+            ranker.record_failure(model)
+            error_msg = str(e)
+            print(f"{model:<50} | {classify_error(error_msg):<10} | {'-':>8} | {'-':>6} | {error_msg[:30]}...")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure TTFT and tokens/s of chat models and store them for adaptive ordering.")
+    parser.add_argument("models", nargs="*", help="Models to probe (default: BACKUP_MODELS plus known free candidates)")
+    parser.add_argument("--base-url", default="https://openrouter.ai/api/v1", help="Any OpenAI-compatible endpoint, e.g. http://localhost:11434/v1")
+    parser.add_argument("--api-key", default=None, help="Defaults to OPENROUTER_API_KEY")
+    parser.add_argument("--prompt", default="Say hello in five words.")
+    parser.add_argument("--max-tokens", type=int, default=20)
+    parser.add_argument("--db", default=DB_FILE, help="Database the app reads the stats from")
+    parser.add_argument("--dry-run", action="store_true", help="Print results without storing them")
+    parser.add_argument("--stub", action="store_true", help="Probe a built-in local stand-in server (implies --dry-run)")
+    args = parser.parse_args()
+
+    if args.stub:
+        server, base_url = start_stub_server()
+        api_key = "stub"
+        models = args.models or STUB_MODELS
+        args.dry_run = True
+    else:
+        base_url = args.base_url
+        api_key = args.api_key or os.getenv("OPENROUTER_API_KEY")
+        models = args.models or list(dict.fromkeys(BACKUP_MODELS + CANDIDATE_MODELS))
+        if not api_key:
+            logger.error("No OPENROUTER_API_KEY found in environment (or pass --api-key).")
+            return
+
+    client = OpenAI(base_url=base_url, api_key=api_key, max_retries=0)
+    ranker = ModelRanker(store=None if args.dry_run else DatabaseManager(args.db))
+    probe_models(client, models, ranker, args.prompt, args.max_tokens)
+
+    print("\nRecommended Priority List:")
+    print([model for model in ranker.order(models) if ranker.snapshot()[model]["successes"] > 0])
+    if not args.dry_run:
+        print(f"Stats saved to {args.db}; LLMService orders models by them when adaptive_model_order is on.")
+
+if __name__ == "__main__":
+    main()
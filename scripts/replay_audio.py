@@ -0,0 +1,78 @@
+import sys
+import os
+import json
+import argparse
+import logging
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+logging.getLogger("AudioStream").setLevel(logging.WARNING)
+
+from src.backend.audio_stream import AudioService
+from src.backend.config import DEFAULT_CONFIG
+from src.backend.replay import ReplayDriver, synthesize_pattern, load_wav
+
+# Interview-like turn taking: questions of varying length with thinking pauses
+DEFAULT_PATTERN = [("silence", 1500)] + [
+    step for speech_ms, pause_ms in [(2500, 300), (1200, 1500), (6000, 400), (900, 2000), (4000, 1200)] * 4
+    for step in (("speech", speech_ms), ("silence", pause_ms))
+] + [("silence", 1500)]
+
+def build_service(args):
+    """AudioService with the shipped defaults, as MainController would configure it."""
+    config = dict(DEFAULT_CONFIG)
+    for override in args.set or []:
+        key, _, value = override.partition("=")
+        config[key] = json.loads(value)
+
+    return AudioService(
+        streaming_window_ms=config["streaming_window_ms"],
+        speculative_silence_ms=config["speculative_silence_ms"],
+        vad_aggressiveness=config["vad_aggressiveness"],
+        adaptive_endpointing=config["adaptive_endpointing"],
+        energy_gate_rms=config["energy_gate_rms"],
+        level_rate_hz=config["level_meter_hz"],
+        preroll_ms=config["preroll_ms"],
+        max_utterance_ms=config["max_utterance_ms"],
+        noise_suppression=config["noise_suppression"],
+        auto_gain=config["auto_gain"]
+    )
+
+def print_report(name, report):
+    print(f"== {name}")
+    for key, value in report.items():
+        if isinstance(value, float):
+            value = f"{value:.2f}"
+        print(f"  {key:<24} {value}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay audio through the VAD/segmentation pipeline faster than realtime.")
+    parser.add_argument("wavs", nargs="*", help="16-bit WAV files (any rate/channels). Defaults to a synthetic interview.")
+    parser.add_argument("--noise-rms", type=float, default=30.0, help="Noise added to the synthetic pattern (int16 RMS)")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the synthetic pattern N times back to back")
+    parser.add_argument("--set", action="append", metavar="KEY=JSON", help="Override a config key, e.g. --set noise_suppression=false")
+    parser.add_argument("--json", action="store_true", help="Print one JSON object per input (for CI)")
+    parser.add_argument("--max-block-us", type=float, help="Exit non-zero if the p99 per-block cost exceeds this")
+    args = parser.parse_args()
+
+    if args.wavs:
+        inputs = [(path, *load_wav(path), None) for path in args.wavs]
+    else:
+        samples, truth = synthesize_pattern(DEFAULT_PATTERN * args.repeat, noise_rms=args.noise_rms)
+        inputs = [("synthetic", samples, 16000, truth)]
+
+    failed = False
+    for name, samples, rate, truth in inputs:
+        report = ReplayDriver(build_service(args)).run(samples, rate, truth)
+        if args.json:
+            print(json.dumps({"input": name, **report}))
+        else:
+            print_report(name, report)
+        if args.max_block_us is not None and report["block_us_p99"] > args.max_block_us:
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import io
+import struct
+import logging
+import numpy as np
+
+try:
+    import soundfile as sf
+except Exception: # ImportError, or OSError when libsndfile itself is missing
+    sf = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("AudioCodec")
+
+class WavReader(io.RawIOBase):
+    """Read-only file object over a WAV header plus a PCM buffer, without joining them.
+
+    The HTTP client reads the upload body from it in chunks, so the only copy of the PCM
+    is the one into the request itself.
+    """
+
+    def __init__(self, header, pcm):
+        super().__init__()
+        self._parts = (memoryview(header), memoryview(pcm).cast('B'))
+        self._size = len(header) + self._parts[1].nbytes
+        self._pos = 0
+
+    def __len__(self):
+        return self._size
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = min(max(base + offset, 0), self._size)
+        return self._pos
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._size - self._pos
+        chunks = []
+        while size > 0 and self._pos < self._size:
+            part, offset = self._locate(self._pos)
+            chunk = part[offset:offset + size]
+            chunks.append(chunk)
+            self._pos += len(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def _locate(self, pos):
+        header, pcm = self._parts
+        if pos < len(header):
+            return header, pos
+        return pcm, pos - len(header)
+
+class WavEncoder:
+    """Uncompressed 16-bit WAV, returned as a WavReader so the PCM is never copied to build it."""
+    name = "wav"
+    filename = "audio.wav"
+
+    def available(self):
+        return True
+
+    def encode(self, pcm_bytes, sample_rate, channels=1):
+        data_size = len(pcm_bytes)
+        header = struct.pack(
+            '<4sI4s4sIHHIIHH4sI',
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1, channels, sample_rate,
+            sample_rate * channels * 2, channels * 2, 16,
+            b'data', data_size
+        )
+        return WavReader(header, pcm_bytes)
+
+class _SoundFileEncoder:
+    """Shared path for formats written in-process through libsndfile."""
+    format = None
+    subtype = None
+    compression_level = None
+
+    def available(self):
+        return sf is not None and self.subtype in sf.available_subtypes(self.format)
+
+    def encode(self, pcm_bytes, sample_rate, channels=1):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16) # Zero-copy view (bytes or memoryview)
+        if channels > 1:
+            samples = samples.reshape(-1, channels)
+        out = io.BytesIO()
+        sf.write(out, samples, sample_rate, format=self.format, subtype=self.subtype,
+                 compression_level=self.compression_level)
+        return out.getvalue()
+
+class FlacEncoder(_SoundFileEncoder):
+    """Lossless; typically 35-50% smaller than WAV for speech."""
+    name = "flac"
+    filename = "audio.flac"
+    format = "FLAC"
+    subtype = "PCM_16"
+
+class OpusEncoder(_SoundFileEncoder):
+    """Lossy Ogg/Opus at libsndfile's default (~30 kbps), ~10x smaller than WAV.
+
+    Encoding costs roughly 50ms per second of audio, so it only pays off on slow uplinks
+    (see scripts/benchmark_codecs.py).
+    """
+    name = "opus"
+    filename = "audio.ogg"
+    format = "OGG"
+    subtype = "OPUS"
+
+ENCODERS = {
+    "wav": WavEncoder,
+    "flac": FlacEncoder,
+    "opus": OpusEncoder,
+}
+
+def get_encoder(name):
+    """Returns the encoder for `name`, falling back to WAV if it is unknown or unavailable."""
+    encoder_cls = ENCODERS.get((name or "wav").lower())
+    if encoder_cls is None:
+        logger.warning(f"Unknown audio codec '{name}', using WAV.")
+        return WavEncoder()
+
+    encoder = encoder_cls()
+    if not encoder.available():
+        logger.warning(f"Audio codec '{name}' unavailable (install soundfile), using WAV.")
+        return WavEncoder()
+    return encoder
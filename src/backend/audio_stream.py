@@ -1,41 +1,89 @@
-import sounddevice as sd
 import numpy as np
 import webrtcvad
 import threading
 import queue
 import logging
-import sys
 from PyQt6.QtCore import QObject, pyqtSignal
+from src.backend.ring_buffer import FrameRingBuffer, PrerollBuffer, UtteranceBuffer
+from src.backend.endpointing import AdaptiveEndpointer
+from src.backend.level_meter import LevelMeter
+from src.backend.resampler import PolyphaseResampler
+from src.backend.noise_suppression import SpectralSubtractor, AutoGain
+
+try:
+    import sounddevice as sd
+except Exception: # ImportError, or OSError when PortAudio itself is missing (offline replay still works)
+    sd = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("AudioStream")
 
+_LOG_SHUTDOWN = object() # Queued by stop() so the log worker exits without polling
+
 class AudioService(QObject):
     """
     Handles audio recording, VAD (Voice Activity Detection), and emits audio chunks for transcription.
     """
-    audio_captured = pyqtSignal(bytes)  # Signal emitting raw WAV data or PCM bytes
+    # Audio signals carry 16-bit PCM as a read-only memoryview (or b'' when there is nothing new);
+    # the view shares memory with the capture buffer, so nothing is copied on the way out.
+    audio_captured = pyqtSignal(object)  # Utterance done: the PCM not yet shipped as segments
+    audio_segment = pyqtSignal(object)   # Partial PCM of an utterance still in progress (streaming mode)
+    speculative_endpoint = pyqtSignal(object) # Short pause: unsent PCM so far, utterance may still continue
+    speculation_cancelled = pyqtSignal()     # Speech resumed after a speculative endpoint
     speaking_started = pyqtSignal()
     speaking_stopped = pyqtSignal()
     audio_level = pyqtSignal(float) # Signal emitting RMS amplitude (0.0 - 1.0)
 
-    def __init__(self, sample_rate=16000, frame_duration_ms=20, vad_aggressiveness=3):
+    def __init__(self, sample_rate=16000, frame_duration_ms=20, vad_aggressiveness=3, ring_capacity=256,
+                 streaming_window_ms=0, speculative_silence_ms=0, adaptive_endpointing=False,
+                 energy_gate_rms=0, level_rate_hz=0, preroll_ms=0, max_utterance_ms=30000,
+                 split_search_ms=2000, native_rate=False, channel=0, input_channels=1, speaker="interviewer",
+                 noise_suppression=False, auto_gain=False):
         super().__init__()
         self.sample_rate = sample_rate
         self.frame_duration_ms = frame_duration_ms
         self.vad = webrtcvad.Vad(vad_aggressiveness)
         self.device_index = None
         self.running = False
-        self.stream = None
-        self.buffer = queue.Queue()
         self.log_queue = queue.Queue()
+        self.log_thread = None
+        self.process_thread = None
+
+        # Each start() begins a new generation; threads and callbacks of an older one exit on
+        # their next check, so stop()/start() never wait on them.
+        self._generation = 0
+        self._wake = threading.Event() # Set by the callback for every block, and by stop()
+        # Held only for the few statements of start()/stop(): attached channels are started
+        # from the source's thread and must not interleave with a stop() from the GUI thread.
+        self._lifecycle_lock = threading.Lock()
         self.frame_size = int(sample_rate * frame_duration_ms / 1000)
 
+        # Lock-free SPSC ring between the PortAudio callback and the VAD thread.
+        # 256 frames * 20ms = ~5s of slack before the callback starts dropping.
+        self.buffer = FrameRingBuffer(self.frame_size, ring_capacity)
+        self._reported_overruns = 0
+
+        # Native-rate capture: open the device at its own rate (44.1/48 kHz) and resample to
+        # sample_rate on the VAD thread, instead of relying on driver resampling.
+        self.native_rate = native_rate
+        self.capture_rate = sample_rate
+        self.resampler = None
+        self._resampled = np.zeros(self.frame_size * 4, dtype=np.int16) # Re-framing accumulator
+        self._resampled_count = 0
+
+        # Multi-channel capture: this service endpoints `channel` of the stream. Other channels
+        # can be attached to their own AudioService (see attach_channel) so each side of the
+        # conversation keeps independent VAD state while sharing one device stream.
+        self.channel = channel
+        self.input_channels = max(input_channels, channel + 1)
+        self.speaker = speaker
+        self.channel_taps = [] # (AudioService, channel) fed from this service's callback
+        self.source = None     # Service whose stream feeds this one, if attached
+
         # VAD state
         self.is_speaking = False
         self.silence_frames = 0
-        self.speech_frames = []
         self.max_silence_duration_ms = 500  # 500ms silence to consider utterance done
         self.min_speech_duration_ms = 300   # Minimum 300ms to consider it speech (avoid clicks)
 
@@ -43,8 +91,58 @@ class AudioService(QObject):
         self.max_silence_frames = int(self.max_silence_duration_ms / frame_duration_ms)
         self.min_speech_frames = int(self.min_speech_duration_ms / frame_duration_ms)
 
+        # Streaming mode: ship rolling windows of an ongoing utterance via audio_segment.
+        # audio_captured then only carries the part not yet shipped (0 disables streaming).
+        self.streaming_window_frames = int(streaming_window_ms / frame_duration_ms)
+        self.utterance_frames = 0     # Frames in the current utterance, including shipped segments
+        self.pending_speech_frames = 0 # Speech frames still in the utterance buffer (not yet shipped)
+
+        # Upper bound on buffered audio: long speech is split at the quietest frame of the last
+        # split_search_ms and the first part shipped via audio_segment. The downstream
+        # StreamingTranscriber stitches segments of one utterance into a single question.
+        self.max_utterance_frames = int(max_utterance_ms / frame_duration_ms)
+        self.split_search_frames = max(1, int(split_search_ms / frame_duration_ms))
+
+        # Unshipped audio of the current utterance, with per-frame RMS and VAD decision.
+        # Sized for the longest utterance so it never grows (np.empty pages are only touched as used).
+        self.utterance = UtteranceBuffer(self.frame_size, self.max_utterance_frames or 256)
+
+        # Speculative endpoint: after a short pause, let downstream start work early and
+        # cancel it if speech resumes before the real endpoint (0 disables).
+        self.speculative_silence_frames = int(speculative_silence_ms / frame_duration_ms)
+        self.speculating = False
+
+        # Pre-roll: audio just before VAD triggers, prepended so the first word isn't clipped
+        self.preroll = PrerollBuffer(self.frame_size, int(preroll_ms / frame_duration_ms))
+
+        # Adaptive endpointing: hangover and VAD mode follow the noise floor and the speaker's pauses
+        self.endpointer = None
+        if adaptive_endpointing:
+            self.endpointer = AdaptiveEndpointer(
+                frame_duration_ms=frame_duration_ms,
+                base_silence_ms=self.max_silence_duration_ms,
+                base_vad_mode=vad_aggressiveness
+            )
+        self._vad_mode = vad_aggressiveness
+
+        # Energy pre-gate: frames this quiet (int16 RMS) skip webrtcvad entirely (0 disables).
+        # Between gate/4 and gate, frames with a high zero-crossing rate (fricatives) still go to VAD.
+        self.energy_gate_rms = energy_gate_rms
+        self.gate_zcr_threshold = 0.25
+
+        # Conditioning for the VAD path only: noise suppression, then AGC towards a fixed speech
+        # level. Utterances keep the raw audio, which transcribes better than the processed one.
+        self.denoiser = SpectralSubtractor(self.frame_size, frame_duration_ms) if noise_suppression else None
+        self.agc = AutoGain(frame_duration_ms) if auto_gain else None
+        self._conditioned = np.zeros(self.frame_size, dtype=np.int16)
+
+        # Visualizer: aggregate audio_level to a display rate instead of every frame (0 = per frame)
+        self.level_meter = LevelMeter(frame_duration_ms, level_rate_hz) if level_rate_hz else None
+
         # Performance counters
         self.frame_count = 0
+        self.frames_gated = 0
+        self.frames_evaluated = 0
 
     def list_devices(self):
         """Returns a list of input devices."""
@@ -53,7 +151,11 @@ class AudioService(QObject):
             input_devices = []
             for i, dev in enumerate(devices):
                 if dev['max_input_channels'] > 0:
-                    input_devices.append({'index': i, 'name': dev['name']})
+                    input_devices.append({
+                        'index': i,
+                        'name': dev['name'],
+                        'default_samplerate': dev.get('default_samplerate')
+                    })
             return input_devices
         except Exception as e:
             logger.error(f"Error listing devices: {e}")
@@ -64,18 +166,54 @@ class AudioService(QObject):
         self.device_index = device_index
         logger.info(f"Audio device set to index: {device_index}")
 
+    def attach_channel(self, service, channel):
+        """Feeds `channel` of this service's stream into `service`, which keeps its own VAD state.
+
+        Used when one 2ch device carries both sides (e.g. interviewer left, mic right). The
+        attached service is started and stopped together with this one.
+        """
+        service.source = self
+        self.channel_taps.append((service, channel))
+        self.input_channels = max(self.input_channels, channel + 1)
+
     def _audio_callback(self, indata, frames, time, status):
         """Callback for sounddevice."""
         if status:
             logger.warning(f"Audio callback status: {status}")
-        self.buffer.put(indata.copy())
+        # Copy straight into a preallocated slot; no allocation or locking on the real-time path
+        if self.input_channels == 1:
+            self.buffer.write(indata)
+        else:
+            # Column views of the interleaved block; each ring copies out its own channel
+            self.buffer.write(indata[:, self.channel])
+            for service, channel in self.channel_taps:
+                service.buffer.write(indata[:, channel])
+                service._wake.set()
+        self._wake.set()
+
+    def get_stats(self):
+        """Returns capture/processing counters for diagnostics."""
+        stats = {
+            "speaker": self.speaker,
+            "capture_rate": self.capture_rate,
+            "frames_processed": self.frame_count,
+            "frames_gated": self.frames_gated,
+            "frames_evaluated": self.frames_evaluated,
+        }
+        stats.update({f"ring_{k}": v for k, v in self.buffer.stats().items()})
+        if self.endpointer:
+            stats.update(self.endpointer.stats())
+        return stats
 
     def start(self):
-        """Starts the audio stream."""
+        """Starts the audio stream. Returns immediately; the stream is opened on the worker thread."""
         if self.running:
             return
+        if sd is None:
+            logger.error("sounddevice/PortAudio not available, cannot capture audio.")
+            return
 
-        if self.device_index is None:
+        if self.source is None and self.device_index is None:
             # Try to find a default or BlackHole
             devices = self.list_devices()
             blackhole = next((d for d in devices if "BlackHole" in d['name']), None)
@@ -85,63 +223,216 @@ class AudioService(QObject):
                 # Default to system default if available, else 0
                 self.device_index = sd.default.device[0]
 
-        self.running = True
-        self.log_thread = threading.Thread(target=self._log_worker)
-        self.log_thread.start()
+        with self._lifecycle_lock:
+            if self.running:
+                return
+            self._generation += 1
+            self._wake = threading.Event()
+            self.log_queue = queue.Queue()
+            self.log_thread = threading.Thread(target=self._log_worker, args=(self.log_queue,), daemon=True)
+            self.log_thread.start()
 
-        self.thread = threading.Thread(target=self._process_loop)
-        self.thread.start()
-        logger.info("Audio service started.")
+            # Not `self.thread`, which would shadow QObject.thread()
+            previous = self.process_thread
+            self.process_thread = threading.Thread(target=self._run, args=(self._generation, previous), daemon=True)
+            self.process_thread.start()
+            self.running = True
+        logger.info(f"Audio service started ({self.speaker}).")
 
     def stop(self):
-        """Stops the audio stream."""
-        self.running = False
-        if self.stream:
-            self.stream.stop()
-            self.stream.close()
-        if hasattr(self, 'thread') and self.thread.is_alive():
-            self.thread.join()
-        if hasattr(self, 'log_thread') and self.log_thread.is_alive():
-            self.log_thread.join()
-        logger.info("Audio service stopped.")
-
-    def _log_worker(self):
+        """Stops the audio stream without waiting for it to close (safe to call from the GUI thread)."""
+        with self._lifecycle_lock:
+            if not self.running:
+                return
+            self._generation += 1
+            self.running = False
+            for service, _ in self.channel_taps:
+                service.stop()
+            self._wake.set() # Wake the consumer so it sees the new generation now
+            self.log_queue.put(_LOG_SHUTDOWN)
+        logger.info(f"Audio service stopped ({self.speaker}).")
+
+    def wait(self, timeout=None):
+        """Blocks until the last run has released its stream and exited. Returns False on timeout."""
+        for thread in (self.process_thread, self.log_thread):
+            if thread is not None:
+                thread.join(timeout)
+        return not any(t is not None and t.is_alive() for t in (self.process_thread, self.log_thread))
+
+    def _run(self, generation, previous):
+        # Serialize runs: the last one must close its stream before this one opens a new one.
+        # Done here rather than in start() so rapid toggling never blocks the caller.
+        if previous is not None:
+            previous.join()
+        if generation != self._generation:
+            return
+
+        self.preroll.clear()
+        self.is_speaking = False
+        self._reset_utterance()
+        if self.denoiser:
+            self.denoiser.reset()
+        if self.agc:
+            self.agc.reset()
+        if self.source:
+            # Attached channel: the source has already sized the ring and owns the stream
+            self._consume_loop(generation)
+        else:
+            self._process_loop(generation)
+
+    def _log_worker(self, log_queue):
         """Worker thread for processing log messages to avoid blocking the audio loop."""
-        while self.running or not self.log_queue.empty():
-            try:
-                msg = self.log_queue.get(timeout=0.1)
-                if isinstance(msg, tuple) and msg[0] == "RMS":
-                    # Defer string formatting to here
-                    print(f"[Audio] RMS: {msg[1]:.3f}")
-                else:
-                    print(msg)
-            except queue.Empty:
-                continue
+        while True:
+            msg = log_queue.get()
+            if msg is _LOG_SHUTDOWN:
+                break
+            if isinstance(msg, tuple) and msg[0] == "RMS":
+                # Defer string formatting to here
+                print(f"[Audio] RMS: {msg[1]:.3f}")
+            else:
+                print(msg)
+
+    def _device_rate(self):
+        """Native input rate of the selected device, or sample_rate if it can't be queried."""
+        try:
+            return int(sd.query_devices(self.device_index, 'input')['default_samplerate'])
+        except Exception as e:
+            logger.warning(f"Could not query device rate: {e}")
+            return self.sample_rate
+
+    def _configure_capture(self, rate):
+        """Sizes the ring and resampler for `rate`, here and on attached channels."""
+        # Fresh ring per run, so a consumer still winding down never shares one with the next
+        block_size = int(rate * self.frame_duration_ms / 1000)
+        self.buffer = FrameRingBuffer(block_size, self.buffer.capacity)
+        self.capture_rate = rate
+        self.resampler = PolyphaseResampler(rate, self.sample_rate) if rate != self.sample_rate else None
+        self._resampled_count = 0
+        for service, _ in self.channel_taps:
+            service._configure_capture(rate)
+
+    def _open_stream(self, rate, generation=None):
+        """Configures capture for `rate` and returns an (unstarted) input stream."""
+        self._configure_capture(rate)
+
+        callback = self._audio_callback
+        if generation is not None:
+            def callback(indata, frames, time_info, status):
+                if generation != self._generation:
+                    # Superseded: stop feeding rings that may already belong to the next run
+                    raise sd.CallbackAbort
+                self._audio_callback(indata, frames, time_info, status)
+
+        return sd.InputStream(device=self.device_index,
+                              channels=self.input_channels,
+                              samplerate=rate,
+                              dtype='int16',
+                              blocksize=self.buffer.frame_size,
+                              callback=callback)
+
+    def _process_loop(self, generation):
+        """Opens the stream and runs the consumer until this run is superseded."""
+        rates = [self._device_rate()] if self.native_rate else [self.sample_rate]
+        if rates[0] != self.sample_rate:
+            rates.append(self.sample_rate) # Let the driver resample if native rate fails
 
-    def _process_loop(self):
-        """Loop to read buffer, process VAD, and manage state."""
         # Open stream
+        stream = None
         try:
-            with sd.InputStream(device=self.device_index,
-                                channels=1,
-                                samplerate=self.sample_rate,
-                                dtype='int16',
-                                blocksize=self.frame_size,
-                                callback=self._audio_callback):
-                logger.info(f"Stream opened on device {self.device_index}")
-
-                while self.running:
-                    try:
-                        # sounddevice callback puts data in queue.
-                        # We assume blocksize matches frame_size so we get exact frames.
-                        frame = self.buffer.get(timeout=1.0)
-                        self._process_frame(frame)
-                    except queue.Empty:
-                        continue
+            for rate in rates:
+                try:
+                    stream = self._open_stream(rate, generation)
+                    break
+                except Exception as e:
+                    logger.warning(f"Could not open device {self.device_index} at {rate} Hz: {e}")
+            if stream is None:
+                raise RuntimeError("no usable sample rate")
+            # Rings are sized for the final rate, so attached channels can start consuming
+            with self._lifecycle_lock:
+                if generation != self._generation:
+                    return # Stopped while the device was opening
+                for service, _ in self.channel_taps:
+                    service.start()
+
+            stream.start()
+            logger.info(f"Stream opened on device {self.device_index} at {self.capture_rate} Hz "
+                        f"({self.input_channels} ch)")
+            self._consume_loop(generation)
         except Exception as e:
             logger.error(f"Error in audio stream: {e}")
             # If we can't open the stream (e.g. sandbox), we might simulate or just log
-            pass
+        finally:
+            if stream is not None:
+                try:
+                    stream.abort() # Discard pending buffers instead of draining them like stop()
+                    stream.close()
+                except Exception as e:
+                    logger.warning(f"Error closing audio stream: {e}")
+            for service, _ in self.channel_taps:
+                service.wait()
+
+    def _consume_loop(self, generation):
+        """Processes frames as the callback signals them, until this run is superseded."""
+        # Bound once per run: a later start() gets its own ring and wake event
+        buffer, wake = self.buffer, self._wake
+        while generation == self._generation:
+            frame = buffer.peek() # Processed in place; the slot is released afterwards
+            if frame is None:
+                self._check_overruns()
+                # Timeout only matters if the device stalls; stop() sets the event too
+                wake.wait(0.5)
+                wake.clear()
+                continue
+            if self.resampler:
+                self._process_block(frame)
+            else:
+                self._process_frame(frame)
+            buffer.advance()
+
+    def _process_block(self, block):
+        """Resamples a native-rate block and feeds whole frames to _process_frame."""
+        out = self.resampler.process(block)
+        count = self._resampled_count
+        self._resampled[count:count + out.size] = out
+        count += out.size
+
+        start = 0
+        while count - start >= self.frame_size:
+            self._process_frame(self._resampled[start:start + self.frame_size])
+            start += self.frame_size
+
+        # Keep the partial frame for the next block
+        remaining = count - start
+        if start:
+            self._resampled[:remaining] = self._resampled[start:count]
+        self._resampled_count = remaining
+
+    def _is_clearly_silent(self, flat_frame, rms):
+        """Cheap pre-VAD check using the RMS already computed for the meter."""
+        if not self.energy_gate_rms or rms >= self.energy_gate_rms:
+            return False
+        if rms < self.energy_gate_rms / 4:
+            return True
+        # Quiet but not silent: unvoiced consonants are low-energy with many zero crossings
+        crossings = np.count_nonzero(np.signbit(flat_frame[1:]) != np.signbit(flat_frame[:-1]))
+        return crossings / flat_frame.size < self.gate_zcr_threshold
+
+    def _condition(self, flat_frame):
+        """Runs the enabled suppression/AGC stages. Returns an int16 frame for VAD and metering."""
+        x = self.denoiser.process(flat_frame) if self.denoiser else flat_frame.astype(np.float32)
+        if self.agc:
+            x = self.agc.process(x, np.sqrt(np.dot(x, x) / x.size))
+        np.rint(x, out=x)
+        np.clip(x, -32768, 32767, out=x)
+        np.copyto(self._conditioned, x, casting='unsafe')
+        return self._conditioned
+
+    def _check_overruns(self):
+        """Reports newly dropped frames (consumer fell behind the callback)."""
+        overruns = self.buffer.overruns
+        if overruns != self._reported_overruns:
+            self.log_queue.put(f"[Audio] Ring overrun: {overruns - self._reported_overruns} frames dropped (total {overruns})")
+            self._reported_overruns = overruns
 
     def _process_frame(self, frame):
         """Process a single audio frame with VAD."""
@@ -153,25 +444,40 @@ class AudioService(QObject):
         # 2. Cast to int64 to prevent overflow during squaring/summing
         # 3. Use dot product for fast sum-of-squares
         flat_frame = frame.ravel()
-        mean_sq = np.dot(flat_frame.astype(np.int64), flat_frame) / flat_frame.size
+        vad_frame = self._condition(flat_frame) if self.denoiser or self.agc else flat_frame
+        mean_sq = np.dot(vad_frame.astype(np.int64), vad_frame) / vad_frame.size
         rms = np.sqrt(mean_sq)
         # Normalize to 0.0-1.0 roughly. Max int16 is 32768.
         # Practical max for speech is often lower, but let's map it safely.
         level = min(rms / 10000.0, 1.0) # Sensitivity tuning: 10000 as "max" volume
-        self.audio_level.emit(level)
+        if self.level_meter:
+            # Every emit is a queued cross-thread call; only send at display rate
+            meter_level = self.level_meter.update(mean_sq)
+            if meter_level is not None:
+                self.audio_level.emit(meter_level)
+        else:
+            self.audio_level.emit(level)
 
         self.frame_count += 1
         if self.frame_count % 20 == 0: # Log RMS occasionally (every 20th frame ~ 5%)
              self.log_queue.put(("RMS", level))
 
-        # webrtcvad expects bytes
-        frame_bytes = frame.tobytes()
+        if self._is_clearly_silent(vad_frame, rms):
+            # Skip VAD
+            self.frames_gated += 1
+            is_speech = False
+        else:
+            self.frames_evaluated += 1
+            try:
+                # Byte view instead of tobytes(): webrtcvad takes any buffer but sizes it by len()
+                is_speech = self.vad.is_speech(memoryview(vad_frame).cast('B'), self.sample_rate)
+            except Exception as e:
+                logger.error(f"VAD error: {e}")
+                return
 
-        try:
-            is_speech = self.vad.is_speech(frame_bytes, self.sample_rate)
-        except Exception as e:
-            logger.error(f"VAD error: {e}")
-            return
+        if self.endpointer:
+            self._adapt_endpointing(rms)
+            is_speech = is_speech and self.endpointer.is_above_noise(rms)
 
         if is_speech:
             if not self.is_speaking:
@@ -179,13 +485,36 @@ class AudioService(QObject):
                 self.is_speaking = True
                 self.speaking_started.emit()
                 self.log_queue.put("[VAD] Speech DETECTED")
+                # Not counted in utterance_frames, so the minimum-length check is unaffected
+                self.preroll.drain_into(self.utterance)
+            elif self.silence_frames and self.endpointer:
+                # A pause inside the utterance just ended
+                self.endpointer.observe_pause(self.silence_frames)
+
+            if self.speculating:
+                # Speech resumed: the early endpoint was wrong
+                self.speculating = False
+                self.speculation_cancelled.emit()
+                self.log_queue.put("[VAD] Speculation CANCELLED")
 
-            self.speech_frames.append(frame_bytes)
+            self._append_frame(flat_frame, rms, True)
             self.silence_frames = 0
+            self._maybe_emit_window(is_speech)
         else:
-            if self.is_speaking:
-                self.speech_frames.append(frame_bytes)
+            if not self.is_speaking:
+                self.preroll.push(flat_frame)
+            else:
+                self._append_frame(flat_frame, rms, False)
                 self.silence_frames += 1
+                if self.silence_frames == 1:
+                    self._maybe_emit_window(is_speech)
+
+                if (self.speculative_silence_frames
+                        and self.silence_frames == self.speculative_silence_frames
+                        and self.utterance_frames >= self.min_speech_frames):
+                    self.speculating = True
+                    self.speculative_endpoint.emit(self.utterance.peek() if self.pending_speech_frames else b'')
+                    self.log_queue.put("[VAD] Speculative endpoint")
 
                 if self.silence_frames > self.max_silence_frames:
                     # Speech ended
@@ -194,13 +523,68 @@ class AudioService(QObject):
                     self.log_queue.put("[VAD] Silence DETECTED")
 
                     # Check if utterance was long enough
-                    if len(self.speech_frames) >= self.min_speech_frames:
-                        full_audio = b''.join(self.speech_frames)
+                    if self.utterance_frames >= self.min_speech_frames:
+                        # Trailing silence alone is not worth transcribing if windows were already shipped
+                        full_audio = self.utterance.take() if self.pending_speech_frames else b''
                         self.audio_captured.emit(full_audio)
-                        logger.info(f"Captured utterance: {len(full_audio)} bytes")
+                        logger.info(f"Captured {self.speaker} utterance: {len(full_audio)} bytes")
+
+                    self._reset_utterance()
+
+    def _adapt_endpointing(self, rms):
+        self.endpointer.observe_level(rms)
+        self.max_silence_frames = self.endpointer.silence_frames_limit()
+
+        mode = self.endpointer.vad_mode()
+        if mode != self._vad_mode:
+            self._vad_mode = mode
+            self.vad.set_mode(mode)
+            self.log_queue.put(f"[VAD] Aggressiveness set to {mode}")
+
+    def _append_frame(self, frame, rms, is_speech):
+        self.utterance.append(frame, rms, is_speech)
+        self.utterance_frames += 1
+        if is_speech:
+            self.pending_speech_frames += 1
+
+        if self.max_utterance_frames and len(self.utterance) >= self.max_utterance_frames:
+            self._split_long_utterance()
+
+    def _split_long_utterance(self):
+        """Ships the buffered audio up to the lowest-energy frame near the end."""
+        end = len(self.utterance)
+        start = max(0, end - self.split_search_frames)
+        cut = start + int(np.argmin(self.utterance.energies[start:end])) + 1
+        self.log_queue.put(f"[VAD] Max utterance length reached, splitting {cut} frames")
+        self._ship_segment(cut)
+
+    def _ship_segment(self, cut):
+        """Emits the first `cut` buffered frames as a segment of the ongoing utterance and keeps the rest."""
+        self.audio_segment.emit(self.utterance.take(cut))
+        self.pending_speech_frames = self.utterance.speech_count()
+
+    def _reset_utterance(self):
+        self.utterance.clear()
+        self.silence_frames = 0
+        self.utterance_frames = 0
+        self.pending_speech_frames = 0
+        self.speculating = False
+
+    def _maybe_emit_window(self, is_speech):
+        """Ships the buffered part of an ongoing utterance once a streaming window is full.
+
+        Windows are cut at the first silent frame of a pause so words are not split, with a
+        hard cut at 1.5x the window for speakers who never pause.
+        """
+        if not self.streaming_window_frames:
+            return
+        buffered = len(self.utterance)
+        if buffered < self.streaming_window_frames:
+            return
+        if is_speech and buffered < self.streaming_window_frames * 3 // 2:
+            return
 
-                    self.speech_frames = []
-                    self.silence_frames = 0
+        self._ship_segment(len(self.utterance))
 
 if __name__ == "__main__":
     # Simple test if run directly
@@ -0,0 +1,126 @@
+import time
+import logging
+import threading
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Cancellation")
+
+class CancelToken:
+    """
+    Cooperative cancellation shared between the controller and a worker thread.
+
+    Workers poll `cancelled` between chunks. Anything that can block (a provider stream
+    waiting for its next token) registers a callback with on_cancel() that aborts it, so
+    cancel() from the UI thread takes effect immediately rather than at the next chunk.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            _run(callback)
+
+    def on_cancel(self, callback):
+        """Calls `callback` on cancel (now, if already cancelled). Returns an unregister function."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        _run(callback)
+        return lambda: None
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+    def _unregister(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+def _run(callback):
+    try:
+        callback()
+    except Exception as e:
+        logger.debug(f"Cancel callback failed: {e}")
+
+def close_stream(stream):
+    """Closes a provider stream (openai/groq Stream, zhipuai StreamResponse) and its connection."""
+    for target in (stream, getattr(stream, "response", None)):
+        close = getattr(target, "close", None)
+        if callable(close):
+            close()
+            return
+
+class StreamStalled(Exception):
+    """A provider stream missed its first-token or inter-token deadline."""
+
+class StallWatchdog:
+    """
+    Aborts a stream that goes quiet.
+
+    Armed with `first_token_s` until touch() reports the first token, then `gap_s` after each
+    one. On expiry `on_expire` runs (closing the stream unblocks the reader) and `expired`
+    says which deadline was missed. One sleeping thread per stream; after the first token
+    touch() only moves the deadline, so it costs next to nothing per token.
+    """
+
+    def __init__(self, first_token_s=None, gap_s=None, on_expire=None):
+        self.first_token_s = first_token_s
+        self.gap_s = gap_s
+        self.on_expire = on_expire
+        self.expired = None
+        self._got_token = False
+        self._deadline = None
+        self._stopped = False
+        self._wake = threading.Event()
+
+    def start(self):
+        if self.first_token_s is None and self.gap_s is None:
+            return self
+        self._deadline = time.monotonic() + self.first_token_s if self.first_token_s else None
+        threading.Thread(target=self._watch, name="StallWatchdog", daemon=True).start()
+        return self
+
+    def touch(self):
+        """A token arrived."""
+        first = not self._got_token
+        self._got_token = True
+        self._deadline = time.monotonic() + self.gap_s if self.gap_s else None
+        if first:
+            self._wake.set() # The gap deadline may be sooner than the first-token one
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _watch(self):
+        while True:
+            deadline = self._deadline
+            if deadline is None:
+                if self._got_token:
+                    return # Only a first-token deadline, and it was met
+                wait_s = 0.1 # Only a gap deadline: armed by the first token
+            else:
+                wait_s = deadline - time.monotonic()
+                if wait_s <= 0 and self._deadline == deadline:
+                    self.expired = (f"no token for {self.gap_s}s" if self._got_token
+                                    else f"no first token within {self.first_token_s}s")
+                    if self.on_expire:
+                        _run(self.on_expire)
+                    return
+            self._wake.wait(max(wait_s, 0))
+            self._wake.clear()
+            if self._stopped:
+                return
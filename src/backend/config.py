@@ -14,7 +14,43 @@ DEFAULT_CONFIG = {
     "resume_path": "",
     "job_description": "",
     "strategic_notes": "",
-    "cheat_sheet": ""
+    "cheat_sheet": "",
+    # Audio pipeline
+    "streaming_window_ms": 2500, # Ship partial audio for transcription every ~2.5s of speech (0 = off)
+    "speculative_silence_ms": 200, # Start answering after a short pause, cancelled if speech resumes (0 = off)
+    "vad_aggressiveness": 3, # webrtcvad mode 0-3 (3 = most aggressive at rejecting non-speech)
+    "adaptive_endpointing": True, # Tune the end-of-speech hangover from noise floor and pause lengths
+    "energy_gate_rms": 100, # Frames quieter than this (int16 RMS) skip the VAD (0 = off)
+    "level_meter_hz": 25, # Audio bar update rate (0 = every 20ms frame)
+    "preroll_ms": 200, # Audio kept from before speech onset and prepended to each utterance
+    "max_utterance_ms": 30000, # Longer speech is split at a quiet point and transcribed in parts
+    "noise_suppression": True, # Spectral subtraction on the VAD path (transcription gets the raw audio)
+    "auto_gain": True, # Normalize loopback level before VAD and the level meter
+    "native_rate_capture": True, # Open the device at its own rate and resample to 16 kHz in-process
+    "interviewer_channel": 0, # Channel of the capture device carrying the interviewer
+    "mic_channel": None, # Channel of the same device carrying your own mic (e.g. 1 on a 2ch aggregate)
+    "mic_device_index": None, # Or a separate device for your mic; its speech is logged, not transcribed
+    # Transcription
+    "audio_codec": "flac", # Upload encoding: wav, flac (lossless) or opus (smallest); needs soundfile
+    "transcription_backends": ["groq", "local"], # Preference order; slow or failing backends are skipped for a while
+    "local_whisper_model_path": "", # faster-whisper (CTranslate2) model directory for CPU transcription
+    "groq_transcription_timeout_s": 10, # A stalled Groq call fails over to the next backend after this
+    "transcription_cache_size": 256, # Transcripts of identical audio reused instead of re-sent (0 = off)
+    "persist_transcription_cache": False, # Also keep cached transcripts in the database across restarts
+    # Answering
+    "utterance_queue_size": 2, # Questions asked while an answer streams wait for it (0 = drop them)
+    "utterance_queue_policy": "preempt", # preempt (a new question aborts the current answer), merge or drop_oldest
+    "hedge_after_ms": 1500, # Also ask a backup model if the primary hasn't started answering by then (0 = off)
+    "adaptive_model_order": True, # Try models fastest/most reliable first, as measured (stats kept in the DB)
+    # Per-request deadlines; a missed one fails over and the next model finishes the answer
+    "llm_connect_timeout_s": 5,
+    "llm_first_token_timeout_s": 8,
+    "llm_stall_timeout_s": 4, # Longest pause between tokens
+    # Shared HTTP connection pool (HTTP/2 when the h2 package is installed)
+    "http_keepalive_s": 120, # Idle connections are kept open this long
+    "http_warm_interval_s": 30, # Ping idle provider hosts this often so the next request skips DNS/TLS
+    # Prompt token budgets per section; the oldest history is condensed to a list of earlier questions
+    "prompt_budgets": {"system": 800, "context": 2500, "story": 500, "history": 1500}
 }
 
 def load_config():
@@ -22,7 +58,8 @@ def load_config():
         return DEFAULT_CONFIG.copy()
     try:
         with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
+            # Fill in keys added since the file was written
+            return {**DEFAULT_CONFIG, **json.load(f)}
     except Exception:
         return DEFAULT_CONFIG.copy()
 
@@ -0,0 +1,117 @@
+import time
+import logging
+import threading
+import importlib.util
+import httpx
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ConnectionPool")
+
+def http2_available():
+    """HTTP/2 in httpx needs the optional `h2` package."""
+    return importlib.util.find_spec("h2") is not None
+
+def origin_of(url):
+    url = httpx.URL(str(url))
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+class ConnectionPool:
+    """
+    One keep-alive httpx.Client shared by every provider SDK client (Groq, OpenRouter, ZhipuAI).
+
+    Connections and TLS sessions survive SDK clients being rebuilt, and stay open for
+    `keepalive_s` instead of httpx's 5 s default. HTTP/2 is used when `h2` is installed.
+    Origins passed to register() are pinged (a HEAD request; any status will do) once they
+    have been idle for `warm_interval_s`, so the first request after a quiet stretch does not
+    pay for DNS and a new TLS handshake. The first ping goes out as soon as an origin is
+    registered. With background=False warm_due() does the same when called.
+    """
+
+    def __init__(self, keepalive_s=120.0, warm_interval_s=0, max_connections=20, http2=None,
+                 connect_timeout_s=None, background=True, clock=time.monotonic, transport=None):
+        self.warm_interval_s = warm_interval_s
+        self.background = background
+        self.clock = clock
+        self.http2 = http2_available() if http2 is None else http2
+
+        self.client = httpx.Client(
+            http2=self.http2,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                                keepalive_expiry=keepalive_s),
+            # Same as the SDK defaults; completion requests pass their own timeouts
+            timeout=httpx.Timeout(300.0, connect=connect_timeout_s or 8.0),
+            event_hooks={"request": [self._on_request]},
+            transport=transport,
+        )
+
+        self._lock = threading.Lock()
+        self._last_used = {} # origin -> clock() of the last request, None = never
+        self._warmer = None
+        self._wake = threading.Event()
+        self._closed = False
+
+    def _on_request(self, request):
+        origin = origin_of(request.url)
+        with self._lock:
+            if origin in self._last_used:
+                self._last_used[origin] = self.clock()
+
+    def register(self, url):
+        """Keeps the connection to `url`'s origin warm."""
+        origin = origin_of(url)
+        with self._lock:
+            if origin in self._last_used:
+                return
+            self._last_used[origin] = None
+        self._ensure_warmer()
+
+    def warm_due(self):
+        """Pings every origin idle for warm_interval_s (or never used). Returns seconds until the
+        next one is due (None when warming is off or nothing is registered)."""
+        if self._closed:
+            return None
+        now = self.clock()
+        with self._lock:
+            due = [origin for origin, last in self._last_used.items()
+                   if last is None or now - last >= self.warm_interval_s]
+
+        for origin in due:
+            try:
+                self.client.head(origin + "/", timeout=10.0)
+            except Exception as e:
+                # The request hook already counted it, so an unreachable host waits a full interval
+                logger.debug(f"Warm-up ping to {origin} failed: {e}")
+
+        if not self.warm_interval_s:
+            return None
+        with self._lock:
+            waits = [last + self.warm_interval_s - self.clock() for last in self._last_used.values() if last is not None]
+        return max(0.0, min(waits)) if waits else None
+
+    def _ensure_warmer(self):
+        if not self.background:
+            return
+        with self._lock:
+            if self._warmer and self._warmer.is_alive():
+                self._wake.set()
+                return
+            self._warmer = threading.Thread(target=self._warm_loop, name="ConnectionWarmer", daemon=True)
+            self._warmer.start()
+
+    def _warm_loop(self):
+        while not self._closed:
+            wait_s = self.warm_due()
+            if wait_s is None:
+                with self._lock:
+                    # Exit only if nothing was registered between warm_due() and here
+                    if all(last is not None for last in self._last_used.values()):
+                        self._warmer = None
+                        return
+                continue
+            self._wake.wait(wait_s)
+            self._wake.clear()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self.client.close()
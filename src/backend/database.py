@@ -58,6 +58,39 @@ class DatabaseManager:
         ''')
         # Note: Embedding stored as BLOB for performance.
 
+        # Speech events table
+        # Candidate speech is only logged (who/how long), never transcribed or sent to the LLM.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS speech_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                interview_id INTEGER,
+                speaker TEXT,
+                duration_ms INTEGER,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY(interview_id) REFERENCES interviews(id)
+            )
+        ''')
+
+        # Transcription cache (CachedTranscriber): content hash -> transcript
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transcription_cache (
+                key TEXT PRIMARY KEY,
+                text TEXT
+            )
+        ''')
+
+        # Per-model latency stats (ModelRanker), refreshed by every request and by probe_models.py
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS model_stats (
+                model TEXT PRIMARY KEY,
+                ttft_ms REAL,
+                tokens_per_s REAL,
+                successes REAL,
+                failures REAL,
+                updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
         conn.commit()
         conn.close()
         logger.info("Database initialized.")
@@ -89,6 +122,65 @@ class DatabaseManager:
         conn.close()
         logger.debug(f"Saved transcript for {role}")
 
+    def save_speech_event(self, interview_id, speaker, duration_ms):
+        """Records that `speaker` talked for `duration_ms` without storing the audio."""
+        if not interview_id:
+            return
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO speech_events (interview_id, speaker, duration_ms)
+            VALUES (?, ?, ?)
+        ''', (interview_id, speaker, int(duration_ms)))
+        conn.commit()
+        conn.close()
+
+    def get_cached_transcript(self, key):
+        """Returns the cached transcript for `key`, or None."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT text FROM transcription_cache WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def save_cached_transcript(self, key, text, max_entries=None):
+        """Stores a transcript, keeping only the `max_entries` most recently written."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        # REPLACE gives the row a fresh rowid, so rowid order is write order
+        cursor.execute('INSERT OR REPLACE INTO transcription_cache (key, text) VALUES (?, ?)', (key, text))
+        if max_entries:
+            cursor.execute('''
+                DELETE FROM transcription_cache
+                WHERE rowid NOT IN (
+                    SELECT rowid FROM transcription_cache ORDER BY rowid DESC LIMIT ?
+                )
+            ''', (max_entries,))
+        conn.commit()
+        conn.close()
+
+    def get_model_stats(self):
+        """Returns list of (model, ttft_ms, tokens_per_s, successes, failures)."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT model, ttft_ms, tokens_per_s, successes, failures FROM model_stats')
+        rows = cursor.fetchall()
+        conn.close()
+        return rows
+
+    def save_model_stats(self, model, ttft_ms, tokens_per_s, successes, failures):
+        """Replaces the stored stats of `model`."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO model_stats (model, ttft_ms, tokens_per_s, successes, failures, updated)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (model, ttft_ms, tokens_per_s, successes, failures))
+        conn.commit()
+        conn.close()
+
     def delete_last_transcript(self, interview_id, role):
         """Deletes the most recent transcript entry for a specific role and interview."""
         if not interview_id:
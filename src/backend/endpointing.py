@@ -0,0 +1,95 @@
+import collections
+import numpy as np
+
+
+class AdaptiveEndpointer:
+    """
+    Tunes VAD endpointing from what the stream actually sounds like.
+
+    - Noise floor: minimum-statistics tracker over frame RMS (rolling minimum over ~5s), so
+      it follows the loopback hiss even while the VAD wrongly calls it speech.
+      Frames that are not clearly above the floor are treated as silence, which stops noisy
+      loopback from producing endless utterances.
+    - Hangover: learned from the speaker's own pauses inside utterances. Fast talkers with
+      short pauses get quicker cutoffs; slow, deliberate speakers get more room.
+    - VAD mode: raised to the most aggressive setting while the floor is high.
+    """
+
+    def __init__(self, frame_duration_ms=20, base_silence_ms=500, min_silence_ms=300,
+                 max_silence_ms=900, snr_ratio=2.0, base_vad_mode=3, noisy_floor_rms=300.0):
+        self.frame_duration_ms = frame_duration_ms
+        self.base_silence_ms = base_silence_ms
+        self.min_silence_ms = min_silence_ms
+        self.max_silence_ms = max_silence_ms
+        self.snr_ratio = snr_ratio
+        self.base_vad_mode = base_vad_mode
+        self.noisy_floor_rms = noisy_floor_rms
+
+        # Frame RMS below this is never treated as noise worth gating on (int16 units)
+        self.min_floor_rms = 20.0
+        self.noise_floor = None
+
+        # Rolling minimum over ~5s, kept as the minima of 0.5s blocks
+        self.block_frames = self._to_frames(500)
+        self._block_minima = collections.deque(maxlen=10)
+        self._block_min = float("inf")
+        self._block_frames = 0
+
+        # Intra-utterance pauses (in frames) that ended with speech resuming
+        self.pauses = collections.deque(maxlen=64)
+        self.min_pause_samples = 5
+        self.min_pause_frames = 3 # Shorter gaps are VAD flicker, not pauses
+        self.margin_ms = 120 # Headroom above the speaker's typical long pause
+        self._silence_limit = self._to_frames(base_silence_ms)
+
+    def _to_frames(self, ms):
+        return max(1, int(ms / self.frame_duration_ms))
+
+    def observe_level(self, rms):
+        """Updates the noise floor with the RMS of the current frame."""
+        if rms < self._block_min:
+            self._block_min = rms
+        self._block_frames += 1
+        if self._block_frames < self.block_frames:
+            return
+
+        # Block done: the floor is the quietest block in the window. Speech always has short
+        # gaps between words, so this follows the noise, not the talker.
+        self._block_minima.append(self._block_min)
+        self._block_min = float("inf")
+        self._block_frames = 0
+        self.noise_floor = float(min(self._block_minima))
+
+    def is_above_noise(self, rms):
+        """False for frames that are indistinguishable from the current noise floor."""
+        if self.noise_floor is None:
+            return True
+        return rms >= max(self.noise_floor, self.min_floor_rms) * self.snr_ratio
+
+    def observe_pause(self, silence_frames):
+        """Records a pause inside an utterance and re-derives the hangover."""
+        if silence_frames < self.min_pause_frames:
+            return
+        self.pauses.append(silence_frames)
+        if len(self.pauses) < self.min_pause_samples:
+            return
+        typical_ms = np.percentile(self.pauses, 90) * self.frame_duration_ms + self.margin_ms
+        silence_ms = min(max(typical_ms, self.min_silence_ms), self.max_silence_ms)
+        self._silence_limit = self._to_frames(silence_ms)
+
+    def silence_frames_limit(self):
+        """Trailing silence frames after which the utterance is considered finished."""
+        return self._silence_limit
+
+    def vad_mode(self):
+        if self.noise_floor is not None and self.noise_floor >= self.noisy_floor_rms:
+            return 3
+        return self.base_vad_mode
+
+    def stats(self):
+        return {
+            "noise_floor_rms": round(self.noise_floor or 0.0, 1),
+            "hangover_ms": self._silence_limit * self.frame_duration_ms,
+            "pause_samples": len(self.pauses),
+            "vad_mode": self.vad_mode(),
+        }
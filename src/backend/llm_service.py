@@ -1,17 +1,30 @@
 import os
+import time
+import queue
 import logging
+import threading
+import httpx
 from groq import Groq
 from openai import OpenAI
 from zhipuai import ZhipuAI
 from pypdf import PdfReader
-import io
-import wave
 from src.backend.story_engine import StoryEngine
+from src.backend.audio_codec import get_encoder
+from src.backend.connection_pool import ConnectionPool
+from src.backend.prompt_builder import PromptBuilder, render_context
+from src.backend.cancellation import CancelToken, StallWatchdog, StreamStalled, close_stream
+from src.backend.provider_health import HealthBoard
+from src.backend.model_ranking import ModelRanker, streaming_rate
+from src.backend.transcription import (
+    TranscriptionError, GroqTranscriber, LocalWhisperTranscriber, FailoverTranscriber, CachedTranscriber
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("LLMService")
 
+PRIMARY_MODEL = "glm-4-flash" # On ZhipuAI
+
 BACKUP_MODELS = [
     "deepseek/deepseek-r1:free",
     "meta-llama/llama-3.1-405b-instruct:free",
@@ -19,8 +32,15 @@ BACKUP_MODELS = [
     "meta-llama/llama-3.2-3b-instruct:free",
 ]
 
+DEFAULT_TIMEOUT_S = 10 # Circuit probes and report connects when no deadlines are configured
+REPORT_TIMEOUT_S = 120 # The report is not streamed: the reply comes when it is complete
+
 class LLMService:
-    def __init__(self, db_manager, groq_key=None, openrouter_key=None, zhipu_key=None):
+    def __init__(self, db_manager, groq_key=None, openrouter_key=None, zhipu_key=None, audio_codec="wav",
+                 local_whisper_model_path=None, transcription_backends=("groq",), groq_timeout_s=None,
+                 transcription_cache_size=0, persist_transcription_cache=False, hedge_after_ms=0,
+                 adaptive_model_order=False, connect_timeout_s=None, first_token_timeout_s=None,
+                 stall_timeout_s=None, http_keepalive_s=120.0, http_warm_interval_s=None, prompt_budgets=None):
         self.groq_key = groq_key or os.getenv("GROQ_API_KEY")
         self.openrouter_key = openrouter_key or os.getenv("OPENROUTER_API_KEY")
         self.zhipu_key = zhipu_key or os.getenv("ZHIPU_API_KEY")
@@ -29,14 +49,57 @@ class LLMService:
         self.or_client = None
         self.zhipu_client = None
 
+        # One keep-alive connection pool for all SDK clients; with a warm interval the provider
+        # hosts are pinged while idle so TLS sessions stay up between questions
+        self.pool = ConnectionPool(keepalive_s=http_keepalive_s, warm_interval_s=http_warm_interval_s or 0,
+                                   connect_timeout_s=connect_timeout_s)
+        self.warm_connections = http_warm_interval_s is not None
+        self._client_keys = {}
+
         self._init_clients()
 
+        # Upload encoding for transcription (wav/flac/opus)
+        self.audio_encoder = get_encoder(audio_codec)
+
+        # Speech-to-text: Groq and/or local CPU Whisper, failing over between them
+        backends = {
+            "groq": GroqTranscriber(lambda: self.groq_client, self.audio_encoder, timeout_s=groq_timeout_s),
+            "local": LocalWhisperTranscriber(local_whisper_model_path),
+        }
+        self.transcriber = FailoverTranscriber(
+            [backends[name] for name in transcription_backends if name in backends]
+        )
+        if transcription_cache_size:
+            # Identical audio (replays, regeneration) is answered from the cache
+            store = db_manager if persist_transcription_cache else None
+            self.transcriber = CachedTranscriber(self.transcriber, transcription_cache_size, store=store)
+
         # RAG Engine
         self.story_engine = StoryEngine(db_manager)
 
-        self.context_text = ""
+        self.context_sections = [] # (title, body); see context_text
         self.transcript_history = []
 
+        # Token budgets per prompt section (None = full context and the last 10 messages)
+        self.prompt_builder = PromptBuilder(budgets=prompt_budgets)
+
+        # Start a backup request if the primary has not streamed a token by then (0 = off)
+        self.hedge_after_ms = hedge_after_ms
+
+        # Deadlines for every completion stream (None = wait indefinitely); a missed one fails
+        # over to the next model, which continues the answer
+        self.connect_timeout_s = connect_timeout_s
+        self.first_token_timeout_s = first_token_timeout_s
+        self.stall_timeout_s = stall_timeout_s
+
+        # Circuit breakers for the primary and every backup model, used by all call sites
+        self.health = HealthBoard(probe=self._probe_model)
+
+        # TTFT and tokens/s of every request; with adaptive ordering they pick the model order
+        # and are kept in the database
+        self.adaptive_model_order = adaptive_model_order
+        self.ranker = ModelRanker(store=db_manager if adaptive_model_order else None)
+
         # Personality / System Prompt Setup
         default_system_prompt = (
             "You are the candidate in a job interview. Answer the question directly as if you are the candidate. "
@@ -64,19 +127,33 @@ class LLMService:
             self.system_prompt_base = default_system_prompt
 
     def _init_clients(self):
-        if self.groq_key:
-            self.groq_client = Groq(api_key=self.groq_key)
-        if self.openrouter_key:
+        """(Re)builds the SDK clients whose key changed; all of them share the connection pool."""
+        if self.groq_key and self._client_keys.get("groq") != self.groq_key:
+            self.groq_client = Groq(api_key=self.groq_key, http_client=self.pool.client)
+            self._client_keys["groq"] = self.groq_key
+            self._warm(self.groq_client.base_url)
+        if self.openrouter_key and self._client_keys.get("openrouter") != self.openrouter_key:
+            # No SDK retries: the deadlines bound one attempt, failover is the retry
             self.or_client = OpenAI(
                 base_url="https://openrouter.ai/api/v1",
                 api_key=self.openrouter_key,
+                http_client=self.pool.client,
+                max_retries=0,
             )
-        if self.zhipu_key:
+            self._client_keys["openrouter"] = self.openrouter_key
+            self._warm(self.or_client.base_url)
+        if self.zhipu_key and self._client_keys.get("zhipu") != self.zhipu_key:
             try:
-                self.zhipu_client = ZhipuAI(api_key=self.zhipu_key)
+                self.zhipu_client = ZhipuAI(api_key=self.zhipu_key, http_client=self.pool.client, max_retries=0)
+                self._client_keys["zhipu"] = self.zhipu_key
+                self._warm(self.zhipu_client._base_url)
             except Exception as e:
                 logger.error(f"Failed to initialize ZhipuAI client: {e}")
 
+    def _warm(self, base_url):
+        if self.warm_connections:
+            self.pool.register(base_url)
+
     def update_keys(self, groq_key, openrouter_key, zhipu_key=None):
         self.groq_key = groq_key
         self.openrouter_key = openrouter_key
@@ -99,58 +176,78 @@ class LLMService:
                 logger.error(f"Error loading resume: {e}")
                 resume_text = "[Error loading resume]"
 
-        self.context_text = (
-            f"STRATEGIC NOTES:\n{strategic_notes}\n\n"
-            f"CHEAT SHEET (FACTS/REFS):\n{cheat_sheet}\n\n"
-            f"RESUME:\n{resume_text}\n\n"
-            f"JOB DESCRIPTION:\n{jd_text}"
-        )
+        self.context_sections = [
+            ("STRATEGIC NOTES", strategic_notes),
+            ("CHEAT SHEET (FACTS/REFS)", cheat_sheet),
+            ("RESUME", resume_text),
+            ("JOB DESCRIPTION", jd_text),
+        ]
         logger.info("Context updated.")
 
+    @property
+    def context_text(self):
+        return render_context(self.context_sections)
+
     def verify_primary_connection(self):
         """Pings ZhipuAI to verify connection."""
         if not self.zhipu_client:
             return False
         try:
             response = self.zhipu_client.chat.completions.create(
-                model="glm-4-flash",
+                model=PRIMARY_MODEL,
                 messages=[{"role": "user", "content": "ping"}],
                 max_tokens=5
             )
+            self.health.record_success(PRIMARY_MODEL)
             return True
         except Exception as e:
             logger.error(f"ZhipuAI Ping Failed: {e}")
+            self.health.record_failure(PRIMARY_MODEL, e)
             return False
 
-    def transcribe(self, audio_bytes):
-        """Transcribes audio bytes using Groq Whisper."""
-        if not self.groq_client:
-            logger.error("Groq client not initialized")
-            return "Error: Groq API Key missing"
+    def _client_for(self, model):
+        return self.zhipu_client if model == PRIMARY_MODEL else self.or_client
 
+    def _probe_model(self, model):
+        """One-token request used by the health board to test an open circuit."""
+        client = self._client_for(model)
+        if not client:
+            return False
+        client.chat.completions.create(model=model, messages=[{"role": "user", "content": "ping"}], max_tokens=1,
+                                       **self._request_options(fallback_s=DEFAULT_TIMEOUT_S))
+        return True
+
+    def _candidate_models(self):
+        """Primary then backups (or ranked by observed latency and success), for the clients
+        that are configured, minus open circuits."""
+        models = ([PRIMARY_MODEL] if self.zhipu_client else []) + (list(BACKUP_MODELS) if self.or_client else [])
+        if self.adaptive_model_order:
+            models = self.ranker.order(models)
+        return self.health.usable(models)
+
+    def get_prompt_metrics(self):
+        """Prompt tokens per request: {requests, mean_tokens, max_tokens, last} (last has the sections)."""
+        return self.prompt_builder.metrics()
+
+    def get_provider_health(self):
+        """Per model: circuit state, error rate and last TTFT, plus smoothed latency stats."""
+        stats = self.ranker.snapshot()
+        return {model: {**health, **stats.get(model, {})} for model, health in self.health.snapshot().items()}
+
+    def transcribe(self, audio_bytes, prompt=None):
+        """Transcribes audio bytes with the first healthy transcription backend.
+
+        audio_bytes: 16 kHz 16-bit PCM, bytes or a memoryview from AudioService (not copied here).
+        prompt: transcript of the preceding audio (streaming mode), passed to Whisper for continuity.
+        Raises TranscriptionError if every backend failed.
+        """
         try:
-            # Wrap raw PCM bytes in a valid WAV container
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)  # 16-bit = 2 bytes
-                wf.setframerate(16000)
-                wf.writeframes(audio_bytes)
-
-            wav_buffer.seek(0)
-            wav_buffer.name = "audio.wav"
-
-            transcription = self.groq_client.audio.transcriptions.create(
-                file=(wav_buffer.name, wav_buffer.read()),
-                model="whisper-large-v3-turbo",
-                prompt="The audio is an interview question.",
-                response_format="text"
-            )
-            logger.info(f"Transcription: {transcription}")
-            return transcription
-        except Exception as e:
+            text = self.transcriber.transcribe(audio_bytes, prompt=prompt)
+        except TranscriptionError as e:
             logger.error(f"Transcription error: {e}")
-            return f"Transcription Failed: {e}"
+            raise
+        logger.info(f"Transcription ({self.transcriber.last_backend}): {text}")
+        return text
 
     def undo_last_turn(self):
         """Removes the last AI response and User query from history and returns the User query."""
@@ -164,97 +261,260 @@ class LLMService:
                 return user_msg['content']
         return None
 
-    def generate_answer(self, query, short_circuit_history=False, system_instruction=None):
-        """Streams answer using ZhipuAI (Primary) with OpenRouter (Backup)."""
+    def record_turn(self, query, answer):
+        """Appends a completed question/answer pair to the conversation memory."""
+        self.transcript_history.append({"role": "user", "content": query})
+        self.transcript_history.append({"role": "assistant", "content": answer})
 
-        # RAG Retrieval
-        rag_instruction = ""
-        story_data = self.story_engine.find_relevant_story(query)
-
-        if story_data:
-            content = story_data.get('content', '')
-            style = story_data.get('style', '')
-            rag_instruction = f"\n\nPRIORITY CONTEXT: The user provided a specific story for this question. You MUST use it.\nCONTEXT: {content} | STYLE INSTRUCTION: {style}"
-            logger.info("Injecting RAG story into prompt.")
-
-        # Active Memory: Get last 10 turns
-        recent_history = self.transcript_history[-10:] if self.transcript_history else []
+    def _stream_content(self, stream, cancel_token=None):
+        """Yields the text deltas of a chat completion stream until it ends or is cancelled.
 
-        messages = [
-            {"role": "system", "content": self.system_prompt_base + rag_instruction},
-            {"role": "system", "content": f"Context Data:\n{self.context_text}"}
+        On cancel the stream is closed from the cancelling thread, which aborts a read that
+        is blocked waiting for the next token; the stream is closed either way when done.
+        """
+        unregister = cancel_token.on_cancel(lambda: close_stream(stream)) if cancel_token else None
+        try:
+            for chunk in stream:
+                if cancel_token and cancel_token.cancelled:
+                    return
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+        finally:
+            if unregister:
+                unregister()
+            close_stream(stream)
+
+    def _provider_stream(self, model, messages, cancel_token=None):
+        """Requests a streamed completion from `model` and yields its text, recording the
+        outcome and time to first token on the health board (cancellation counts as neither).
+
+        Raises StreamStalled if the stream misses its first-token or inter-token deadline;
+        text yielded before that stays with the caller.
+        """
+        start = time.monotonic()
+        first_at = None
+        chunks = 0 # Stream deltas, roughly one token each
+        opened = []
+        watchdog = StallWatchdog(self.first_token_timeout_s, self.stall_timeout_s,
+                                 on_expire=lambda: opened and close_stream(opened[0])).start()
+        try:
+            stream = self._client_for(model).chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                **self._request_options()
+            )
+            opened.append(stream)
+            if watchdog.expired:
+                close_stream(stream) # Expired while the request was still being answered
+            for content in self._stream_content(stream, cancel_token):
+                watchdog.touch()
+                if first_at is None:
+                    first_at = time.monotonic()
+                    self.health.record_ttft(model, (first_at - start) * 1000)
+                chunks += 1
+                yield content
+            if watchdog.expired:
+                raise StreamStalled(f"{model}: {watchdog.expired}") # Closed streams may just end
+        except Exception as e:
+            if watchdog.expired and not isinstance(e, StreamStalled):
+                e = StreamStalled(f"{model}: {watchdog.expired}")
+            if not (cancel_token and cancel_token.cancelled):
+                self.health.record_failure(model, e)
+                self.ranker.record_failure(model)
+            raise e
+        finally:
+            watchdog.stop()
+        if not (cancel_token and cancel_token.cancelled):
+            self.health.record_success(model)
+            if first_at is not None:
+                self.ranker.record(model, (first_at - start) * 1000, streaming_rate(chunks, first_at, time.monotonic()))
+
+    def _request_options(self, read_s=None, fallback_s=None):
+        """HTTP timeouts for completion requests: connect, plus a socket read backstop for the
+        stream deadlines (which the watchdog enforces per token), or `read_s` for a request that
+        isn't streamed. The clients don't retry, so these bound the whole call. A timeout that
+        isn't configured is `fallback_s` (None = unbounded)."""
+        if read_s is None:
+            read_s = max([t for t in (self.first_token_timeout_s, self.stall_timeout_s) if t] or [0]) or fallback_s
+        connect_s = self.connect_timeout_s or fallback_s
+        if not (connect_s or read_s):
+            return {}
+        return {"timeout": httpx.Timeout(read_s, connect=connect_s)}
+
+    @staticmethod
+    def _continuation(messages, partial):
+        """Messages asking another model to finish an answer that was cut off mid-stream."""
+        return messages + [
+            {"role": "assistant", "content": partial},
+            {"role": "user", "content": "Your answer was cut off. Continue it from exactly where it stopped, without repeating anything."},
         ]
 
-        # Temporary instruction for regeneration
-        if system_instruction:
-            messages.append({"role": "system", "content": system_instruction})
+    def generate_answer(self, query, short_circuit_history=False, system_instruction=None, record_history=True,
+                        cancel_token=None):
+        """Streams answer using ZhipuAI (Primary) with OpenRouter (Backup).
 
-        # Inject history
-        messages.extend(recent_history)
+        The generator's return value reports success. With record_history=False the turn is
+        not saved, so speculative answers can be discarded; call record_turn() to keep one.
+        Cancelling `cancel_token` aborts the in-flight request: nothing more is yielded, no
+        backup is tried and the turn is not saved.
+        """
+        def cancelled():
+            return cancel_token is not None and cancel_token.cancelled
 
-        # Add current query
-        messages.append({"role": "user", "content": query})
+        # RAG Retrieval
+        story_data = self.story_engine.find_relevant_story(query)
+        if story_data:
+            logger.info("Injecting RAG story into prompt.")
+
+        # System prompt, context, story and recent history, each within its token budget
+        messages = self.prompt_builder.build(
+            self.system_prompt_base, self.context_sections, self.transcript_history, query,
+            story=story_data, instruction=system_instruction
+        )
 
         full_answer = ""
         success = False
+        # Primary first, then backups (or best-scoring first with adaptive ordering);
+        # models whose circuit is open are skipped until a probe succeeds
+        candidates = self._candidate_models() # Not tried yet
 
-        # 1. Try Primary (ZhipuAI)
-        if self.zhipu_client:
+        # 1. Hedged: race the first candidate against the next once it is slow to start
+        if self.hedge_after_ms and len(candidates) > 1 and not cancelled():
+            race = self._hedged_stream(messages, candidates, cancel_token)
             try:
-                logger.info("Attempting generation with Primary: GLM-4-Flash")
-                stream = self.zhipu_client.chat.completions.create(
-                    model="glm-4-flash",
-                    messages=messages,
-                    stream=True
-                )
+                while True:
+                    try:
+                        content = next(race)
+                    except StopIteration as stop:
+                        success = stop.value
+                        break
+                    full_answer += content
+                    yield content
+            finally:
+                race.close() # Also cancels the attempts if our consumer stopped early
+
+        if cancelled():
+            logger.info("Generation cancelled.")
+            return False
 
-                for chunk in stream:
-                    content = chunk.choices[0].delta.content
-                    if content:
+        # 2. Remaining candidates, one after another
+        if not success:
+            for model in candidates:
+                if cancelled():
+                    break
+                try:
+                    if full_answer:
+                        # Failover mid-answer: keep what was shown and have this model finish it
+                        logger.info(f"Continuing the answer with model: {model}")
+                        request = self._continuation(messages, full_answer)
+                    else:
+                        logger.info(f"Attempting generation with model: {model}")
+                        request = messages
+                    for content in self._provider_stream(model, request, cancel_token):
                         full_answer += content
                         yield content
 
-                success = True
-            except Exception as e:
-                logger.warning(f"ZhipuAI (Primary) failed: {e}. Switching to backup...")
-
-        # 2. Backup (OpenRouter)
-        if not success:
-            if not self.or_client:
-                logger.error("OpenRouter client not initialized")
-                yield "Error: Primary failed and Backup key missing."
-                return
-
-            for model in BACKUP_MODELS:
-                try:
-                    logger.info(f"Attempting backup generation with model: {model}")
-                    stream = self.or_client.chat.completions.create(
-                        model=model,
-                        messages=messages,
-                        stream=True
-                    )
-
-                    for chunk in stream:
-                        content = chunk.choices[0].delta.content
-                        if content:
-                            full_answer += content
-                            yield content
-
-                    success = True
-                    break # Success, stop trying models
+                    success = not cancelled()
+                    break # Success (or cancelled), stop trying models
 
                 except Exception as e:
-                    logger.warning(f"Backup Model {model} failed: {e}. Trying next...")
+                    if cancelled():
+                        break
+                    logger.warning(f"Model {model} failed: {e}. Trying next...")
                     continue
 
+        if cancelled():
+            logger.info("Generation cancelled.")
+            return False
+
         if success:
             # Save to history
-            self.transcript_history.append({"role": "user", "content": query})
-            self.transcript_history.append({"role": "assistant", "content": full_answer})
+            if record_history:
+                self.record_turn(query, full_answer)
+        elif not self.or_client:
+            logger.error("OpenRouter client not initialized")
+            yield "Error: Primary failed and Backup key missing."
         else:
             yield "Connection unstable. Please check API keys or try again later."
             logger.error("All models failed.")
 
+        return success
+
+    def _hedged_stream(self, messages, models, cancel_token=None):
+        """Streams from whichever of the leading candidates produces a token first.
+
+        The first model starts alone. If it has no token after hedge_after_ms (or fails), the
+        next one is started alongside it, and so on for each one that fails before its first
+        token. The first attempt to yield a token wins and the others are cancelled, which
+        closes their streams. Models launched here are removed from `models`.
+        Returns True if the winner finished its answer.
+        """
+        events = queue.Queue()
+        attempts = []
+
+        def launch(model):
+            attempt = _StreamAttempt(model, events, cancel_token)
+            attempt.start(lambda token: self._provider_stream(model, messages, token))
+            attempts.append(attempt)
+
+        def launch_backup():
+            if not models:
+                return False
+            model = models.pop(0)
+            logger.info(f"Hedging with model: {model}")
+            launch(model)
+            return True
+
+        first = models.pop(0)
+        logger.info(f"Attempting generation with model: {first} (hedged)")
+        launch(first)
+        hedge_at = time.monotonic() + self.hedge_after_ms / 1000.0
+        hedged = False
+        winner = None
+        try:
+            while True:
+                if cancel_token is not None and cancel_token.cancelled:
+                    return False
+                wait_s = max(0.0, hedge_at - time.monotonic()) if not hedged else 0.1
+                try:
+                    attempt, kind, payload = events.get(timeout=min(wait_s, 0.1))
+                except queue.Empty:
+                    if not hedged and time.monotonic() >= hedge_at:
+                        hedged = True
+                        logger.info(f"{first} has no token after {self.hedge_after_ms}ms.")
+                        launch_backup()
+                    continue
+
+                if winner is not None and attempt is not winner:
+                    continue # Loser still draining
+
+                if kind == "error":
+                    if winner is not None:
+                        logger.warning(f"{attempt.name} failed mid-answer: {payload}")
+                        return False
+                    logger.warning(f"{attempt.name} failed before its first token: {payload}")
+                    attempt.finished = True
+                    hedged = True # Don't wait any longer for a replacement
+                    if not launch_backup() and all(a.finished for a in attempts):
+                        return False
+                    continue
+
+                if winner is None:
+                    winner = attempt
+                    logger.info(f"First token from {attempt.name}.")
+                    for other in attempts:
+                        if other is not winner:
+                            other.cancel()
+
+                if kind == "done":
+                    return True
+                yield payload
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+
     def generate_report(self):
         """Generates a post-interview report and saves it to file."""
         if not self.transcript_history:
@@ -270,32 +530,22 @@ class LLMService:
         success = False
         report = ""
 
-        # Try Primary
-        if self.zhipu_client:
+        # Same candidate order as answers, skipping models whose circuit is open
+        for model in self._candidate_models():
             try:
-                response = self.zhipu_client.chat.completions.create(
-                    model="glm-4-flash",
-                    messages=messages
+                response = self._client_for(model).chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    **self._request_options(read_s=REPORT_TIMEOUT_S, fallback_s=DEFAULT_TIMEOUT_S)
                 )
                 report = response.choices[0].message.content
+                self.health.record_success(model)
                 success = True
+                break
             except Exception as e:
-                logger.warning(f"ZhipuAI report generation failed: {e}")
-
-        # Try Backup
-        if not success and self.or_client:
-            for model in BACKUP_MODELS:
-                try:
-                    response = self.or_client.chat.completions.create(
-                        model=model,
-                        messages=messages
-                    )
-                    report = response.choices[0].message.content
-                    success = True
-                    break
-                except Exception as e:
-                    logger.warning(f"Report generation with {model} failed: {e}")
-                    continue
+                logger.warning(f"Report generation with {model} failed: {e}")
+                self.health.record_failure(model, e)
+                continue
 
         if success:
             try:
@@ -309,3 +559,35 @@ class LLMService:
         else:
             logger.error("Report generation failed with all models.")
             return "Error generating report: All models failed."
+
+
+class _StreamAttempt:
+    """One provider request of a hedged race, streaming into a shared event queue."""
+
+    def __init__(self, name, events, parent_token=None):
+        self.name = name
+        self.events = events
+        self.finished = False
+        self.token = CancelToken()
+        # Cancelling the whole answer cancels every attempt
+        self._unlink = parent_token.on_cancel(self.token.cancel) if parent_token else None
+
+    def start(self, open_stream):
+        threading.Thread(target=self._run, args=(open_stream,), daemon=True).start()
+
+    def cancel(self):
+        self.token.cancel()
+
+    def _run(self, open_stream):
+        try:
+            for content in open_stream(self.token):
+                if self.token.cancelled:
+                    return
+                self.events.put((self, "chunk", content))
+            self.events.put((self, "done", None))
+        except Exception as e:
+            if not self.token.cancelled:
+                self.events.put((self, "error", e))
+        finally:
+            if self._unlink:
+                self._unlink()
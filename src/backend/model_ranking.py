@@ -0,0 +1,137 @@
+import time
+import logging
+import threading
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ModelRanking")
+
+class ModelStats:
+    """Smoothed latency and decayed success counts of one model."""
+
+    def __init__(self, ttft_ms=None, tokens_per_s=None, successes=0.0, failures=0.0):
+        self.ttft_ms = ttft_ms
+        self.tokens_per_s = tokens_per_s
+        self.successes = successes
+        self.failures = failures
+
+    def as_dict(self):
+        return {"ttft_ms": self.ttft_ms, "tokens_per_s": self.tokens_per_s,
+                "successes": self.successes, "failures": self.failures}
+
+class ModelRanker:
+    """
+    Orders candidate models by observed speed and reliability.
+
+    Each request records time to first token and streaming rate (smoothed with `alpha`), or a
+    failure. A model's score is the expected time to a full answer of `answer_tokens`,
+    divided by its (Laplace-smoothed) success rate; lower is better. Counts decay by `decay`
+    per observation so old outages fade. Models never measured get the prior values, which
+    keeps them in play. With a `store` (DatabaseManager) stats are loaded at start and written
+    after every observation, so the ordering survives restarts and can be refreshed by
+    scripts/probe_models.py.
+    """
+
+    def __init__(self, store=None, alpha=0.3, decay=0.95, answer_tokens=60,
+                 prior_ttft_ms=1500.0, prior_tokens_per_s=40.0):
+        self.store = store
+        self.alpha = alpha
+        self.decay = decay
+        self.answer_tokens = answer_tokens
+        self.prior_ttft_ms = prior_ttft_ms
+        self.prior_tokens_per_s = prior_tokens_per_s
+
+        self._lock = threading.Lock()
+        self._stats = {}
+        if store is not None:
+            try:
+                for model, ttft_ms, tokens_per_s, successes, failures in store.get_model_stats():
+                    self._stats[model] = ModelStats(ttft_ms, tokens_per_s, successes or 0.0, failures or 0.0)
+                logger.info(f"Loaded latency stats for {len(self._stats)} models.")
+            except Exception as e:
+                logger.error(f"Failed to load model stats: {e}")
+
+    def _smooth(self, previous, value):
+        if value is None:
+            return previous
+        return value if previous is None else (1 - self.alpha) * previous + self.alpha * value
+
+    def record(self, model, ttft_ms, tokens_per_s=None):
+        with self._lock:
+            stats = self._stats.setdefault(model, ModelStats())
+            stats.ttft_ms = self._smooth(stats.ttft_ms, ttft_ms)
+            stats.tokens_per_s = self._smooth(stats.tokens_per_s, tokens_per_s)
+            stats.successes = stats.successes * self.decay + 1
+            stats.failures *= self.decay
+            snapshot = stats.as_dict()
+        self._save(model, snapshot)
+
+    def record_failure(self, model):
+        with self._lock:
+            stats = self._stats.setdefault(model, ModelStats())
+            stats.successes *= self.decay
+            stats.failures = stats.failures * self.decay + 1
+            snapshot = stats.as_dict()
+        self._save(model, snapshot)
+
+    def _save(self, model, snapshot):
+        if self.store is None:
+            return
+        try:
+            self.store.save_model_stats(model, **snapshot)
+        except Exception as e:
+            logger.error(f"Failed to save stats for {model}: {e}")
+
+    def score(self, model):
+        """Expected milliseconds to a complete answer, penalized by failure rate."""
+        with self._lock:
+            stats = self._stats.get(model) or ModelStats()
+        ttft_ms = stats.ttft_ms if stats.ttft_ms is not None else self.prior_ttft_ms
+        tokens_per_s = stats.tokens_per_s or self.prior_tokens_per_s
+        success_rate = (stats.successes + 1) / (stats.successes + stats.failures + 2)
+        return (ttft_ms + self.answer_tokens / tokens_per_s * 1000) / success_rate
+
+    def order(self, models):
+        """`models` best first; ties keep the given (configured) order."""
+        return sorted(models, key=self.score)
+
+    def snapshot(self):
+        with self._lock:
+            return {model: stats.as_dict() for model, stats in self._stats.items()}
+
+def probe_model(client, model, prompt="Say hello in five words.", max_tokens=20):
+    """Streams one short completion. Returns (ttft_ms, tokens_per_s, text); raises on error.
+
+    Stream deltas are counted as tokens, which holds for OpenAI-compatible servers that send
+    one token per chunk.
+    """
+    start = time.monotonic()
+    first_at = None
+    chunks = 0
+    text = ""
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        stream=True
+    )
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if not content:
+            continue
+        if first_at is None:
+            first_at = time.monotonic()
+        chunks += 1
+        text += content
+    end = time.monotonic()
+
+    if first_at is None:
+        raise RuntimeError("Empty response")
+    return (first_at - start) * 1000, streaming_rate(chunks, first_at, end), text
+
+def streaming_rate(chunks, first_at, end):
+    """Tokens per second after the first one, or None if it can't be measured."""
+    if chunks < 2 or end <= first_at:
+        return None
+    return (chunks - 1) / (end - first_at)
@@ -0,0 +1,109 @@
+import numpy as np
+
+
+class SpectralSubtractor:
+    """
+    Single-channel spectral-subtraction noise suppressor for 20ms frames.
+
+    Each frame is analysed together with the previous one (overlap-save), so the output has
+    no added latency. The noise spectrum is tracked per bin: it drops to the current power
+    immediately and only creeps back up slowly, so speech never gets absorbed into it but a
+    rising fan or line hiss is followed within a few seconds. The per-bin gain is a floored
+    over-subtraction rule, smoothed over time to keep "musical noise" out of the VAD input.
+    """
+
+    def __init__(self, frame_size=320, frame_duration_ms=20, over_subtraction=4.0,
+                 gain_floor=0.1, rise_db_per_s=3.0, gain_smoothing=0.8, power_smoothing=0.7):
+        self.frame_size = frame_size
+        self.over_subtraction = over_subtraction
+        self.gain_floor = gain_floor
+        self.gain_smoothing = gain_smoothing
+        self.power_smoothing = power_smoothing
+        # Multiplier applied to the noise estimate per frame while it is below the signal
+        self.rise = 10 ** (rise_db_per_s * frame_duration_ms / 1000.0 / 10.0)
+
+        self._window = np.zeros(frame_size * 2, dtype=np.float32) # [previous frame | current frame]
+        bins = frame_size + 1
+        self.noise_psd = None
+        self._power = None # Time-smoothed periodogram; raw per-bin power is too noisy to track
+        self._gain = np.ones(bins, dtype=np.float32)
+
+    def process(self, frame):
+        """Returns the denoised frame as float32 (same length as `frame`)."""
+        n = self.frame_size
+        self._window[:n] = self._window[n:]
+        self._window[n:] = frame
+
+        spectrum = np.fft.rfft(self._window)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+
+        if self.noise_psd is None:
+            self._power = power.copy()
+            self.noise_psd = power.copy()
+        else:
+            self._power = self.power_smoothing * self._power + (1.0 - self.power_smoothing) * power
+            # Follow dips immediately, rises slowly
+            np.minimum(self.noise_psd * self.rise, self._power, out=self.noise_psd)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gain = 1.0 - self.over_subtraction * self.noise_psd / power
+        np.nan_to_num(gain, copy=False, nan=0.0)
+        np.clip(gain, self.gain_floor, 1.0, out=gain)
+        self._gain = self.gain_smoothing * self._gain + (1.0 - self.gain_smoothing) * gain
+
+        # Overlap-save: keep only the half of the window that is the current frame
+        return np.fft.irfft(spectrum * self._gain, n=2 * n)[n:].astype(np.float32)
+
+    def reset(self):
+        self._window[:] = 0
+        self.noise_psd = None
+        self._power = None
+        self._gain[:] = 1.0
+
+
+class AutoGain:
+    """
+    Slow automatic gain control towards a target speech RMS.
+
+    The gain only adapts on frames clearly above the tracked noise floor, so pauses are not
+    pumped up to speech level. Loud input pulls the gain down quickly (attack), quiet input
+    raises it slowly (release). The gain is ramped across each frame to avoid clicks.
+    """
+
+    def __init__(self, frame_duration_ms=20, target_rms=3000.0, min_gain=0.25, max_gain=8.0,
+                 attack_ms=60, release_ms=2000, snr_ratio=3.0, min_speech_rms=50.0):
+        self.target_rms = target_rms
+        self.min_gain = min_gain
+        self.max_gain = max_gain
+        self.snr_ratio = snr_ratio
+        self.min_speech_rms = min_speech_rms
+        self.attack = 1.0 - np.exp(-frame_duration_ms / attack_ms)
+        self.release = 1.0 - np.exp(-frame_duration_ms / release_ms)
+
+        self.gain = 1.0
+        self.level = None # ~100ms smoothed RMS; per-frame RMS dips too deep to track noise on
+        self.noise_rms = None
+        self.noise_rise = 1.1 ** (frame_duration_ms / 1000.0) # +10%/s while above the floor
+
+    def process(self, frame, rms):
+        """Applies the gain to a float32 frame whose RMS is `rms`. Returns float32."""
+        self.level = rms if self.level is None else 0.8 * self.level + 0.2 * rms
+        if self.noise_rms is None or self.level < self.noise_rms:
+            self.noise_rms = max(self.level, 1.0)
+        else:
+            self.noise_rms *= self.noise_rise
+
+        previous = self.gain
+        if rms > self.min_speech_rms and rms > self.snr_ratio * self.noise_rms:
+            desired = min(max(self.target_rms / rms, self.min_gain), self.max_gain)
+            rate = self.attack if desired < self.gain else self.release
+            self.gain += rate * (desired - self.gain)
+
+        if previous == self.gain:
+            return frame * self.gain
+        return frame * np.linspace(previous, self.gain, frame.size, dtype=np.float32)
+
+    def reset(self):
+        self.gain = 1.0
+        self.level = None
+        self.noise_rms = None
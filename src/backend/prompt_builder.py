@@ -0,0 +1,214 @@
+import math
+import logging
+import threading
+from functools import lru_cache
+
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("PromptBuilder")
+
+MESSAGE_OVERHEAD = 4 # Role and separators per chat message
+TRUNCATED = " [...]"
+
+class TokenCounter:
+    """
+    Counts and trims text in tokens.
+
+    Uses tiktoken's `encoding` (loaded once, on first use or via prepare()) when installed,
+    otherwise (or with encoding=None) about four characters per token. The providers' own
+    tokenizers differ, so either is an estimate; budgets should leave some headroom. Counts
+    are cached, since the system prompt and context are the same on every request.
+    """
+
+    def __init__(self, encoding="cl100k_base", cache_size=1024):
+        self.encoding_name = encoding
+        self._encoding = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.count = lru_cache(maxsize=cache_size)(self._count)
+
+    def prepare(self):
+        self._load()
+
+    def _load(self):
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                if tiktoken is not None and self.encoding_name:
+                    try:
+                        self._encoding = tiktoken.get_encoding(self.encoding_name)
+                    except Exception as e: # The BPE file is downloaded on first use
+                        logger.error(f"Failed to load tokenizer {self.encoding_name}, estimating instead: {e}")
+            return self._encoding
+
+    def _count(self, text):
+        if not text:
+            return 0
+        encoding = self._load()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / 4)
+
+    def truncate(self, text, max_tokens):
+        """`text` cut to at most `max_tokens`, keeping the beginning and marking the cut."""
+        if self.count(text) <= max_tokens:
+            return text
+        keep = max(max_tokens - self.count(TRUNCATED), 0)
+        encoding = self._load()
+        if encoding is not None:
+            head = encoding.decode(encoding.encode(text, disallowed_special=())[:keep])
+        else:
+            head = text[:keep * 4]
+            if " " in head:
+                head = head.rsplit(" ", 1)[0] # Don't end mid-word
+        return head.rstrip() + TRUNCATED if keep else ""
+
+class PromptBuilder:
+    """
+    Assembles the chat messages for an answer within per-section token budgets.
+
+    `budgets` maps "system", "context", "story" and "history" to a maximum token count;
+    a section without one is sent whole. Context sections share their budget, short ones
+    first, so one long resume doesn't crowd out the job description. History keeps the most
+    recent turns verbatim and condenses the oldest that don't fit into a one-line list of
+    earlier questions, which gets `summary_share` of the history budget. Without a history
+    budget the last `max_history_messages` are sent, as before. The query and any
+    regeneration instruction are never trimmed.
+
+    Every build() is measured: last_stats has the tokens per section, and metrics() the
+    running totals.
+    """
+
+    def __init__(self, counter=None, budgets=None, max_history_messages=10, summary_share=0.25):
+        self.counter = counter or TokenCounter()
+        self.budgets = dict(budgets or {})
+        self.max_history_messages = max_history_messages
+        self.summary_share = summary_share
+
+        self._lock = threading.Lock()
+        self.last_stats = None
+        self._requests = 0
+        self._total_tokens = 0
+        self._max_tokens = 0
+
+    def build(self, system_prompt, context_sections, history, query, story=None, instruction=None):
+        """Returns the messages for `query`; `context_sections` is a list of (title, body)."""
+        stats = {"story": 0, "trimmed": []}
+        budget = self.budgets.get
+
+        system = self._fit(system_prompt, budget("system"), "system", stats)
+        if story:
+            system += story_instruction(self._fit_story(story, budget("story"), stats))
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "system", "content": f"Context Data:\n{self._fit_context(context_sections, budget('context'), stats)}"}
+        ]
+        if instruction:
+            messages.append({"role": "system", "content": instruction})
+        messages.extend(self._fit_history(history, budget("history"), stats))
+        messages.append({"role": "user", "content": query})
+
+        stats["system"] = self._tokens(messages[:1])
+        stats["context"] = self._tokens(messages[1:2])
+        stats["history"] = self._tokens(messages[2 + bool(instruction):-1])
+        stats["query"] = self._tokens(messages[-1:]) + (self._tokens(messages[2:3]) if instruction else 0)
+        stats["total"] = self._tokens(messages)
+        self._record(stats)
+        return messages
+
+    def _tokens(self, messages):
+        return sum(self.counter.count(m["content"]) + MESSAGE_OVERHEAD for m in messages)
+
+    def _fit(self, text, max_tokens, section, stats):
+        if max_tokens is None or self.counter.count(text) <= max_tokens:
+            return text
+        if section not in stats["trimmed"]:
+            stats["trimmed"].append(section)
+        return self.counter.truncate(text, max_tokens)
+
+    def _fit_story(self, story, max_tokens, stats):
+        content = self._fit(story.get("content", ""), max_tokens, "story", stats)
+        stats["story"] = self.counter.count(content)
+        return {**story, "content": content}
+
+    def _fit_context(self, sections, max_tokens, stats):
+        if max_tokens is not None and sections:
+            # Water-filling: each section gets an equal share of what is left, sections that
+            # need less than their share hand the rest on
+            left = max_tokens - sum(self.counter.count(f"{title}:\n") + 1 for title, _ in sections)
+            shares = {}
+            pending = sorted(range(len(sections)), key=lambda i: self.counter.count(sections[i][1]))
+            while pending:
+                i = pending.pop(0)
+                shares[i] = min(self.counter.count(sections[i][1]), max(left, 0) // (len(pending) + 1))
+                left -= shares[i]
+            sections = [(title, self._fit(body, shares[i], "context", stats)) for i, (title, body) in enumerate(sections)]
+        return render_context(sections)
+
+    def _fit_history(self, history, max_tokens, stats):
+        if max_tokens is None:
+            return list(history[-self.max_history_messages:]) if history else []
+
+        # Newest turns verbatim while they fit
+        verbatim_budget = max_tokens - int(max_tokens * self.summary_share)
+        kept = []
+        used = 0
+        for message in reversed(history):
+            cost = self._tokens([message])
+            if used + cost > verbatim_budget:
+                break
+            kept.insert(0, message)
+            used += cost
+        while kept and kept[0]["role"] != "user":
+            used -= self._tokens([kept.pop(0)]) # Start on a question, not half a turn
+        dropped = history[:len(history) - len(kept)]
+        if not dropped:
+            return kept
+
+        # Older questions condensed, newest first until the rest of the budget is used
+        stats["trimmed"].append("history")
+        questions = [m["content"] for m in dropped if m["role"] == "user"]
+        header = "Earlier in this interview you were asked: "
+        left = max_tokens - used - self.counter.count(header) - MESSAGE_OVERHEAD
+        summary = []
+        for question in reversed(questions):
+            line = self.counter.truncate(" ".join(question.split()), 25)
+            cost = self.counter.count(line) + 1
+            if cost > left:
+                break
+            summary.insert(0, line)
+            left -= cost
+        if not summary:
+            return kept
+        return [{"role": "system", "content": header + "; ".join(summary)}] + kept
+
+    def _record(self, stats):
+        with self._lock:
+            self.last_stats = stats
+            self._requests += 1
+            self._total_tokens += stats["total"]
+            self._max_tokens = max(self._max_tokens, stats["total"])
+        logger.info(f"Prompt: {stats['total']} tokens (system {stats['system']}, context {stats['context']}, "
+                    f"history {stats['history']})" + (f", trimmed {', '.join(stats['trimmed'])}" if stats["trimmed"] else ""))
+
+    def metrics(self):
+        """Prompt tokens per request: {requests, mean_tokens, max_tokens, last}."""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "mean_tokens": self._total_tokens / self._requests if self._requests else 0.0,
+                "max_tokens": self._max_tokens,
+                "last": self.last_stats,
+            }
+
+def render_context(sections):
+    return "\n\n".join(f"{title}:\n{body}" for title, body in sections)
+
+def story_instruction(story):
+    content = story.get('content', '')
+    style = story.get('style', '')
+    return f"\n\nPRIORITY CONTEXT: The user provided a specific story for this question. You MUST use it.\nCONTEXT: {content} | STYLE INSTRUCTION: {style}"
@@ -0,0 +1,184 @@
+import time
+import logging
+import threading
+from collections import deque
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ProviderHealth")
+
+CLOSED = "closed"
+OPEN = "open"
+
+class ProviderHealth:
+    """Rolling health of one provider/model."""
+
+    def __init__(self, window=20):
+        self.outcomes = deque(maxlen=window) # True = success
+        self.consecutive_failures = 0
+        self.last_ttft_ms = None
+        self.last_error = None
+        self.state = CLOSED
+        self.retry_at = 0.0 # When an open circuit is due for a probe
+        self.open_s = 0.0
+
+    @property
+    def error_rate(self):
+        if not self.outcomes:
+            return 0.0
+        return 1.0 - sum(self.outcomes) / len(self.outcomes)
+
+    def snapshot(self):
+        return {
+            "state": self.state,
+            "calls": len(self.outcomes),
+            "error_rate": self.error_rate,
+            "consecutive_failures": self.consecutive_failures,
+            "last_ttft_ms": self.last_ttft_ms,
+            "last_error": self.last_error,
+        }
+
+class HealthBoard:
+    """
+    Circuit breakers for the LLM providers, shared by every LLMService call site.
+
+    A model's circuit opens after `failure_threshold` consecutive failures, or when at least
+    `min_calls` recent calls have an error rate of `max_error_rate` or more. Open models are
+    left out of usable(), so a dead model costs nothing instead of a timeout per answer.
+    After `open_s` the circuit is probed in the background with `probe(name) -> bool`
+    (a one-token request); success closes it, failure keeps it open for twice as long, up
+    to `max_open_s`. Without a probe, or with background=False, probe_due() does the same
+    when called.
+    """
+
+    def __init__(self, probe=None, failure_threshold=3, max_error_rate=0.5, min_calls=6,
+                 open_s=30.0, max_open_s=300.0, window=20, background=True, clock=time.monotonic):
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.max_error_rate = max_error_rate
+        self.min_calls = min_calls
+        self.base_open_s = open_s
+        self.max_open_s = max_open_s
+        self.window = window
+        self.background = background
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._providers = {}
+        self._prober = None
+        self._wake = threading.Event()
+
+    def _get(self, name):
+        health = self._providers.get(name)
+        if health is None:
+            health = self._providers[name] = ProviderHealth(self.window)
+        return health
+
+    def is_open(self, name):
+        with self._lock:
+            return self._get(name).state == OPEN
+
+    def usable(self, names):
+        """`names` minus open circuits, in order. If all are open, the one due soonest is kept
+        so a request is still attempted rather than failing without trying."""
+        with self._lock:
+            usable = [name for name in names if self._get(name).state != OPEN]
+            if not usable and names:
+                usable = [min(names, key=lambda name: self._get(name).retry_at)]
+            return usable
+
+    def record_ttft(self, name, ttft_ms):
+        with self._lock:
+            self._get(name).last_ttft_ms = ttft_ms
+
+    def record_success(self, name):
+        with self._lock:
+            health = self._get(name)
+            health.outcomes.append(True)
+            health.consecutive_failures = 0
+            if health.state == OPEN:
+                self._close(name, health)
+
+    def record_failure(self, name, error=None):
+        with self._lock:
+            health = self._get(name)
+            health.outcomes.append(False)
+            health.consecutive_failures += 1
+            health.last_error = str(error) if error is not None else None
+            tripped = (health.consecutive_failures >= self.failure_threshold or
+                       (len(health.outcomes) >= self.min_calls and health.error_rate >= self.max_error_rate))
+            if health.state == OPEN:
+                self._reopen(name, health) # Forced attempt on an open circuit failed again
+            elif tripped:
+                health.state = OPEN
+                health.open_s = self.base_open_s
+                health.retry_at = self.clock() + health.open_s
+                logger.warning(f"Circuit opened for {name} ({health.consecutive_failures} consecutive failures, "
+                               f"{health.error_rate:.0%} errors): skipping it for {health.open_s:.0f}s")
+            else:
+                return
+        self._ensure_prober()
+
+    def _close(self, name, health):
+        health.state = CLOSED
+        health.consecutive_failures = 0
+        health.open_s = 0.0
+        logger.info(f"Circuit closed for {name}.")
+
+    def _reopen(self, name, health):
+        health.open_s = min(max(health.open_s, self.base_open_s) * 2, self.max_open_s)
+        health.retry_at = self.clock() + health.open_s
+        logger.info(f"{name} still failing; next probe in {health.open_s:.0f}s.")
+
+    def probe_due(self):
+        """Probes every open circuit whose wait is over. Returns seconds until the next one is due
+        (None when no circuit is open)."""
+        now = self.clock()
+        with self._lock:
+            due = [name for name, h in self._providers.items() if h.state == OPEN and h.retry_at <= now]
+
+        for name in due:
+            try:
+                ok = bool(self.probe(name)) if self.probe else False
+            except Exception as e:
+                logger.debug(f"Probe of {name} raised: {e}")
+                ok = False
+            with self._lock:
+                health = self._get(name)
+                if health.state != OPEN:
+                    continue # A real request closed it meanwhile
+                if ok:
+                    self._close(name, health)
+                else:
+                    self._reopen(name, health)
+
+        with self._lock:
+            waits = [h.retry_at - self.clock() for h in self._providers.values() if h.state == OPEN]
+        return max(0.0, min(waits)) if waits else None
+
+    def _ensure_prober(self):
+        if not (self.background and self.probe):
+            return
+        with self._lock:
+            if self._prober and self._prober.is_alive():
+                self._wake.set()
+                return
+            self._prober = threading.Thread(target=self._probe_loop, name="ProviderProbe", daemon=True)
+            self._prober.start()
+
+    def _probe_loop(self):
+        while True:
+            wait_s = self.probe_due()
+            if wait_s is None:
+                with self._lock:
+                    # Exit only if nothing reopened between probe_due() and here
+                    if not any(h.state == OPEN for h in self._providers.values()):
+                        self._prober = None
+                        return
+                continue
+            self._wake.wait(wait_s)
+            self._wake.clear()
+
+    def snapshot(self):
+        """Scoreboard: {name: {state, calls, error_rate, consecutive_failures, last_ttft_ms, last_error}}."""
+        with self._lock:
+            return {name: health.snapshot() for name, health in self._providers.items()}
@@ -0,0 +1,180 @@
+import time
+import wave
+import queue
+import logging
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Replay")
+
+SAMPLE_RATE = 16000
+
+
+def synthesize_pattern(pattern, sample_rate=SAMPLE_RATE, noise_rms=30.0, seed=0):
+    """
+    Builds a test signal from [("speech" | "silence", duration_ms), ...].
+
+    Speech is voiced harmonics with a wandering pitch and syllable-rate envelope, which
+    webrtcvad reliably calls speech. Returns (int16 samples, [(start_s, end_s), ...] of speech).
+    """
+    rng = np.random.default_rng(seed)
+    parts = []
+    truth = []
+    position = 0
+    for kind, duration_ms in pattern:
+        n = int(sample_rate * duration_ms / 1000)
+        if kind == "speech":
+            t = np.arange(n) / sample_rate
+            pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t + rng.uniform(0, 2 * np.pi))
+            phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+            voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+            # Syllables at ~4 Hz, never fully closed so the VAD sees one continuous phrase
+            envelope = 0.35 + 0.65 * np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+            parts.append(voiced / np.abs(voiced).max() * 8000 * envelope)
+            truth.append((position / sample_rate, (position + n) / sample_rate))
+        elif kind == "silence":
+            parts.append(np.zeros(n))
+        else:
+            raise ValueError(f"Unknown pattern element '{kind}'")
+        position += n
+
+    signal = np.concatenate(parts) if parts else np.zeros(0)
+    signal = signal + rng.standard_normal(signal.size) * noise_rms
+    return np.clip(np.rint(signal), -32768, 32767).astype(np.int16), truth
+
+
+def load_wav(path):
+    """Reads a 16-bit WAV as mono int16 (channels averaged). Returns (samples, sample_rate)."""
+    with wave.open(path, 'rb') as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
+
+
+class ReplayDriver:
+    """
+    Feeds recorded or synthetic audio through an AudioService's VAD/segmentation path.
+
+    Drives the same entry points the capture thread uses (_process_block when resampling,
+    _process_frame otherwise) with no stream, sleeps or threads, so it runs as fast as the
+    CPU allows. Signals are connected directly and timestamped in audio time, which makes
+    endpoint latency independent of how fast the replay runs.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self._events = []
+        service.audio_captured.connect(lambda audio: self._record("utterance", audio))
+        service.audio_segment.connect(lambda audio: self._record("segment", audio))
+        service.speaking_started.connect(lambda: self._record("start", None))
+        self._frame_index = 0
+        self._last_speech_frame = None
+
+    def _record(self, kind, audio):
+        self._events.append((kind, self._frame_index, self._last_speech_frame, len(audio) if audio else 0))
+
+    def run(self, samples, sample_rate=SAMPLE_RATE, truth=None):
+        """Replays int16 `samples` and returns a report dict."""
+        service = self.service
+        service._configure_capture(sample_rate)
+        service.log_queue = queue.Queue()
+        service.preroll.clear()
+        service.is_speaking = False
+        service._reset_utterance()
+        self._events = []
+        self._frame_index = 0
+        self._last_speech_frame = None
+
+        # Time each native-rate block (what the capture thread would hand over)
+        block_size = service.buffer.frame_size
+        blocks = samples.size // block_size
+        timings = np.empty(blocks)
+
+        process_frame = service._process_frame
+        def timed_frame(frame):
+            process_frame(frame)
+            if service.is_speaking and service.silence_frames == 0:
+                self._last_speech_frame = self._frame_index
+            self._frame_index += 1
+
+        service._process_frame = timed_frame
+        try:
+            start = time.perf_counter()
+            for i in range(blocks):
+                block = samples[i * block_size:(i + 1) * block_size]
+                t0 = time.perf_counter()
+                if service.resampler:
+                    service._process_block(block)
+                else:
+                    service._process_frame(block)
+                timings[i] = time.perf_counter() - t0
+                if i % 500 == 0:
+                    self._drain_log()
+            elapsed = time.perf_counter() - start
+        finally:
+            del service._process_frame # Back to the class method
+            self._drain_log()
+
+        return self._report(blocks, block_size / sample_rate, elapsed, timings, truth)
+
+    def _drain_log(self):
+        while True:
+            try:
+                self.service.log_queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _report(self, blocks, block_s, elapsed, timings, truth):
+        frame_s = self.service.frame_duration_ms / 1000.0
+        utterances = [e for e in self._events if e[0] == "utterance"]
+        segments = [e for e in self._events if e[0] == "segment"]
+
+        # Endpoint latency: last frame the VAD held as speech -> utterance emitted
+        latencies = [(frame - last) * frame_s for _, frame, last, _ in utterances if last is not None]
+
+        # Against ground truth (synthetic patterns): true end of speech -> emission
+        truth_latencies = []
+        if truth:
+            for _, frame, _, _ in utterances:
+                emitted_s = (frame + 1) * frame_s
+                ended = [end for _, end in truth if end <= emitted_s]
+                if ended:
+                    truth_latencies.append(emitted_s - ended[-1])
+
+        audio_s = blocks * block_s
+        report = {
+            "audio_seconds": audio_s,
+            "wall_seconds": elapsed,
+            "realtime_factor": audio_s / elapsed if elapsed else float("inf"),
+            "frames": self._frame_index,
+            "frames_per_second": self._frame_index / elapsed if elapsed else float("inf"),
+            "utterances": len(utterances),
+            "speech_utterances": sum(1 for e in utterances if e[3]),
+            "segments": len(segments),
+            "block_us_mean": float(timings.mean() * 1e6) if blocks else 0.0,
+            "block_us_p50": float(np.percentile(timings, 50) * 1e6) if blocks else 0.0,
+            "block_us_p99": float(np.percentile(timings, 99) * 1e6) if blocks else 0.0,
+            "block_us_max": float(timings.max() * 1e6) if blocks else 0.0,
+        }
+        report.update(_distribution("endpoint_ms", latencies))
+        if truth is not None:
+            report["expected_utterances"] = len(truth)
+            report.update(_distribution("truth_endpoint_ms", truth_latencies))
+        report.update({k: v for k, v in self.service.get_stats().items() if k.startswith("frames_")})
+        return report
+
+
+def _distribution(name, values_s):
+    if not values_s:
+        return {f"{name}_p50": None, f"{name}_p90": None, f"{name}_max": None}
+    values_ms = np.array(values_s) * 1000
+    return {
+        f"{name}_p50": float(np.percentile(values_ms, 50)),
+        f"{name}_p90": float(np.percentile(values_ms, 90)),
+        f"{name}_max": float(values_ms.max()),
+    }
@@ -0,0 +1,54 @@
+from math import gcd
+import numpy as np
+
+
+class PolyphaseResampler:
+    """
+    Stateful rational resampler (e.g. 48000 -> 16000, 44100 -> 16000) for streaming blocks.
+
+    A Kaiser-windowed sinc low-pass is split into `up` polyphase branches; each output sample
+    only evaluates the one branch it needs, so the cost is taps_per_phase MACs per output
+    sample regardless of the rate ratio. Each block is processed with one vectorized
+    gather + row-wise dot product. Filter history and the fractional position carry over
+    between blocks, so block boundaries are seamless.
+    """
+
+    def __init__(self, in_rate, out_rate, taps_per_phase=32, beta=8.0, rolloff=0.9):
+        g = gcd(int(in_rate), int(out_rate))
+        self.up = int(out_rate) // g
+        self.down = int(in_rate) // g
+        self.taps = taps_per_phase
+
+        # Prototype low-pass at the upsampled rate, cut off below the lower Nyquist
+        n = taps_per_phase * self.up
+        cutoff = rolloff * 0.5 / max(self.up, self.down)
+        t = np.arange(n) - (n - 1) / 2.0
+        h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(n, beta) * self.up
+
+        # phases[p, j] = h[p + j*up]; reversed along j so it lines up with the input window
+        self._phases = np.ascontiguousarray(h.reshape(taps_per_phase, self.up).T[:, ::-1], dtype=np.float32)
+        self._tap_offsets = np.arange(taps_per_phase)
+
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self._next = 0 # Upsampled-time position of the next output, relative to the current block
+
+    def process(self, block):
+        """Resamples one block of int16 (or float) samples. Returns int16 output."""
+        x = np.concatenate((self._history, block.astype(np.float32, copy=False).reshape(-1)))
+        n_in = x.size - (self.taps - 1)
+
+        total = n_in * self.up
+        positions = np.arange(self._next, total, self.down)
+        self._next = int(positions[-1] + self.down - total) if positions.size else self._next - total
+
+        base = positions // self.up # Newest input sample for each output (index into block)
+        phase = positions % self.up
+        windows = x[base[:, None] + self._tap_offsets] # (n_out, taps), oldest -> newest
+        y = np.einsum('ij,ij->i', windows, self._phases[phase])
+
+        self._history = x[-(self.taps - 1):].copy()
+        return np.clip(np.rint(y), -32768, 32767).astype(np.int16)
+
+    def reset(self):
+        self._history[:] = 0
+        self._next = 0
@@ -0,0 +1,179 @@
+import numpy as np
+
+
+class FrameRingBuffer:
+    """
+    Fixed-size, preallocated ring of int16 audio frames.
+
+    Single-producer/single-consumer: the PortAudio callback writes, the VAD thread reads.
+    Each side only ever advances its own index, so no lock is taken on the real-time path.
+    When the consumer falls behind and the ring is full, new frames are dropped and counted
+    as overruns instead of blocking the callback.
+    """
+
+    def __init__(self, frame_size, capacity=256):
+        self.frame_size = frame_size
+        self.capacity = capacity
+        self._slots = np.zeros((capacity, frame_size), dtype=np.int16)
+
+        # Monotonic counters; slot index is counter % capacity
+        self._write_index = 0
+        self._read_index = 0
+
+        # Stats
+        self.overruns = 0
+        self.high_water = 0
+
+    def __len__(self):
+        return self._write_index - self._read_index
+
+    def write(self, data):
+        """Copies one block into the next free slot. Returns False if the ring was full."""
+        fill = self._write_index - self._read_index
+        if fill >= self.capacity:
+            self.overruns += 1
+            return False
+
+        slot = self._slots[self._write_index % self.capacity]
+        samples = data.reshape(-1)
+        n = min(samples.size, self.frame_size)
+        slot[:n] = samples[:n]
+        if n < self.frame_size:
+            slot[n:] = 0
+
+        # Publish only after the copy is complete
+        self._write_index += 1
+        if fill + 1 > self.high_water:
+            self.high_water = fill + 1
+        return True
+
+    def peek(self):
+        """Returns the oldest frame as a view into its slot, or None if the ring is empty.
+
+        The slot is not reused by the producer until advance() is called, so the consumer can
+        process it in place instead of copying it out first.
+        """
+        if self._read_index == self._write_index:
+            return None
+        return self._slots[self._read_index % self.capacity]
+
+    def advance(self):
+        """Releases the frame returned by peek()."""
+        self._read_index += 1
+
+    def clear(self):
+        """Drops any unread frames. Only call while the producer is stopped."""
+        self._read_index = self._write_index
+
+    def stats(self):
+        return {
+            "frames_written": self._write_index,
+            "frames_read": self._read_index,
+            "overruns": self.overruns,
+            "high_water": self.high_water,
+            "capacity": self.capacity,
+        }
+
+
+class PrerollBuffer:
+    """
+    Bounded history of the most recent frames before speech onset.
+
+    Frames are copied into preallocated slots, overwriting the oldest, so keeping the
+    pre-roll costs one small memcpy per silent frame and no allocations. The stored frames
+    are only copied out when an utterance actually starts.
+    """
+
+    def __init__(self, frame_size, frames):
+        self.capacity = frames
+        self._slots = np.zeros((frames, frame_size), dtype=np.int16)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def push(self, frame):
+        if not self.capacity:
+            return
+        np.copyto(self._slots[self._next], frame)
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def drain_into(self, utterance):
+        """Appends the stored frames to an UtteranceBuffer, oldest first, and empties the buffer.
+
+        Returns the number of frames moved.
+        """
+        count = self._count
+        start = (self._next - count) % self.capacity if self.capacity else 0
+        for i in range(count):
+            utterance.append(self._slots[(start + i) % self.capacity])
+        self.clear()
+        return count
+
+    def clear(self):
+        self._count = 0
+
+
+class UtteranceBuffer:
+    """
+    Growable int16 store for the utterance being assembled, with per-frame RMS and VAD flags.
+
+    Each frame is copied in exactly once. Audio leaves as a memoryview of this storage
+    (take()/peek()), never as joined bytes. Storage that has been handed out is never
+    written again: take() switches to a fresh array, carrying over only the frames after
+    the cut, and clear() does the same if a view is still outstanding. Capacity doubles
+    when full; size it for the longest utterance to avoid that copy.
+    """
+
+    def __init__(self, frame_size, initial_frames=256):
+        self.frame_size = frame_size
+        self.frames = 0
+        self._allocate(initial_frames)
+
+    def _allocate(self, capacity):
+        self._samples = np.empty((capacity, self.frame_size), dtype=np.int16)
+        self.energies = np.empty(capacity, dtype=np.float64)
+        self.speech = np.empty(capacity, dtype=bool)
+        self._shared = False # A view of _samples is held downstream
+
+    def __len__(self):
+        return self.frames
+
+    def append(self, frame, rms=0.0, is_speech=False):
+        if self.frames == len(self._samples):
+            self._move_to_new_storage(0, len(self._samples) * 2)
+        self._samples[self.frames] = frame
+        self.energies[self.frames] = rms
+        self.speech[self.frames] = is_speech
+        self.frames += 1
+
+    def speech_count(self):
+        return int(np.count_nonzero(self.speech[:self.frames]))
+
+    def peek(self):
+        """Bytes view of everything buffered so far; later appends do not change it."""
+        self._shared = True
+        return memoryview(self._samples[:self.frames]).cast('B')
+
+    def take(self, cut=None):
+        """Hands out frames [0, cut) as a bytes view and keeps the rest buffered."""
+        cut = self.frames if cut is None else cut
+        view = memoryview(self._samples[:cut]).cast('B')
+        self._move_to_new_storage(cut, len(self._samples))
+        return view
+
+    def clear(self):
+        if self._shared:
+            self._allocate(len(self._samples))
+        self.frames = 0
+
+    def _move_to_new_storage(self, start, capacity):
+        samples, energies, speech = self._samples, self.energies, self.speech
+        count = self.frames - start
+        self._allocate(max(capacity, count))
+        self._samples[:count] = samples[start:self.frames]
+        self.energies[:count] = energies[start:self.frames]
+        self.speech[:count] = speech[start:self.frames]
+        self.frames = count
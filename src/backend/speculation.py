@@ -0,0 +1,84 @@
+import logging
+import queue
+import threading
+from src.backend.cancellation import CancelToken
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Speculation")
+
+_DONE = object()
+
+class SpeculativeAnswer:
+    """
+    Transcription + RAG + generation for an utterance whose endpoint is not confirmed yet.
+
+    Started on a short pause (AudioService.speculative_endpoint). Answer chunks are buffered
+    rather than shown. If the real endpoint follows, the controller adopts the speculation and
+    replays the buffer before streaming the rest live; if speech resumes it is cancelled and
+    everything it produced is discarded (the turn is never written to history).
+    """
+
+    def __init__(self, llm_service, transcript_future):
+        self.llm_service = llm_service
+        self.transcript_future = transcript_future
+        self.text = None
+        self.succeeded = False
+
+        self.cancel_token = CancelToken()
+        self._transcript_ready = threading.Event()
+        self._chunks = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Discards the speculation and aborts its in-flight LLM request."""
+        self.cancel_token.cancel()
+
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+
+    def transcript(self):
+        """Blocks until the transcript is known. Returns None if transcription failed."""
+        self._transcript_ready.wait()
+        return self.text
+
+    def stream(self):
+        """Yields buffered answer chunks, then live ones, until generation ends."""
+        while True:
+            chunk = self._chunks.get()
+            if chunk is _DONE:
+                return
+            yield chunk
+
+    def _run(self):
+        try:
+            self.text = self.transcript_future.result()
+        except Exception as e:
+            logger.error(f"Speculative transcription failed: {e}")
+        finally:
+            self._transcript_ready.set()
+
+        if self.text is None or self.cancelled:
+            self._chunks.put(_DONE)
+            return
+
+        logger.info(f"Speculating on: {self.text}")
+        gen = self.llm_service.generate_answer(self.text, record_history=False, cancel_token=self.cancel_token)
+        try:
+            while not self.cancelled:
+                try:
+                    chunk = next(gen)
+                except StopIteration as stop:
+                    self.succeeded = bool(stop.value)
+                    break
+                self._chunks.put(chunk)
+        finally:
+            gen.close()
+            self._chunks.put(_DONE)
+
+        if self.cancelled:
+            logger.info("Speculation discarded.")
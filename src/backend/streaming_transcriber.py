@@ -0,0 +1,112 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from src.backend.transcription import TranscriptionError, transcription_text
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("StreamingTranscriber")
+
+# Max words checked when removing text repeated across a window boundary
+MAX_OVERLAP_WORDS = 6
+# Trailing characters of the transcript so far passed to Whisper as context
+PROMPT_TAIL_CHARS = 200
+
+def _normalize_word(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+def stitch_transcripts(parts):
+    """Joins partial transcripts, dropping words a window repeats from the previous one."""
+    words = []
+    for part in parts:
+        new_words = part.split()
+        if not new_words:
+            continue
+        max_k = min(MAX_OVERLAP_WORDS, len(words), len(new_words))
+        for k in range(max_k, 0, -1):
+            tail = [_normalize_word(w) for w in words[-k:]]
+            head = [_normalize_word(w) for w in new_words[:k]]
+            if tail == head:
+                new_words = new_words[k:]
+                break
+        words.extend(new_words)
+    return " ".join(words)
+
+class StreamingTranscriber:
+    """
+    Transcribes an utterance incrementally while the speaker is still talking.
+
+    Rolling windows from AudioService.audio_segment are sent to the transcriber as they
+    arrive; at the endpoint only the remaining tail needs a round trip. All work runs on a
+    single background thread, so windows are transcribed (and stitched) in order and the
+    previous text can be passed to Whisper as a prompt for continuity.
+    """
+
+    def __init__(self, llm_service):
+        self.llm_service = llm_service
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="StreamingSTT")
+        self._parts = [] # Only touched on the executor thread
+        self._failure = None # Last TranscriptionError of the current utterance
+
+    def feed(self, audio_bytes):
+        """Queues a window of the ongoing utterance for transcription."""
+        return self._executor.submit(self._transcribe_part, audio_bytes)
+
+    def finish(self, tail_bytes):
+        """Queues the final tail; the returned future resolves to the stitched transcript."""
+        return self._executor.submit(self._finish, tail_bytes)
+
+    def preview(self, tail_bytes):
+        """Like finish(), but keeps the partial text so the utterance can still continue."""
+        return self._executor.submit(self._preview, tail_bytes)
+
+    def reset(self):
+        """Discards partial text of the current utterance (e.g. when it is dropped)."""
+        return self._executor.submit(self._reset)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _reset(self):
+        self._parts.clear()
+        self._failure = None
+
+    def _prompt(self):
+        if not self._parts:
+            return None
+        return " ".join(self._parts)[-PROMPT_TAIL_CHARS:]
+
+    def _transcribe(self, audio_bytes):
+        """Text of one piece of audio. A piece no backend could transcribe is skipped."""
+        try:
+            return transcription_text(self.llm_service.transcribe(audio_bytes, prompt=self._prompt()))
+        except TranscriptionError as e:
+            self._failure = e
+            return ""
+
+    def _transcribe_part(self, audio_bytes):
+        if not audio_bytes:
+            return
+        text = self._transcribe(audio_bytes)
+        if text:
+            self._parts.append(text)
+            logger.info(f"Partial transcript ({len(self._parts)}): {text}")
+
+    def _preview(self, tail_bytes):
+        parts = self._parts
+        if tail_bytes:
+            text = self._transcribe(tail_bytes)
+            if text:
+                parts = parts + [text]
+        if not parts and self._failure:
+            raise self._failure
+        return stitch_transcripts(parts)
+
+    def _finish(self, tail_bytes):
+        self._transcribe_part(tail_bytes)
+        text = stitch_transcripts(self._parts)
+        failure = self._failure
+        self._reset()
+        if not text and failure:
+            # Nothing usable: fail the utterance rather than answer an empty question
+            raise failure
+        return text
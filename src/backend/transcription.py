@@ -0,0 +1,355 @@
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+from src.backend.audio_codec import WavEncoder
+
+try:
+    import faster_whisper
+except Exception: # ImportError, or a broken CTranslate2 install
+    faster_whisper = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Transcription")
+
+BASE_PROMPT = "The audio is an interview question."
+
+def whisper_prompt(prompt=None):
+    """Initial prompt for Whisper: the fixed hint plus the transcript so far, if any."""
+    return f"{BASE_PROMPT} {prompt}" if prompt else BASE_PROMPT
+
+def transcription_text(transcription_obj):
+    """Normalizes an API return value (object with .text or plain string)."""
+    if hasattr(transcription_obj, 'text'):
+        return transcription_obj.text.strip()
+    return str(transcription_obj).strip()
+
+class TranscriptionError(Exception):
+    """A backend could not produce a transcript (not configured, network error, ...)."""
+
+class Transcriber:
+    """
+    Speech-to-text backend.
+
+    transcribe() takes 16 kHz 16-bit mono PCM (bytes or a memoryview from AudioService) and
+    returns the text, or raises TranscriptionError. It is never handed an error string to
+    pass along, so a failure can't reach the LLM as if it were the question.
+    """
+    name = "transcriber"
+
+    def available(self):
+        """False if the backend can't run at all (missing key, package or model)."""
+        return True
+
+    def prepare(self):
+        """Loads whatever the first call would otherwise wait for. Optional."""
+
+    def signature(self):
+        """Identifies what produces the text (backend, model, settings); part of cache keys."""
+        return self.name
+
+    def transcribe(self, audio_bytes, prompt=None):
+        raise NotImplementedError
+
+    def transcribe_with_source(self, audio_bytes, prompt=None):
+        """(text, signature of the backend that produced it)."""
+        return self.transcribe(audio_bytes, prompt=prompt), self.signature()
+
+class GroqTranscriber(Transcriber):
+    """Whisper on Groq. `client` is a callable returning the current Groq client (keys can change)."""
+    name = "groq"
+
+    def __init__(self, client, encoder=None, model="whisper-large-v3-turbo", sample_rate=16000, timeout_s=None):
+        self.client = client
+        self.encoder = encoder or WavEncoder()
+        self.model = model
+        self.sample_rate = sample_rate
+        self.timeout_s = timeout_s # Deadline of the whole call (no SDK retries), so a stalled call fails over
+
+    def available(self):
+        return self.client() is not None
+
+    def signature(self):
+        return f"{self.name}:{self.model}:{self.encoder.name}" # Lossy uploads can transcribe differently
+
+    def transcribe(self, audio_bytes, prompt=None):
+        client = self.client()
+        if client is None:
+            raise TranscriptionError("Groq API Key missing")
+
+        # Wrap raw 16-bit PCM in the configured container
+        encoder = self.encoder
+        try:
+            payload = encoder.encode(audio_bytes, self.sample_rate)
+        except Exception as e:
+            logger.warning(f"{encoder.name} encoding failed: {e}. Falling back to WAV.")
+            encoder = WavEncoder()
+            payload = encoder.encode(audio_bytes, self.sample_rate)
+
+        kwargs = {"timeout": self.timeout_s} if self.timeout_s else {}
+        try:
+            transcription = without_retries(client).audio.transcriptions.create(
+                file=(encoder.filename, payload),
+                model=self.model,
+                prompt=whisper_prompt(prompt),
+                response_format="text",
+                **kwargs
+            )
+        except Exception as e:
+            raise TranscriptionError(f"Groq: {e}") from e
+        return transcription_text(transcription)
+
+def without_retries(client):
+    """`client` with the SDK's automatic retries off (failover is the retry)."""
+    max_retries = getattr(client, "max_retries", None)
+    if isinstance(max_retries, int) and max_retries > 0:
+        return client.with_options(max_retries=0)
+    return client
+
+class LocalWhisperTranscriber(Transcriber):
+    """
+    Quantized Whisper on the CPU via faster-whisper (CTranslate2, int8).
+
+    The model is loaded from `model_path` (a converted model directory) on first use, or
+    earlier via prepare(), and never downloaded. `model_factory(model_path)` replaces
+    faster_whisper.WhisperModel, e.g. for tests.
+    """
+    name = "local"
+
+    def __init__(self, model_path, compute_type="int8", cpu_threads=0, beam_size=1, language="en", model_factory=None):
+        self.model_path = model_path
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.beam_size = beam_size # Greedy: beam search costs more than it gains on short questions
+        self.language = language
+        self.model_factory = model_factory
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    def available(self):
+        return bool(self.model_path) and (self.model_factory is not None or faster_whisper is not None)
+
+    def prepare(self):
+        self._load()
+
+    def signature(self):
+        return f"{self.name}:{self.model_path}:{self.compute_type}:{self.beam_size}:{self.language}"
+
+    def _load(self):
+        with self._load_lock:
+            if self._model is None:
+                if not self.available():
+                    raise TranscriptionError("Local Whisper unavailable (install faster-whisper and set local_whisper_model_path)")
+                start = time.perf_counter()
+                try:
+                    if self.model_factory:
+                        self._model = self.model_factory(self.model_path)
+                    else:
+                        self._model = faster_whisper.WhisperModel(
+                            self.model_path, device="cpu", compute_type=self.compute_type,
+                            cpu_threads=self.cpu_threads, local_files_only=True
+                        )
+                except Exception as e:
+                    raise TranscriptionError(f"Loading local Whisper model failed: {e}") from e
+                logger.info(f"Loaded local Whisper model from {self.model_path} in {time.perf_counter() - start:.1f}s")
+            return self._model
+
+    def transcribe(self, audio_bytes, prompt=None):
+        model = self._load()
+        # faster-whisper takes float32 samples in [-1, 1] at 16 kHz
+        samples = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+        try:
+            segments, _ = model.transcribe(
+                samples, beam_size=self.beam_size, language=self.language,
+                initial_prompt=whisper_prompt(prompt), condition_on_previous_text=False
+            )
+            # segments is lazy; decoding happens while iterating
+            return " ".join(segment.text.strip() for segment in segments).strip()
+        except Exception as e:
+            raise TranscriptionError(f"Local Whisper: {e}") from e
+
+class FailoverTranscriber(Transcriber):
+    """
+    Tries backends in preference order, skipping ones that are currently slow or failing.
+
+    A backend that raises, or answers slower than `slow_s` per second of audio (plus a fixed
+    `overhead_s` for the round trip), is demoted for `cooldown_s`: later calls go to the next
+    backend first, and the demoted one is retried once the cooldown expires. A call that
+    fails moves straight on to the next backend, so one utterance is never lost to a single
+    backend being down. Latency is also tracked as a moving average for get_stats().
+    """
+    name = "failover"
+
+    def __init__(self, backends, slow_s=0.5, overhead_s=1.5, cooldown_s=30.0, clock=time.monotonic):
+        self.backends = list(backends)
+        self.slow_s = slow_s
+        self.overhead_s = overhead_s
+        self.cooldown_s = cooldown_s
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._demoted_until = {backend.name: 0.0 for backend in self.backends}
+        self.latency_ms = {backend.name: None for backend in self.backends}
+        self.last_backend = None
+
+    def available(self):
+        return any(backend.available() for backend in self.backends)
+
+    def prepare(self):
+        for backend in self.backends:
+            if backend.available():
+                try:
+                    backend.prepare()
+                except TranscriptionError as e:
+                    logger.warning(f"Preparing {backend.name} failed: {e}")
+
+    def signature(self):
+        """The backend that would be tried first right now."""
+        order = self.order()
+        return order[0].signature() if order else self.name
+
+    def order(self):
+        """Available backends, healthy ones first (each group in preference order)."""
+        now = self.clock()
+        with self._lock:
+            candidates = [b for b in self.backends if b.available()]
+            return sorted(candidates, key=lambda b: self._demoted_until[b.name] > now)
+
+    def transcribe(self, audio_bytes, prompt=None):
+        return self.transcribe_with_source(audio_bytes, prompt=prompt)[0]
+
+    def transcribe_with_source(self, audio_bytes, prompt=None):
+        audio_s = len(audio_bytes) / 2 / 16000
+        errors = []
+        for backend in self.order():
+            start = self.clock()
+            try:
+                text = backend.transcribe(audio_bytes, prompt=prompt)
+            except TranscriptionError as e:
+                logger.warning(f"{backend.name} transcription failed: {e}. Trying next backend...")
+                self._demote(backend)
+                errors.append(str(e))
+                continue
+
+            elapsed = self.clock() - start
+            self._record(backend, elapsed)
+            if elapsed > self.overhead_s + self.slow_s * audio_s:
+                logger.warning(f"{backend.name} took {elapsed:.1f}s for {audio_s:.1f}s of audio; preferring other backends for a while.")
+                self._demote(backend)
+            self.last_backend = backend.name
+            return text, backend.signature()
+
+        raise TranscriptionError("; ".join(errors) or "No transcription backend available")
+
+    def _demote(self, backend):
+        with self._lock:
+            self._demoted_until[backend.name] = self.clock() + self.cooldown_s
+
+    def _record(self, backend, elapsed):
+        with self._lock:
+            ms = elapsed * 1000
+            previous = self.latency_ms[backend.name]
+            self.latency_ms[backend.name] = ms if previous is None else 0.8 * previous + 0.2 * ms
+
+    def get_stats(self):
+        with self._lock:
+            return {"last_backend": self.last_backend, "latency_ms": dict(self.latency_ms)}
+
+class CachedTranscriber(Transcriber):
+    """
+    Bounded LRU of transcripts in front of another transcriber, keyed by content.
+
+    The key hashes the PCM together with the prompt and the signature of the backend that
+    produced the text, so the same audio sent again (replays, regeneration, test harnesses)
+    skips the round trip, while a different prompt, model or upload codec is a different
+    entry. Lookups use the backend that would answer now, so a fallback's transcript is only
+    reused while that fallback is in charge. With a `store` (DatabaseManager) entries
+    are also written to SQLite and looked up there on a memory miss, so they survive
+    restarts. Failures are never cached.
+    """
+    name = "cache"
+
+    def __init__(self, backend, max_entries=256, store=None):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.store = store
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.last_backend = None
+
+    def available(self):
+        return self.backend.available()
+
+    def prepare(self):
+        self.backend.prepare()
+
+    def signature(self):
+        return self.backend.signature()
+
+    def key(self, audio_bytes, prompt=None, signature=None):
+        digest = hashlib.sha256()
+        digest.update((signature or self.signature()).encode())
+        digest.update(b"\0")
+        digest.update((prompt or "").encode())
+        digest.update(b"\0")
+        digest.update(audio_bytes) # Hashed in place; a memoryview is not copied
+        return digest.hexdigest()
+
+    def transcribe(self, audio_bytes, prompt=None):
+        key = self.key(audio_bytes, prompt)
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.last_backend = self.name
+                return text
+
+        if self.store is not None:
+            text = self.store.get_cached_transcript(key)
+            if text is not None:
+                with self._lock:
+                    self.store_hits += 1
+                    self.last_backend = self.name
+                    self._remember(key, text)
+                return text
+
+        text, source = self.backend.transcribe_with_source(audio_bytes, prompt=prompt)
+        key = self.key(audio_bytes, prompt, signature=source) # Filed under whoever answered
+        with self._lock:
+            self.misses += 1
+            self.last_backend = getattr(self.backend, "last_backend", None) or self.backend.name
+            self._remember(key, text)
+        if self.store is not None:
+            self.store.save_cached_transcript(key, text, self.max_entries)
+        return text
+
+    def _remember(self, key, text):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            stats = {
+                "cache_hits": self.hits,
+                "cache_store_hits": self.store_hits,
+                "cache_misses": self.misses,
+                "cache_hit_rate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+                "cache_entries": len(self._entries),
+            }
+        if hasattr(self.backend, "get_stats"):
+            stats.update(self.backend.get_stats())
+        return stats
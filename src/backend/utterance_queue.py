@@ -0,0 +1,93 @@
+import logging
+from collections import deque
+from src.backend.transcription import TranscriptionError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("UtteranceQueue")
+
+POLICIES = ("drop_oldest", "merge", "preempt")
+
+class MergedTranscript:
+    """Future-like result() over several transcript futures, joined into one question."""
+
+    def __init__(self, futures):
+        self.futures = list(futures)
+
+    def result(self, timeout=None):
+        texts = []
+        failure = None
+        for future in self.futures:
+            try:
+                text = future.result(timeout=timeout)
+            except TranscriptionError as e:
+                failure = e
+                continue
+            if text:
+                texts.append(text)
+        if not texts and failure:
+            raise failure
+        return " ".join(texts)
+
+class UtteranceQueue:
+    """
+    Utterances captured while an answer is still being generated.
+
+    Entries are transcript futures: transcription is already queued when an utterance is
+    captured, so it runs while the previous answer streams and the next answer can start as
+    soon as the current one is done. At most `max_pending` entries are kept; on overflow the
+    policy decides:
+
+    - drop_oldest: the oldest waiting utterance is discarded.
+    - merge: the new utterance is appended to the newest entry and answered as one question
+      (a follow-up usually completes the question before it).
+    - preempt: like drop_oldest, and every push() asks the caller to abort the current answer,
+      so the newest question is answered next without waiting for the old answer to finish.
+
+    max_pending=0 disables queueing (utterances captured while busy are dropped).
+    Only used from the Qt main thread.
+    """
+
+    def __init__(self, max_pending=2, policy="merge"):
+        if policy not in POLICIES:
+            logger.warning(f"Unknown utterance queue policy '{policy}', using 'merge'")
+            policy = "merge"
+        self.max_pending = max_pending
+        self.policy = policy
+        self._pending = deque() # Each entry: list of transcript futures
+        self.dropped = 0
+        self.merged = 0
+
+    @property
+    def enabled(self):
+        return self.max_pending > 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def push(self, transcript_future):
+        """Queues an utterance. Returns True if the current generation should be preempted."""
+        if self.policy == "merge" and len(self._pending) >= self.max_pending:
+            self._pending[-1].append(transcript_future)
+            self.merged += 1
+            logger.info("Queue full: merged utterance into the last waiting one.")
+            return False
+
+        self._pending.append([transcript_future])
+        while len(self._pending) > self.max_pending:
+            self._pending.popleft()
+            self.dropped += 1
+            logger.info("Queue full: dropped the oldest waiting utterance.")
+        return self.policy == "preempt"
+
+    def pop(self):
+        """Next transcript (future-like), or None if nothing is waiting."""
+        if not self._pending:
+            return None
+        futures = self._pending.popleft()
+        return futures[0] if len(futures) == 1 else MergedTranscript(futures)
+
+    def clear(self):
+        self._pending.clear()
+
+    def get_stats(self):
+        return {"pending": len(self._pending), "dropped": self.dropped, "merged": self.merged}
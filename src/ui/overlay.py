@@ -74,6 +74,7 @@ class OverlayWindow(QWidget):
     toggle_listening = pyqtSignal(bool) # True = Start, False = Stop/Pause
     end_interview = pyqtSignal()
     regenerate_requested = pyqtSignal()
+    stop_requested = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -103,6 +104,7 @@ class OverlayWindow(QWidget):
         self.current_ai_item = None
         self.has_animated_in = False  # Track if initial animation played
         self.last_style_level = None  # Performance: Track last audio level style
+        self.last_fill_width = None   # Performance: Skip relayout when the bar width is unchanged
 
         # Layout
         self.main_layout = QVBoxLayout()
@@ -416,6 +418,10 @@ class OverlayWindow(QWidget):
         self.sc_regen = QShortcut(QKeySequence(Qt.Key.Key_R), self)
         self.sc_regen.activated.connect(self.regenerate_requested.emit)
 
+        # Key 'S' to stop the answer being generated
+        self.sc_stop = QShortcut(QKeySequence(Qt.Key.Key_S), self)
+        self.sc_stop.activated.connect(self.stop_requested.emit)
+
     def scroll_up(self):
         if self.scroll_area.isVisible():
             val = self.scroll_area.verticalScrollBar().value()
@@ -611,7 +617,9 @@ class OverlayWindow(QWidget):
     def update_audio_level(self, level):
         width = self.audio_bar.width()
         fill_width = int(width * level)
-        self.audio_bar_fill.setFixedWidth(fill_width)
+        if fill_width != self.last_fill_width:
+            self.last_fill_width = fill_width
+            self.audio_bar_fill.setFixedWidth(fill_width)
 
         # Determine current style category
         if level > 0.8:
@@ -54,6 +54,20 @@ class SetupWizard(QDialog):
         self.device_combo.setMinimumHeight(40)
         self.layout.addWidget(self.device_combo)
 
+        # Optional own-mic device: endpointed separately so your answers aren't sent for transcription
+        mic_label = QLabel("Your Microphone (optional):")
+        mic_label.setStyleSheet("""
+            color: #B0B0B0;
+            font-size: 12px;
+            font-weight: 500;
+            margin-top: 10px;
+        """)
+        self.layout.addWidget(mic_label)
+
+        self.mic_combo = QComboBox()
+        self.mic_combo.setMinimumHeight(40)
+        self.layout.addWidget(self.mic_combo)
+
         # Button container
         self.layout.addStretch()
         
@@ -131,13 +145,24 @@ class SetupWizard(QDialog):
 
     def scan_devices(self):
         self.device_combo.clear()
+        self.mic_combo.clear()
+        self.mic_combo.addItem("None (don't track my own speech)", None)
         devices = self.audio_service.list_devices()
 
         blackhole_found = False
         blackhole_index = -1
 
+        self.device_names = {}
         for dev in devices:
-            self.device_combo.addItem(dev['name'], dev['index'])
+            self.device_names[dev['index']] = dev['name']
+            label = dev['name']
+            rate = dev.get('default_samplerate')
+            if rate:
+                # Captured at this rate and resampled to 16 kHz by the app
+                label = f"{dev['name']}  ({rate / 1000:g} kHz)"
+            self.device_combo.addItem(label, dev['index'])
+            if "BlackHole" not in dev['name']:
+                self.mic_combo.addItem(label, dev['index'])
             if "BlackHole" in dev['name']:
                 blackhole_found = True
                 blackhole_index = self.device_combo.count() - 1
@@ -146,7 +171,9 @@ class SetupWizard(QDialog):
             self.info_label.setText(
                 "<b>✅ BlackHole driver detected!</b><br><br>"
                 "This virtual audio device allows the assistant to hear your interviewer's audio. "
-                "The device is selected below. Click 'Use Selected Device' to continue."
+                "The device is selected below. Click 'Use Selected Device' to continue.<br><br>"
+                "<i>Devices are captured at their native rate (shown in brackets) and converted to 16 kHz by the app, "
+                "so there's no need to change the rate in Audio MIDI Setup.</i>"
             )
             self.info_label.setStyleSheet("""
                 color: #E8E8E8;
@@ -183,7 +210,7 @@ class SetupWizard(QDialog):
 
     def save_and_close(self):
         idx = self.device_combo.currentData()
-        name = self.device_combo.currentText()
+        name = self.device_names.get(idx, self.device_combo.currentText())
 
         if idx is None:
              QMessageBox.warning(self, "Selection Required", "Please select an audio device.")
@@ -192,6 +219,8 @@ class SetupWizard(QDialog):
         config = load_config()
         config['audio_device'] = name
         config['audio_device_index'] = idx # Save index too, though it might change on reboot
+        mic_idx = self.mic_combo.currentData()
+        config['mic_device_index'] = mic_idx if mic_idx != idx else None
         save_config(config)
 
         self.accept()
@@ -0,0 +1,62 @@
+"""Plain helpers shared by the test modules."""
+import time
+import socket
+import sys
+import threading
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+def make_chunk(text):
+    """A streamed chat completion chunk carrying `text`."""
+    chunk = MagicMock()
+    chunk.choices = [MagicMock()]
+    chunk.choices[0].delta.content = text
+    return chunk
+
+@contextmanager
+def real_modules(*names):
+    """Undoes other test modules' `sys.modules[name] = MagicMock()` for the duration, for tests
+    that need the real SDK (it is imported again on demand)."""
+    with patch.dict(sys.modules):
+        for name in names:
+            if isinstance(sys.modules.get(name), MagicMock):
+                del sys.modules[name]
+        yield
+
+class FakeClock:
+    """Monotonic clock the test advances by setting `now`."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class SilentServer:
+    """Accepts connections and never answers, like a hung provider."""
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.url = f"http://127.0.0.1:{self.sock.getsockname()[1]}"
+        self.connections = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                self.connections.append(self.sock.accept()[0])
+            except OSError:
+                return
+
+    def accepted(self, timeout=0.5):
+        """Connections accepted so far, waiting up to `timeout` for the first (the accept
+        thread may lag behind the client's connect)."""
+        deadline = time.monotonic() + timeout
+        while not self.connections and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return len(self.connections)
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+        self.sock.close()
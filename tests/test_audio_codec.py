@@ -0,0 +1,63 @@
+import unittest
+import sys
+import os
+import io
+import wave
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend import audio_codec
+from src.backend.audio_codec import WavEncoder, FlacEncoder, get_encoder
+
+class TestAudioCodec(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pcm = (rng.standard_normal(16000) * 3000).astype(np.int16).tobytes()
+
+    def test_wav_header_is_valid(self):
+        payload = WavEncoder().encode(self.pcm, 16000)
+        self.assertEqual(len(payload), 44 + len(self.pcm))
+        with wave.open(payload, 'rb') as wf:
+            self.assertEqual(wf.getnchannels(), 1)
+            self.assertEqual(wf.getsampwidth(), 2)
+            self.assertEqual(wf.getframerate(), 16000)
+            self.assertEqual(wf.readframes(wf.getnframes()), self.pcm)
+
+    def test_wav_reader_chunks_and_rewinds(self):
+        pcm = memoryview(np.arange(100, dtype=np.int16)).cast('B')
+        payload = WavEncoder().encode(pcm, 16000)
+        chunks = []
+        while True:
+            chunk = payload.read(30) # Straddles the 44-byte header boundary
+            if not chunk:
+                break
+            chunks.append(chunk)
+        body = b''.join(chunks)
+        self.assertEqual(body[:4], b'RIFF')
+        self.assertEqual(body[44:], pcm.tobytes())
+
+        payload.seek(0) # HTTP client retries re-read the body
+        self.assertEqual(payload.read(), body)
+
+    @unittest.skipIf(audio_codec.sf is None, "soundfile not installed")
+    def test_flac_is_lossless(self):
+        payload = FlacEncoder().encode(self.pcm, 16000)
+        samples, rate = audio_codec.sf.read(io.BytesIO(payload), dtype='int16')
+        self.assertEqual(rate, 16000)
+        self.assertEqual(samples.tobytes(), self.pcm)
+
+    def test_unknown_codec_falls_back_to_wav(self):
+        self.assertIsInstance(get_encoder("mp3"), WavEncoder)
+        self.assertIsInstance(get_encoder(None), WavEncoder)
+
+    def test_missing_soundfile_falls_back_to_wav(self):
+        original = audio_codec.sf
+        audio_codec.sf = None
+        try:
+            self.assertIsInstance(get_encoder("flac"), WavEncoder)
+        finally:
+            audio_codec.sf = original
+
+if __name__ == '__main__':
+    unittest.main()
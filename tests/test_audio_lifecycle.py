@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import time
+import threading
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend import audio_stream
+from src.backend.audio_stream import AudioService
+
+class TestAudioLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.streams = []
+        def make_stream(**kwargs):
+            stream = MagicMock()
+            stream.callback = kwargs['callback']
+            self.streams.append(stream)
+            return stream
+        audio_stream.sd.InputStream = MagicMock(side_effect=make_stream)
+
+        self.service = AudioService()
+        self.service.set_device(0)
+        self.service._process_frame = MagicMock()
+
+    def tearDown(self):
+        self.service.stop()
+        self.service.wait(1.0)
+        audio_stream.sd.InputStream = MagicMock()
+
+    def wait_for(self, condition, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return condition()
+
+    def test_callback_wakes_consumer(self):
+        self.service.start()
+        self.assertTrue(self.wait_for(lambda: self.streams and self.streams[0].start.called))
+
+        block = np.full((320, 1), 3, dtype=np.int16)
+        self.streams[0].callback(block, 320, None, None)
+
+        # Driven by the wake event, not a poll interval
+        self.assertTrue(self.wait_for(lambda: self.service._process_frame.called, timeout=0.05))
+        self.service.stop()
+        self.assertTrue(self.service.wait(1.0))
+
+    def test_stop_returns_immediately(self):
+        self.service.start()
+        self.assertTrue(self.wait_for(lambda: self.streams and self.streams[0].start.called))
+
+        start = time.perf_counter()
+        self.service.stop()
+        self.assertLess(time.perf_counter() - start, 0.02)
+
+        self.assertTrue(self.service.wait(1.0))
+        self.streams[0].abort.assert_called_once()
+        self.streams[0].close.assert_called_once()
+
+    def test_rapid_toggle_leaks_nothing(self):
+        baseline = threading.active_count()
+        for _ in range(20):
+            self.service.start()
+            self.service.stop()
+        self.service.start()
+        self.assertTrue(self.wait_for(lambda: self.streams and self.streams[-1].start.called))
+        self.service.stop()
+
+        self.assertTrue(self.service.wait(1.0))
+        self.assertTrue(self.wait_for(lambda: threading.active_count() <= baseline))
+        # Superseded runs never open their stream; every opened stream is closed
+        for stream in self.streams:
+            self.assertEqual(stream.close.call_count, 1)
+
+    def test_superseded_callback_aborts(self):
+        audio_stream.sd.CallbackAbort = type("CallbackAbort", (Exception,), {})
+        self.service.start()
+        self.assertTrue(self.wait_for(lambda: self.streams and self.streams[0].start.called))
+        callback = self.streams[0].callback
+        self.service.stop()
+
+        with self.assertRaises(audio_stream.sd.CallbackAbort):
+            callback(np.zeros((320, 1), dtype=np.int16), 320, None, None)
+        self.service.wait(1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import queue
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import make_chunk
+from src.backend.cancellation import CancelToken
+from src.backend.llm_service import LLMService
+from main import LLMWorker, RegenerationWorker
+
+class BlockingStream:
+    """Provider stream whose chunks arrive only when the test sends them; close() aborts a read."""
+    def __init__(self):
+        self.chunks = queue.Queue()
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                if self.closed.is_set():
+                    raise ConnectionError("stream closed")
+                return
+            yield chunk
+
+    def close(self):
+        self.closed.set()
+        self.chunks.put(None)
+
+class TestCancelToken(unittest.TestCase):
+    def test_callbacks_run_once(self):
+        token = CancelToken()
+        calls = []
+        token.on_cancel(lambda: calls.append("a"))
+        unregister = token.on_cancel(lambda: calls.append("b"))
+        unregister()
+
+        token.cancel()
+        token.cancel()
+        self.assertTrue(token.cancelled)
+        self.assertEqual(calls, ["a"])
+
+        # Registering after cancel runs immediately
+        token.on_cancel(lambda: calls.append("late"))
+        self.assertEqual(calls, ["a", "late"])
+
+class TestCancellableGeneration(unittest.TestCase):
+    def setUp(self):
+        self.service = LLMService(MagicMock(), openrouter_key="test", zhipu_key="test")
+        self.service.zhipu_client = MagicMock()
+        self.service.or_client = MagicMock()
+        self.service.story_engine = MagicMock()
+        self.service.story_engine.find_relevant_story.return_value = None
+
+    def test_cancel_aborts_blocked_stream_without_failover(self):
+        stream = BlockingStream()
+        self.service.zhipu_client.chat.completions.create.return_value = stream
+        token = CancelToken()
+        received = []
+        result = {}
+
+        def consume():
+            gen = self.service.generate_answer("Q", cancel_token=token)
+            try:
+                while True:
+                    received.append(next(gen))
+            except StopIteration as stop:
+                result["success"] = stop.value
+
+        worker = threading.Thread(target=consume)
+        worker.start()
+        stream.chunks.put(make_chunk("Hello"))
+
+        # The worker is now blocked waiting for the next token; cancel unblocks it
+        while not received:
+            threading.Event().wait(0.01)
+        token.cancel()
+        worker.join(timeout=2)
+
+        self.assertFalse(worker.is_alive())
+        self.assertTrue(stream.closed.is_set())
+        self.assertEqual(received, ["Hello"])
+        self.assertFalse(result["success"])
+        self.service.or_client.chat.completions.create.assert_not_called() # No backup after cancel
+        self.assertEqual(self.service.transcript_history, [])
+
+    def test_cancel_between_chunks(self):
+        token = CancelToken()
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([make_chunk("One"), make_chunk("Two")])
+        self.service.zhipu_client.chat.completions.create.return_value = stream
+
+        gen = self.service.generate_answer("Q", cancel_token=token)
+        self.assertEqual(next(gen), "One")
+        token.cancel()
+        self.assertEqual(list(gen), [])
+        stream.close.assert_called()
+        self.assertEqual(self.service.transcript_history, [])
+
+    def test_already_cancelled_makes_no_request(self):
+        token = CancelToken()
+        token.cancel()
+        self.assertEqual(list(self.service.generate_answer("Q", cancel_token=token)), [])
+        self.service.zhipu_client.chat.completions.create.assert_not_called()
+
+    def test_completed_stream_is_closed_and_recorded(self):
+        stream = MagicMock()
+        stream.__iter__.return_value = iter([make_chunk("Answer")])
+        self.service.zhipu_client.chat.completions.create.return_value = stream
+
+        self.assertEqual(list(self.service.generate_answer("Q", cancel_token=CancelToken())), ["Answer"])
+        stream.close.assert_called()
+        self.assertEqual(self.service.transcript_history[-1]["content"], "Answer")
+
+class TestWorkerCancellation(unittest.TestCase):
+    def make_worker(self, chunks):
+        service = MagicMock()
+        future = MagicMock()
+        future.result.return_value = "Q"
+        worker = LLMWorker(service, future)
+        service.generate_answer.side_effect = lambda text, cancel_token: iter(chunks(worker))
+
+        self.emitted = []
+        worker.transcription_ready.connect(lambda text: self.emitted.append(("question", text)))
+        worker.turn_complete.connect(lambda question, answer: self.emitted.append(("saved", question, answer)))
+        worker.finished.connect(lambda: self.emitted.append(("finished",)))
+        return worker
+
+    def test_completed_turn_is_saved(self):
+        worker = self.make_worker(lambda worker: ["An ", "answer"])
+        worker.run()
+        self.assertEqual(self.emitted, [("question", "Q"), ("saved", "Q", "An answer"), ("finished",)])
+
+    def test_cancelled_mid_answer_is_not_saved(self):
+        def chunks(worker):
+            yield "An "
+            worker.cancel()
+            yield "answer"
+        worker = self.make_worker(chunks)
+        worker.run()
+        self.assertEqual(self.emitted, [("question", "Q"), ("finished",)])
+
+    def test_cancelled_before_transcript_shows_nothing(self):
+        worker = self.make_worker(lambda worker: ["Answer"])
+        worker.cancel()
+        worker.run()
+        self.assertEqual(self.emitted, [("finished",)])
+        worker.llm_service.generate_answer.assert_not_called()
+
+class TestRegenerationCancellation(unittest.TestCase):
+    def make_worker(self, chunks):
+        service = MagicMock()
+        worker = RegenerationWorker(service, "Q", "Old answer")
+        def generate_answer(query, system_instruction, record_history, cancel_token):
+            yield from chunks(worker)
+            return not cancel_token.cancelled
+        service.generate_answer.side_effect = generate_answer
+
+        self.emitted = []
+        worker.answer_complete.connect(lambda answer: self.emitted.append(("saved", answer)))
+        worker.answer_restored.connect(lambda answer: self.emitted.append(("restored", answer)))
+        worker.finished.connect(lambda: self.emitted.append(("finished",)))
+        return worker
+
+    def test_completed_regeneration_replaces_the_answer(self):
+        worker = self.make_worker(lambda worker: ["New ", "answer"])
+        worker.run()
+        self.assertEqual(self.emitted, [("saved", "New answer"), ("finished",)])
+        worker.llm_service.record_turn.assert_called_once_with("Q", "New answer")
+
+    def test_cancelled_mid_answer_keeps_the_previous_answer(self):
+        def chunks(worker):
+            yield "New "
+            worker.cancel()
+            yield "answer"
+        worker = self.make_worker(chunks)
+        worker.run()
+        self.assertEqual(self.emitted, [("restored", "Old answer"), ("finished",)])
+        worker.llm_service.record_turn.assert_called_once_with("Q", "Old answer")
+
+if __name__ == '__main__':
+    unittest.main()
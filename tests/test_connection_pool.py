@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import FakeClock
+from src.backend.connection_pool import ConnectionPool, origin_of
+from src.backend.llm_service import LLMService
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.requests = []
+        def handler(request):
+            self.requests.append((request.method, str(request.url)))
+            return httpx.Response(404)
+        self.pool = ConnectionPool(warm_interval_s=30, http2=False, background=False, clock=self.clock,
+                                   transport=httpx.MockTransport(handler))
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_origin_of(self):
+        self.assertEqual(origin_of("https://openrouter.ai/api/v1/"), "https://openrouter.ai")
+        self.assertEqual(origin_of("http://127.0.0.1:8080/v1"), "http://127.0.0.1:8080")
+
+    def test_registered_origin_is_warmed_at_once(self):
+        self.pool.register("https://openrouter.ai/api/v1")
+        self.pool.register("https://openrouter.ai/api/v1/chat") # Same origin
+        self.assertAlmostEqual(self.pool.warm_due(), 30)
+        self.assertEqual(self.requests, [("HEAD", "https://openrouter.ai/")])
+
+    def test_only_idle_origins_are_pinged(self):
+        self.pool.register("https://openrouter.ai/api/v1")
+        self.pool.register("https://api.groq.com")
+        self.pool.warm_due()
+        self.requests.clear()
+
+        self.clock.now = 20
+        self.pool.client.post("https://api.groq.com/openai/v1/audio/transcriptions") # Real traffic
+        self.clock.now = 30
+        self.assertAlmostEqual(self.pool.warm_due(), 20)
+        self.assertEqual(self.requests[-1], ("HEAD", "https://openrouter.ai/"))
+        self.assertEqual(len(self.requests), 2)
+
+    def test_failed_ping_waits_an_interval(self):
+        pool = ConnectionPool(warm_interval_s=30, http2=False, background=False, clock=self.clock,
+                              transport=httpx.MockTransport(MagicMock(side_effect=httpx.ConnectError("down"))))
+        pool.register("https://openrouter.ai/api/v1")
+        self.assertAlmostEqual(pool.warm_due(), 30)
+        pool.close()
+
+class TestServiceClients(unittest.TestCase):
+    def test_clients_reused_until_keys_change(self):
+        service = LLMService(MagicMock(), groq_key="g1", openrouter_key="o1", zhipu_key="id.secret")
+        groq, openrouter, zhipu = service.groq_client, service.or_client, service.zhipu_client
+
+        service.update_keys("g1", "o1", "id.secret")
+        self.assertIs(service.groq_client, groq)
+        self.assertIs(service.or_client, openrouter)
+        self.assertIs(service.zhipu_client, zhipu)
+
+        service.update_keys("g1", "o2")
+        self.assertIs(service.groq_client, groq)
+        self.assertIsNot(service.or_client, openrouter)
+        self.assertIs(service.or_client._client, service.pool.client) # Same connections either way
+        self.assertIs(service.zhipu_client._client, service.pool.client)
+        service.pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
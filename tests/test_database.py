@@ -29,6 +29,28 @@ class TestDatabase(unittest.TestCase):
         self.assertIn('interviews', tables)
         self.assertIn('transcripts', tables)
         self.assertIn('stories', tables)
+        self.assertIn('speech_events', tables)
+        self.assertIn('transcription_cache', tables)
+
+    def test_save_speech_event(self):
+        id = self.db.create_interview()
+        self.db.save_speech_event(id, "candidate", 1234.5)
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT speaker, duration_ms FROM speech_events WHERE interview_id=?", (id,))
+        self.assertEqual(cursor.fetchone(), ("candidate", 1234))
+
+    def test_transcription_cache_is_bounded(self):
+        for i in range(5):
+            self.db.save_cached_transcript(f"key{i}", f"text {i}", max_entries=3)
+        self.db.save_cached_transcript("key2", "text 2 again", max_entries=3) # Rewrite refreshes it
+
+        self.assertIsNone(self.db.get_cached_transcript("key0"))
+        self.assertEqual(self.db.get_cached_transcript("key2"), "text 2 again")
+        self.db.save_cached_transcript("key5", "text 5", max_entries=3)
+        self.assertIsNone(self.db.get_cached_transcript("key3"))
+        self.assertEqual(self.db.get_cached_transcript("key2"), "text 2 again")
 
     def test_create_interview(self):
         id = self.db.create_interview()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import time
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.audio_stream import AudioService
+
+class TestDualChannelCapture(unittest.TestCase):
+    def setUp(self):
+        self.interviewer = AudioService()
+        self.mic = AudioService(speaker="candidate")
+        self.interviewer.attach_channel(self.mic, 1)
+
+    def test_attach_widens_stream(self):
+        self.assertEqual(self.interviewer.input_channels, 2)
+        self.assertIs(self.mic.source, self.interviewer)
+
+    def test_callback_splits_channels(self):
+        block = np.zeros((320, 2), dtype=np.int16)
+        block[:, 0] = 11
+        block[:, 1] = 22
+
+        self.interviewer._audio_callback(block, 320, None, None)
+
+        self.assertTrue((self.interviewer.buffer.peek() == 11).all())
+        self.assertTrue((self.mic.buffer.peek() == 22).all())
+
+    def test_capture_rate_propagates(self):
+        self.interviewer._configure_capture(48000)
+        self.assertEqual(self.mic.capture_rate, 48000)
+        self.assertEqual(self.mic.buffer.frame_size, 960)
+        self.assertIsNotNone(self.mic.resampler)
+
+    def test_independent_vad_state(self):
+        for service in (self.interviewer, self.mic):
+            service.vad = MagicMock()
+            service.vad.is_speech.side_effect = lambda data, rate: np.frombuffer(data, dtype=np.int16)[0] != 0
+            service.audio_captured = MagicMock()
+
+        speech = np.full(320, 500, dtype=np.int16)
+        silence = np.zeros(320, dtype=np.int16)
+
+        # Candidate answers while the interviewer is silent
+        for _ in range(30):
+            self.interviewer._process_frame(silence)
+            self.mic._process_frame(speech)
+        for _ in range(30):
+            self.interviewer._process_frame(silence)
+            self.mic._process_frame(silence)
+
+        self.mic.audio_captured.emit.assert_called_once()
+        self.interviewer.audio_captured.emit.assert_not_called()
+        self.assertFalse(self.interviewer.is_speaking)
+
+    def test_attached_follows_source(self):
+        self.interviewer.set_device(0)
+        self.interviewer.start()
+        # The source opens the (mocked) stream on its thread, then starts the tap
+        deadline = time.monotonic() + 1.0
+        while not self.mic.running and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertTrue(self.mic.running)
+
+        self.interviewer.stop()
+        self.assertFalse(self.mic.running)
+        self.assertTrue(self.interviewer.wait(1.0))
+        self.assertTrue(self.mic.wait(1.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.endpointing import AdaptiveEndpointer
+from src.backend.audio_stream import AudioService
+
+class TestAdaptiveEndpointer(unittest.TestCase):
+    def test_noise_floor_tracks_minimum(self):
+        ep = AdaptiveEndpointer()
+        # 2s of steady hiss around 400 with louder bursts on top
+        for i in range(100):
+            ep.observe_level(3000.0 if i % 5 == 0 else 400.0)
+        self.assertAlmostEqual(ep.noise_floor, 400.0)
+        self.assertFalse(ep.is_above_noise(600.0))
+        self.assertTrue(ep.is_above_noise(3000.0))
+        # Noisy floor switches the VAD to its most aggressive mode
+        self.assertEqual(AdaptiveEndpointer(base_vad_mode=2).vad_mode(), 2)
+        ep.base_vad_mode = 2
+        self.assertEqual(ep.vad_mode(), 3)
+
+    def test_fast_talker_gets_shorter_hangover(self):
+        ep = AdaptiveEndpointer()
+        self.assertEqual(ep.silence_frames_limit(), 25) # 500ms default
+
+        for _ in range(10):
+            ep.observe_pause(6) # 120ms pauses
+        # 120ms + 120ms margin, clamped to the 300ms minimum
+        self.assertEqual(ep.silence_frames_limit(), 15)
+
+    def test_slow_talker_hangover_is_capped(self):
+        ep = AdaptiveEndpointer()
+        for _ in range(10):
+            ep.observe_pause(40)
+        self.assertEqual(ep.silence_frames_limit(), 45) # 900ms cap
+
+    def test_flicker_ignored(self):
+        ep = AdaptiveEndpointer()
+        for _ in range(10):
+            ep.observe_pause(1)
+        self.assertEqual(len(ep.pauses), 0)
+
+class TestAudioServiceAdaptive(unittest.TestCase):
+    def test_noise_does_not_hold_utterance_open(self):
+        service = AudioService(adaptive_endpointing=True)
+        service.vad = MagicMock()
+        service.vad.is_speech.return_value = True # VAD fooled by loopback noise
+        service.audio_captured = MagicMock()
+
+        rng = np.random.default_rng(0)
+        speech = rng.normal(0, 4000, 320).astype(np.int16)
+        hiss = rng.normal(0, 300, 320).astype(np.int16)
+
+        # Establish the floor, then speak, then hiss continues
+        for _ in range(300):
+            service._process_frame(hiss)
+        self.assertFalse(service.is_speaking)
+        service.audio_captured.reset_mock() # Ignore anything captured before the floor was known
+
+        for _ in range(30):
+            service._process_frame(speech)
+        for _ in range(60):
+            service._process_frame(hiss)
+
+        service.audio_captured.emit.assert_called_once()
+        self.assertFalse(service.is_speaking)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.audio_stream import AudioService
+
+class TestEnergyGate(unittest.TestCase):
+    def setUp(self):
+        self.service = AudioService(energy_gate_rms=100)
+        self.service.vad = MagicMock()
+        self.service.audio_captured = MagicMock()
+
+    def test_digital_silence_skips_vad(self):
+        silence = np.zeros(320, dtype='int16')
+        for _ in range(10):
+            self.service._process_frame(silence)
+
+        self.service.vad.is_speech.assert_not_called()
+        stats = self.service.get_stats()
+        self.assertEqual(stats["frames_gated"], 10)
+        self.assertEqual(stats["frames_evaluated"], 0)
+
+    def test_quiet_fricative_reaches_vad(self):
+        # Low energy, alternating sign every sample -> very high zero-crossing rate
+        hiss = np.tile(np.array([60, -60], dtype='int16'), 160)
+        self.service.vad.is_speech.return_value = False
+        self.service._process_frame(hiss)
+
+        self.service.vad.is_speech.assert_called_once()
+
+    def test_quiet_hum_is_gated(self):
+        t = np.arange(320)
+        hum = (60 * np.sin(2 * np.pi * 50 * t / 16000)).astype('int16')
+        self.service._process_frame(hum)
+
+        self.service.vad.is_speech.assert_not_called()
+
+    def test_gated_frames_still_end_utterance(self):
+        speech = np.full(320, 3000, dtype='int16')
+        silence = np.zeros(320, dtype='int16')
+
+        self.service.vad.is_speech.return_value = True
+        for _ in range(20):
+            self.service._process_frame(speech)
+        for _ in range(30):
+            self.service._process_frame(silence)
+
+        self.service.audio_captured.emit.assert_called_once()
+        # Trailing silence is kept in the utterance audio
+        self.assertEqual(len(self.service.audio_captured.emit.call_args[0][0]), 46 * 640)
+
+if __name__ == '__main__':
+    unittest.main()
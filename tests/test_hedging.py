@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import make_chunk
+from src.backend.llm_service import LLMService, BACKUP_MODELS
+from src.backend.cancellation import CancelToken
+
+class GatedStream:
+    """Yields its chunks once `gate` is set; close() (a cancelled loser) ends it early."""
+    def __init__(self, texts, gate=None):
+        self.texts = texts
+        self.gate = gate or threading.Event()
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        while not self.gate.wait(0.01):
+            if self.closed.is_set():
+                raise ConnectionError("closed")
+        for text in self.texts:
+            if self.closed.is_set():
+                raise ConnectionError("closed")
+            yield make_chunk(text)
+
+    def close(self):
+        self.closed.set()
+
+class TestHedgedGeneration(unittest.TestCase):
+    def setUp(self):
+        self.service = LLMService(MagicMock(), openrouter_key="test", zhipu_key="test", hedge_after_ms=50)
+        self.service.zhipu_client = MagicMock()
+        self.service.or_client = MagicMock()
+        self.service.story_engine = MagicMock()
+        self.service.story_engine.find_relevant_story.return_value = None
+
+    def test_fast_primary_is_not_hedged(self):
+        self.service.zhipu_client.chat.completions.create.return_value = GatedStream(["Primary"], _set())
+
+        self.assertEqual(list(self.service.generate_answer("Q")), ["Primary"])
+        self.service.or_client.chat.completions.create.assert_not_called()
+
+    def test_slow_primary_loses_to_backup(self):
+        primary = GatedStream(["Too late"]) # Never opens its gate
+        backup = GatedStream(["Backup ", "answer"], _set())
+        self.service.zhipu_client.chat.completions.create.return_value = primary
+        self.service.or_client.chat.completions.create.return_value = backup
+
+        self.assertEqual("".join(self.service.generate_answer("Q")), "Backup answer")
+        self.assertTrue(primary.closed.wait(1)) # Loser cancelled
+        self.assertEqual(self.service.transcript_history[-1]["content"], "Backup answer")
+        self.assertEqual(self.service.or_client.chat.completions.create.call_args.kwargs["model"], BACKUP_MODELS[0])
+
+    def test_primary_wins_after_hedge(self):
+        gate = threading.Event()
+        primary = GatedStream(["Primary"], gate)
+        backup = GatedStream(["Backup"]) # Stuck
+        self.service.zhipu_client.chat.completions.create.return_value = primary
+        def create_backup(**kwargs):
+            gate.set() # Primary's first token arrives once the hedge has started
+            return backup
+        self.service.or_client.chat.completions.create.side_effect = create_backup
+
+        self.assertEqual(list(self.service.generate_answer("Q")), ["Primary"])
+        self.assertTrue(backup.closed.wait(1))
+
+    def test_backup_failing_before_first_token_tries_next_model(self):
+        self.service.zhipu_client.chat.completions.create.return_value = GatedStream(["Late"])
+        self.service.or_client.chat.completions.create.side_effect = [
+            RuntimeError("429"), GatedStream(["Second backup"], _set())
+        ]
+
+        self.assertEqual(list(self.service.generate_answer("Q")), ["Second backup"])
+        models = [c.kwargs["model"] for c in self.service.or_client.chat.completions.create.call_args_list]
+        self.assertEqual(models, BACKUP_MODELS[:2])
+
+    def test_cancel_stops_all_attempts(self):
+        primary, backup = GatedStream(["P"]), GatedStream(["B"])
+        self.service.zhipu_client.chat.completions.create.return_value = primary
+        self.service.or_client.chat.completions.create.return_value = backup
+        token = CancelToken()
+        threading.Timer(0.2, token.cancel).start()
+
+        self.assertEqual(list(self.service.generate_answer("Q", cancel_token=token)), [])
+        self.assertTrue(primary.closed.wait(1))
+        self.assertTrue(backup.closed.wait(1))
+        self.assertEqual(self.service.transcript_history, [])
+
+def _set():
+    event = threading.Event()
+    event.set()
+    return event
+
+if __name__ == '__main__':
+    unittest.main()
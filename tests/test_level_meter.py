@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.level_meter import LevelMeter
+from src.backend.audio_stream import AudioService
+
+class TestLevelMeter(unittest.TestCase):
+    def test_decimation(self):
+        meter = LevelMeter(frame_duration_ms=20, rate_hz=25) # Every 2 frames
+        self.assertIsNone(meter.update(0.0))
+        self.assertEqual(meter.update(0.0), 0.0)
+
+    def test_window_rms(self):
+        meter = LevelMeter(frame_duration_ms=20, rate_hz=25)
+        meter.update(5000.0 ** 2)
+        self.assertAlmostEqual(meter.update(5000.0 ** 2), 0.5)
+
+    def test_peak_hold_falls_gradually(self):
+        meter = LevelMeter(frame_duration_ms=20, rate_hz=25, fall_per_s=2.0)
+        meter.update(10000.0 ** 2)
+        self.assertEqual(meter.update(10000.0 ** 2), 1.0)
+
+        # Sudden silence: drops by 2.0/s * 40ms per update, not straight to zero
+        meter.update(0.0)
+        self.assertAlmostEqual(meter.update(0.0), 0.92)
+
+class TestAudioServiceMeter(unittest.TestCase):
+    def test_emits_at_display_rate(self):
+        service = AudioService(level_rate_hz=25)
+        service.audio_level = MagicMock()
+        frame = np.full(320, 5000, dtype='int16')
+
+        for _ in range(50): # 1 second of audio
+            service._process_frame(frame)
+
+        self.assertEqual(service.audio_level.emit.call_count, 25)
+        service.audio_level.emit.assert_called_with(0.5)
+
+if __name__ == '__main__':
+    unittest.main()
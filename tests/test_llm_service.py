@@ -50,7 +50,26 @@ class TestLLMService(unittest.TestCase):
         filename, file_content = file_tuple
         self.assertEqual(filename, "audio.wav")
         # WAV header starts with RIFF
-        self.assertTrue(file_content.startswith(b'RIFF'))
+        self.assertEqual(file_content.read(4), b'RIFF')
+
+    def test_transcribe_flac(self):
+        service = LLMService(db_manager=None, groq_key="test_groq", audio_codec="flac")
+        service.groq_client = MagicMock()
+        service.groq_client.audio.transcriptions.create.return_value = "Transcribed Text"
+
+        service.transcribe(b"\x01\x00" * 1600)
+
+        filename, file_content = service.groq_client.audio.transcriptions.create.call_args.kwargs['file']
+        self.assertEqual(filename, "audio.flac")
+        self.assertTrue(file_content.startswith(b'fLaC'))
+
+    def test_transcribe_with_prompt(self):
+        self.service.groq_client.audio.transcriptions.create.return_value = "More text"
+
+        self.service.transcribe(b"fake audio" * 10, prompt="Tell me about")
+
+        call_args = self.service.groq_client.audio.transcriptions.create.call_args
+        self.assertIn("Tell me about", call_args.kwargs['prompt'])
 
     def test_generate_answer(self):
         # Mock streaming response
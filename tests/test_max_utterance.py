@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.audio_stream import AudioService
+
+class TestMaxUtterance(unittest.TestCase):
+    def setUp(self):
+        # 1s cap (50 frames), quietest point searched in the last 400ms (20 frames)
+        self.service = AudioService(max_utterance_ms=1000, split_search_ms=400)
+        self.service.vad = MagicMock()
+        self.service.vad.is_speech.return_value = True
+        self.service.audio_segment = MagicMock()
+        self.service.audio_captured = MagicMock()
+
+    def test_split_at_quietest_frame(self):
+        loud = np.full(320, 8000, dtype='int16')
+        dip = np.full(320, 500, dtype='int16')
+
+        for i in range(50):
+            self.service._process_frame(dip if i == 40 else loud)
+
+        self.service.audio_segment.emit.assert_called_once()
+        segment = self.service.audio_segment.emit.call_args[0][0]
+        # Cut right after the dip (frame 40), the rest stays buffered
+        self.assertEqual(len(segment), 41 * 640)
+        self.assertEqual(len(self.service.utterance), 9)
+
+    def test_buffer_stays_bounded(self):
+        loud = np.full(320, 8000, dtype='int16')
+        for _ in range(500): # 10s of uninterrupted speech
+            self.service._process_frame(loud)
+
+        self.assertLess(len(self.service.utterance), 50)
+        self.assertGreaterEqual(self.service.audio_segment.emit.call_count, 10)
+
+    def test_tail_delivered_at_endpoint(self):
+        loud = np.full(320, 8000, dtype='int16')
+        for _ in range(60):
+            self.service._process_frame(loud)
+        self.service.vad.is_speech.return_value = False
+        for _ in range(30):
+            self.service._process_frame(np.zeros(320, dtype='int16'))
+
+        self.service.audio_captured.emit.assert_called_once()
+        pieces = [c[0][0] for c in self.service.audio_segment.emit.call_args_list]
+        pieces.append(self.service.audio_captured.emit.call_args[0][0])
+        audio = np.frombuffer(b''.join(pieces), dtype=np.int16)
+        # No speech lost or duplicated across the splits
+        self.assertEqual(np.count_nonzero(audio), 60 * 320)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import make_chunk
+from src.backend.model_ranking import ModelRanker, probe_model, streaming_rate
+from src.backend.database import DatabaseManager
+from src.backend.llm_service import LLMService, BACKUP_MODELS
+
+class TestModelRanker(unittest.TestCase):
+    def test_faster_model_first(self):
+        ranker = ModelRanker()
+        ranker.record("slow", 2500, 20)
+        ranker.record("fast", 400, 80)
+        self.assertEqual(ranker.order(["slow", "fast"]), ["fast", "slow"])
+
+    def test_unmeasured_models_keep_configured_order(self):
+        self.assertEqual(ModelRanker().order(["b", "a", "c"]), ["b", "a", "c"])
+
+    def test_failures_outweigh_speed(self):
+        ranker = ModelRanker()
+        for _ in range(5):
+            ranker.record_failure("flaky")
+        ranker.record("flaky", 300, 80)
+        ranker.record("steady", 900, 40)
+        self.assertEqual(ranker.order(["flaky", "steady"]), ["steady", "flaky"])
+
+    def test_stats_persist(self):
+        db_path = "data/test_model_stats.db"
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        try:
+            db = DatabaseManager(db_path)
+            ModelRanker(store=db).record("model-a", 700.0, 35.0)
+
+            restored = ModelRanker(store=db).snapshot()["model-a"]
+            self.assertEqual(restored["ttft_ms"], 700.0)
+            self.assertEqual(restored["tokens_per_s"], 35.0)
+            self.assertEqual(restored["successes"], 1.0)
+        finally:
+            if os.path.exists(db_path):
+                os.remove(db_path)
+
+    def test_streaming_rate(self):
+        self.assertEqual(streaming_rate(11, 1.0, 1.5), 20.0)
+        self.assertIsNone(streaming_rate(1, 1.0, 1.5))
+
+class TestProbe(unittest.TestCase):
+    def test_probe_model_measures_stream(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = [make_chunk("Hi"), make_chunk(" there")]
+
+        ttft_ms, _, text = probe_model(client, "model-a")
+        self.assertEqual(text, "Hi there")
+        self.assertGreaterEqual(ttft_ms, 0)
+        self.assertTrue(client.chat.completions.create.call_args.kwargs["stream"])
+
+    def test_empty_stream_is_a_failure(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = []
+        with self.assertRaises(RuntimeError):
+            probe_model(client, "model-a")
+
+class TestAdaptiveOrdering(unittest.TestCase):
+    def test_service_tries_best_measured_model_first(self):
+        service = LLMService(MagicMock(), openrouter_key="test", adaptive_model_order=True)
+        service.ranker.store = None
+        service.or_client = MagicMock()
+        service.or_client.chat.completions.create.return_value = [make_chunk("Answer")]
+        service.story_engine = MagicMock()
+        service.story_engine.find_relevant_story.return_value = None
+
+        service.ranker.record(BACKUP_MODELS[0], 4000, 10)
+        service.ranker.record(BACKUP_MODELS[2], 300, 90)
+
+        self.assertEqual(list(service.generate_answer("Q")), ["Answer"])
+        self.assertEqual(service.or_client.chat.completions.create.call_args.kwargs["model"], BACKUP_MODELS[2])
+        # The request itself was measured
+        self.assertEqual(service.ranker.snapshot()[BACKUP_MODELS[2]]["successes"], 0.95 + 1)
+
+if __name__ == '__main__':
+    unittest.main()
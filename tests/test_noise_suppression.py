@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.noise_suppression import SpectralSubtractor, AutoGain
+from src.backend.audio_stream import AudioService
+
+def rms(x):
+    return np.sqrt(np.mean(np.asarray(x, dtype=np.float64) ** 2))
+
+class TestSpectralSubtractor(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.noise = rng.standard_normal(16000 * 4) * 500
+        t = np.arange(16000) / 16000
+        self.tone = 4000 * np.sin(2 * np.pi * 440 * t)
+
+    def run_frames(self, denoiser, signal):
+        return np.concatenate([denoiser.process(signal[i:i + 320]) for i in range(0, signal.size, 320)])
+
+    def test_stationary_noise_attenuated(self):
+        out = self.run_frames(SpectralSubtractor(), self.noise)
+        # After the estimate settles, at least 10 dB down
+        self.assertLess(rms(out[16000 * 2:]), rms(self.noise) / 3.16)
+
+    def test_tone_in_noise_kept(self):
+        signal = self.noise.copy()
+        signal[16000 * 3:] += self.tone
+        out = self.run_frames(SpectralSubtractor(), signal)
+        self.assertGreater(rms(out[16000 * 3 + 3200:]), 0.8 * rms(self.tone))
+
+    def test_reset(self):
+        denoiser = SpectralSubtractor()
+        self.run_frames(denoiser, self.noise[:3200])
+        denoiser.reset()
+        self.assertIsNone(denoiser.noise_psd)
+
+class TestAutoGain(unittest.TestCase):
+    def test_quiet_speech_raised_towards_target(self):
+        agc = AutoGain(target_rms=3000.0)
+        rng = np.random.default_rng(0)
+        for _ in range(50): # Noise floor first
+            frame = (rng.standard_normal(320) * 20).astype(np.float32)
+            agc.process(frame, rms(frame))
+        for _ in range(500):
+            frame = (600 * np.sin(np.arange(320) / 3.0)).astype(np.float32)
+            out = agc.process(frame, rms(frame))
+        self.assertAlmostEqual(rms(out), 3000, delta=300)
+
+    def test_noise_not_pumped(self):
+        agc = AutoGain()
+        rng = np.random.default_rng(0)
+        for _ in range(500):
+            frame = (rng.standard_normal(320) * 200).astype(np.float32)
+            agc.process(frame, rms(frame))
+        self.assertAlmostEqual(agc.gain, 1.0, places=3)
+
+    def test_loud_input_attacks_fast(self):
+        agc = AutoGain(target_rms=3000.0)
+        frame = np.full(320, 20000, dtype=np.float32)
+        agc.process(np.zeros(320, dtype=np.float32), 0.0)
+        for _ in range(10): # 200ms
+            agc.process(frame, 20000.0)
+        self.assertLess(agc.gain, 0.3)
+
+class TestAudioServiceConditioning(unittest.TestCase):
+    def test_vad_sees_cleaned_audio_but_raw_is_kept(self):
+        service = AudioService(noise_suppression=True, auto_gain=True)
+        service.vad = MagicMock()
+        service.vad.is_speech.return_value = True
+
+        frame = (np.random.default_rng(0).standard_normal(320) * 1000).astype(np.int16)
+        for _ in range(10):
+            service._process_frame(frame)
+
+        vad_input = service.vad.is_speech.call_args[0][0]
+        self.assertNotEqual(bytes(vad_input), frame.tobytes())
+        self.assertEqual(bytes(service.utterance.peek()[-640:]), frame.tobytes())
+
+    def test_disabled_by_default(self):
+        service = AudioService()
+        self.assertIsNone(service.denoiser)
+        self.assertIsNone(service.agc)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -89,5 +89,14 @@ class TestOverlayOptimization(unittest.TestCase):
         call_args_7 = self.overlay.audio_bar_fill.setStyleSheet.call_args[0][0]
         self.assertIn("#4CAF50", call_args_7)
 
+    def test_unchanged_width_skips_relayout(self):
+        self.overlay.update_audio_level(0.5)
+        self.overlay.audio_bar_fill.setFixedWidth.assert_called_once_with(50)
+        self.overlay.audio_bar_fill.setFixedWidth.reset_mock()
+
+        # Same pixel width -> no layout work
+        self.overlay.update_audio_level(0.501)
+        self.overlay.audio_bar_fill.setFixedWidth.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import make_chunk
+from src.backend.prompt_builder import PromptBuilder, TokenCounter
+from src.backend.llm_service import LLMService
+
+def turn(i):
+    return [{"role": "user", "content": f"Question {i} " + "word " * 20},
+            {"role": "assistant", "content": f"Answer {i} " + "word " * 60}]
+
+class TestTokenCounter(unittest.TestCase):
+    def setUp(self):
+        self.counter = TokenCounter(encoding=None) # Estimate: 4 chars per token
+
+    def test_count_is_cached(self):
+        self.assertEqual(self.counter.count("x" * 40), 10)
+        self.counter.count("x" * 40)
+        self.assertEqual(self.counter.count.cache_info().hits, 1)
+
+    def test_truncate_keeps_head_within_budget(self):
+        text = "alpha beta gamma delta " * 50
+        cut = self.counter.truncate(text, 20)
+        self.assertTrue(cut.startswith("alpha beta"))
+        self.assertTrue(cut.endswith("[...]"))
+        self.assertLessEqual(self.counter.count(cut), 20)
+        self.assertEqual(self.counter.truncate("short", 20), "short")
+
+class TestPromptBuilder(unittest.TestCase):
+    def setUp(self):
+        self.counter = TokenCounter(encoding=None)
+        self.sections = [("NOTES", "Be concise."), ("RESUME", "Python " * 2000), ("JOB DESCRIPTION", "Backend role. " * 20)]
+
+    def test_no_budgets_matches_fixed_window(self):
+        builder = PromptBuilder(self.counter)
+        history = sum((turn(i) for i in range(8)), [])
+        messages = builder.build("System", self.sections, history, "Q", instruction="Shorter")
+
+        self.assertEqual(messages[0], {"role": "system", "content": "System"})
+        self.assertIn("Python " * 2000, messages[1]["content"])
+        self.assertEqual(messages[2], {"role": "system", "content": "Shorter"})
+        self.assertEqual(messages[3:-1], history[-10:])
+        self.assertEqual(messages[-1], {"role": "user", "content": "Q"})
+
+    def test_context_budget_spares_short_sections(self):
+        builder = PromptBuilder(self.counter, budgets={"context": 600})
+        context = builder.build("System", self.sections, [], "Q")[1]["content"]
+
+        self.assertIn("NOTES:\nBe concise.", context)
+        self.assertIn("Backend role. " * 20, context) # The JD fits whole
+        self.assertIn("[...]", context) # The resume was cut
+        self.assertLessEqual(builder.last_stats["context"], 600 + 10)
+        self.assertEqual(builder.last_stats["trimmed"], ["context"])
+
+    def test_old_history_condensed_newest_kept(self):
+        builder = PromptBuilder(self.counter, budgets={"history": 300})
+        history = sum((turn(i) for i in range(6)), [])
+        messages = builder.build("System", [], history, "Q")
+        sent = messages[2:-1]
+
+        self.assertEqual(sent[-2:], history[-2:]) # Newest turn verbatim
+        self.assertEqual(sent[1]["role"], "user")
+        self.assertTrue(sent[0]["content"].startswith("Earlier in this interview you were asked: Question"))
+        self.assertNotIn("Answer 0", sent[0]["content"])
+        self.assertLessEqual(builder.last_stats["history"], 300)
+
+    def test_story_trimmed_and_metrics(self):
+        builder = PromptBuilder(self.counter, budgets={"story": 10})
+        story = {"content": "A long story " * 50, "style": "STAR"}
+        system = builder.build("System", [], [], "Q", story=story)[0]["content"]
+
+        self.assertIn("PRIORITY CONTEXT", system)
+        self.assertIn("STYLE INSTRUCTION: STAR", system)
+        self.assertLessEqual(builder.last_stats["story"], 10)
+        self.assertEqual(builder.last_stats["trimmed"], ["story"])
+
+        builder.build("System", [], [], "Q")
+        metrics = builder.metrics()
+        self.assertEqual(metrics["requests"], 2)
+        self.assertGreater(metrics["max_tokens"], metrics["last"]["total"])
+
+class TestServicePrompt(unittest.TestCase):
+    def test_generate_answer_uses_budgets(self):
+        service = LLMService(MagicMock(), openrouter_key="test", prompt_budgets={"history": 200})
+        service.prompt_builder.counter = TokenCounter(encoding=None)
+        service.or_client = MagicMock()
+        service.or_client.chat.completions.create.return_value = [make_chunk("Answer")]
+        service.story_engine = MagicMock()
+        service.story_engine.find_relevant_story.return_value = None
+        service.transcript_history = sum((turn(i) for i in range(10)), [])
+
+        list(service.generate_answer("Q"))
+        messages = service.or_client.chat.completions.create.call_args.kwargs["messages"]
+        self.assertLess(len(messages), 2 + 10 + 1)
+        self.assertEqual(service.get_prompt_metrics()["requests"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import MagicMock, patch, mock_open
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import FakeClock, make_chunk
+from src.backend.provider_health import HealthBoard
+from src.backend.llm_service import LLMService, BACKUP_MODELS
+
+class TestHealthBoard(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.probe = MagicMock(return_value=False)
+        self.board = HealthBoard(probe=self.probe, failure_threshold=3, open_s=30, max_open_s=120,
+                                 background=False, clock=self.clock)
+
+    def test_consecutive_failures_open_the_circuit(self):
+        for _ in range(2):
+            self.board.record_failure("a", RuntimeError("timeout"))
+        self.assertEqual(self.board.usable(["a", "b"]), ["a", "b"])
+
+        self.board.record_failure("a", RuntimeError("timeout"))
+        self.assertEqual(self.board.usable(["a", "b"]), ["b"])
+        self.assertEqual(self.board.snapshot()["a"]["last_error"], "timeout")
+
+    def test_success_resets_the_streak(self):
+        for _ in range(2):
+            self.board.record_failure("a")
+        self.board.record_success("a")
+        self.board.record_failure("a")
+        self.assertFalse(self.board.is_open("a"))
+
+    def test_rolling_error_rate_opens_the_circuit(self):
+        board = HealthBoard(failure_threshold=10, max_error_rate=0.5, min_calls=6, background=False, clock=self.clock)
+        for ok in [True, False, True, False, True, False]:
+            board.record_success("a") if ok else board.record_failure("a")
+        self.assertTrue(board.is_open("a"))
+
+    def test_all_open_still_tries_the_one_due_first(self):
+        for name in ["a", "b"]:
+            for _ in range(3):
+                self.board.record_failure(name)
+            self.clock.now += 1
+        self.assertEqual(self.board.usable(["a", "b"]), ["a"])
+
+    def test_probe_closes_or_backs_off(self):
+        for _ in range(3):
+            self.board.record_failure("a")
+
+        self.assertAlmostEqual(self.board.probe_due(), 30)
+        self.probe.assert_not_called() # Not due yet
+
+        self.clock.now = 30
+        self.assertAlmostEqual(self.board.probe_due(), 60) # Failed: open twice as long
+        self.probe.assert_called_once_with("a")
+
+        self.clock.now = 90
+        self.probe.return_value = True
+        self.assertIsNone(self.board.probe_due())
+        self.assertFalse(self.board.is_open("a"))
+
+    def test_ttft_on_scoreboard(self):
+        self.board.record_ttft("a", 420.0)
+        self.board.record_success("a")
+        stats = self.board.snapshot()["a"]
+        self.assertEqual(stats["last_ttft_ms"], 420.0)
+        self.assertEqual(stats["state"], "closed")
+
+class TestServiceCircuitBreaking(unittest.TestCase):
+    def setUp(self):
+        self.service = LLMService(MagicMock(), openrouter_key="test")
+        self.service.or_client = MagicMock()
+        self.service.story_engine = MagicMock()
+        self.service.story_engine.find_relevant_story.return_value = None
+        self.service.health.background = False
+
+        self.chunk = make_chunk("Answer")
+
+    def test_dead_model_is_skipped_after_tripping(self):
+        dead = BACKUP_MODELS[0]
+        def create(model, messages, stream=True, **kwargs):
+            if model == dead:
+                raise TimeoutError("read timed out")
+            return [self.chunk]
+        self.service.or_client.chat.completions.create.side_effect = create
+
+        for _ in range(3):
+            self.assertEqual(list(self.service.generate_answer("Q")), ["Answer"])
+        self.assertTrue(self.service.health.is_open(dead))
+
+        self.service.or_client.chat.completions.create.reset_mock()
+        list(self.service.generate_answer("Q"))
+        models = [c.kwargs["model"] for c in self.service.or_client.chat.completions.create.call_args_list]
+        self.assertEqual(models, [BACKUP_MODELS[1]])
+        self.assertIsNotNone(self.service.get_provider_health()[BACKUP_MODELS[1]]["last_ttft_ms"])
+
+    def test_report_shares_the_board(self):
+        for _ in range(3):
+            self.service.health.record_failure(BACKUP_MODELS[0])
+        response = MagicMock()
+        response.choices[0].message.content = "Report"
+        self.service.or_client.chat.completions.create.return_value = response
+        self.service.transcript_history = [{"role": "user", "content": "Q"}]
+
+        with patch("builtins.open", mock_open()):
+            self.assertEqual(self.service.generate_report(), "Report")
+        self.assertEqual(self.service.or_client.chat.completions.create.call_args.kwargs["model"], BACKUP_MODELS[1])
+
+    def test_probe_and_report_are_bounded(self):
+        service = LLMService(MagicMock(), openrouter_key="test", connect_timeout_s=3, first_token_timeout_s=5)
+        service.or_client = MagicMock()
+        service.or_client.chat.completions.create.return_value.choices[0].message.content = "Report"
+        service.transcript_history = [{"role": "user", "content": "Q"}]
+
+        service._probe_model(BACKUP_MODELS[0])
+        timeout = service.or_client.chat.completions.create.call_args.kwargs["timeout"]
+        self.assertEqual((timeout.connect, timeout.read), (3, 5))
+
+        with patch("builtins.open", mock_open()):
+            service.generate_report()
+        timeout = service.or_client.chat.completions.create.call_args.kwargs["timeout"]
+        self.assertEqual(timeout.connect, 3)
+        self.assertGreater(timeout.read, 5) # The whole report, not one token
+
+        # No deadlines configured: still bounded, connect included
+        self.service._probe_model(BACKUP_MODELS[0])
+        timeout = self.service.or_client.chat.completions.create.call_args.kwargs["timeout"]
+        self.assertEqual((timeout.connect, timeout.read), (10, 10))
+
+        self.service.or_client.chat.completions.create.return_value.choices[0].message.content = "Report"
+        self.service.transcript_history = [{"role": "user", "content": "Q"}]
+        with patch("builtins.open", mock_open()):
+            self.service.generate_report()
+        timeout = self.service.or_client.chat.completions.create.call_args.kwargs["timeout"]
+        self.assertEqual(timeout.connect, 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import wave
+import tempfile
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.audio_stream import AudioService
+from src.backend.replay import ReplayDriver, synthesize_pattern, load_wav
+
+PATTERN = [("silence", 1000), ("speech", 1500), ("silence", 1500),
+           ("speech", 3000), ("silence", 1500), ("speech", 800), ("silence", 1500)]
+
+class TestReplay(unittest.TestCase):
+    def test_synthetic_pattern_truth(self):
+        samples, truth = synthesize_pattern(PATTERN)
+        self.assertEqual(samples.size, 16000 * 10800 // 1000)
+        self.assertEqual(truth[0], (1.0, 2.5))
+        self.assertEqual(len(truth), 3)
+
+    def test_replay_counts_utterances_and_latency(self):
+        # No background noise: webrtcvad can misfire on the first frames of a noisy stream
+        samples, truth = synthesize_pattern(PATTERN, noise_rms=0)
+        report = ReplayDriver(AudioService()).run(samples, 16000, truth)
+
+        self.assertEqual(report["frames"], 540)
+        self.assertEqual(report["utterances"], 3)
+        self.assertEqual(report["expected_utterances"], 3)
+        # Fixed 500ms hangover: emitted on the 26th silent frame after the last speech frame
+        self.assertAlmostEqual(report["endpoint_ms_p50"], 520.0)
+        self.assertLess(report["truth_endpoint_ms_max"], 700.0)
+        self.assertGreater(report["realtime_factor"], 1.0)
+
+    def test_native_rate_wav(self):
+        samples, truth = synthesize_pattern(PATTERN[:3], sample_rate=48000, noise_rms=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stereo.wav")
+            with wave.open(path, 'wb') as wf:
+                wf.setnchannels(2)
+                wf.setsampwidth(2)
+                wf.setframerate(48000)
+                wf.writeframes(np.stack([samples, samples], axis=1).tobytes())
+            loaded, rate = load_wav(path)
+
+        self.assertEqual(rate, 48000)
+        np.testing.assert_array_equal(loaded, samples)
+
+        service = AudioService()
+        report = ReplayDriver(service).run(loaded, rate, truth)
+        self.assertEqual(report["frames"], 200)
+        self.assertEqual(report["utterances"], 1)
+        # Driver hooks are removed again
+        self.assertNotIn("_process_frame", vars(service))
+
+if __name__ == '__main__':
+    unittest.main()
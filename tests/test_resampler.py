@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.resampler import PolyphaseResampler
+from src.backend.audio_stream import AudioService
+
+def tone(freq, rate, seconds=1.0, amplitude=10000):
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+class TestPolyphaseResampler(unittest.TestCase):
+    def test_ratio_reduced(self):
+        r = PolyphaseResampler(44100, 16000)
+        self.assertEqual((r.up, r.down), (160, 441))
+
+    def test_block_output_sizes(self):
+        for rate in (48000, 44100):
+            r = PolyphaseResampler(rate, 16000)
+            block = int(rate * 0.02)
+            sizes = [r.process(np.zeros(block, dtype=np.int16)).size for _ in range(50)]
+            self.assertEqual(sum(sizes), 50 * 320)
+
+    def test_streaming_matches_one_shot(self):
+        x = tone(1000, 44100)
+        chunked = PolyphaseResampler(44100, 16000)
+        y_chunks = np.concatenate([chunked.process(x[i:i + 882]) for i in range(0, x.size, 882)])
+        y_whole = PolyphaseResampler(44100, 16000).process(x)
+        np.testing.assert_array_equal(y_chunks, y_whole)
+
+    def test_passband_kept_and_alias_rejected(self):
+        kept = PolyphaseResampler(48000, 16000).process(tone(1000, 48000))
+        self.assertGreater(np.abs(kept[1000:]).max(), 9500)
+
+        # 10 kHz is above the new 8 kHz Nyquist and must not fold back into the band
+        aliased = PolyphaseResampler(48000, 16000).process(tone(10000, 48000))
+        self.assertLess(np.abs(aliased[1000:]).max(), 300)
+
+class TestNativeRateFraming(unittest.TestCase):
+    def test_blocks_reframed_to_20ms(self):
+        service = AudioService(native_rate=True)
+        service._process_frame = MagicMock()
+        service._open_stream(44100)
+
+        x = tone(440, 44100)
+        for i in range(0, x.size, 882):
+            service._process_block(x[i:i + 882])
+
+        self.assertEqual(service.buffer.frame_size, 882)
+        self.assertEqual(service._process_frame.call_count, 50)
+        self.assertEqual(service._process_frame.call_args[0][0].size, 320)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.ring_buffer import FrameRingBuffer, PrerollBuffer, UtteranceBuffer
+from src.backend.audio_stream import AudioService
+
+class TestFrameRingBuffer(unittest.TestCase):
+    def test_fifo_order(self):
+        ring = FrameRingBuffer(frame_size=4, capacity=3)
+
+        self.assertIsNone(ring.peek())
+
+        ring.write(np.full((4, 1), 1, dtype=np.int16))
+        ring.write(np.full((4, 1), 2, dtype=np.int16))
+        self.assertEqual(len(ring), 2)
+
+        self.assertTrue((ring.peek() == 1).all())
+        ring.advance()
+        self.assertTrue((ring.peek() == 2).all())
+        ring.advance()
+        self.assertIsNone(ring.peek())
+
+    def test_overrun_drops_newest(self):
+        ring = FrameRingBuffer(frame_size=2, capacity=2)
+
+        self.assertTrue(ring.write(np.array([1, 1], dtype=np.int16)))
+        self.assertTrue(ring.write(np.array([2, 2], dtype=np.int16)))
+        self.assertFalse(ring.write(np.array([3, 3], dtype=np.int16)))
+
+        stats = ring.stats()
+        self.assertEqual(stats["overruns"], 1)
+        self.assertEqual(stats["high_water"], 2)
+
+        # Oldest frames survive the overrun
+        self.assertTrue((ring.peek() == 1).all())
+        ring.advance()
+
+        # Slot is reusable after the consumer catches up
+        self.assertTrue(ring.write(np.array([4, 4], dtype=np.int16)))
+
+    def test_short_block_is_zero_padded(self):
+        ring = FrameRingBuffer(frame_size=4, capacity=1)
+        ring.write(np.array([1, 1, 1, 1], dtype=np.int16))
+        ring.advance()
+        ring.write(np.array([7, 7], dtype=np.int16)) # Reuses the slot that held the ones
+        self.assertEqual(ring.peek().tolist(), [7, 7, 0, 0])
+
+    def test_peek_holds_slot_until_advance(self):
+        ring = FrameRingBuffer(frame_size=2, capacity=1)
+        ring.write(np.array([1, 1], dtype=np.int16))
+        frame = ring.peek()
+
+        # Producer can't overwrite the slot being processed in place
+        self.assertFalse(ring.write(np.array([2, 2], dtype=np.int16)))
+        self.assertEqual(frame.tolist(), [1, 1])
+
+        ring.advance()
+        self.assertTrue(ring.write(np.array([2, 2], dtype=np.int16)))
+
+class TestUtteranceBuffer(unittest.TestCase):
+    def test_take_is_zero_copy_and_keeps_remainder(self):
+        utterance = UtteranceBuffer(frame_size=2, initial_frames=4)
+        for value in range(1, 4):
+            utterance.append(np.full(2, value, dtype=np.int16), rms=value, is_speech=value != 2)
+
+        head = utterance.take(2)
+        self.assertIsInstance(head, memoryview)
+        self.assertEqual(np.frombuffer(head, dtype=np.int16).tolist(), [1, 1, 2, 2])
+        self.assertEqual(len(utterance), 1)
+        self.assertEqual(utterance.energies[0], 3)
+        self.assertEqual(utterance.speech_count(), 1)
+
+        # Storage handed out is never written again
+        utterance.append(np.full(2, 9, dtype=np.int16))
+        utterance.clear()
+        utterance.append(np.full(2, 7, dtype=np.int16))
+        self.assertEqual(np.frombuffer(head, dtype=np.int16).tolist(), [1, 1, 2, 2])
+
+    def test_peek_survives_clear(self):
+        utterance = UtteranceBuffer(frame_size=2, initial_frames=4)
+        utterance.append(np.full(2, 5, dtype=np.int16))
+        view = utterance.peek()
+        utterance.clear()
+        utterance.append(np.full(2, 6, dtype=np.int16))
+        self.assertEqual(bytes(view), np.full(2, 5, dtype=np.int16).tobytes())
+
+    def test_grows_past_initial_capacity(self):
+        utterance = UtteranceBuffer(frame_size=2, initial_frames=2)
+        for value in range(5):
+            utterance.append(np.full(2, value, dtype=np.int16))
+        self.assertEqual(np.frombuffer(utterance.take(), dtype=np.int16)[::2].tolist(), [0, 1, 2, 3, 4])
+
+class TestPrerollBuffer(unittest.TestCase):
+    def test_keeps_most_recent_frames_in_order(self):
+        preroll = PrerollBuffer(frame_size=2, frames=3)
+        for value in range(1, 6):
+            preroll.push(np.full(2, value, dtype=np.int16))
+
+        utterance = UtteranceBuffer(frame_size=2, initial_frames=4)
+        self.assertEqual(preroll.drain_into(utterance), 3)
+        self.assertEqual(np.frombuffer(utterance.take(), dtype=np.int16).tolist(), [3, 3, 4, 4, 5, 5])
+        self.assertEqual(len(preroll), 0)
+
+    def test_disabled(self):
+        preroll = PrerollBuffer(frame_size=2, frames=0)
+        preroll.push(np.ones(2, dtype=np.int16))
+        utterance = UtteranceBuffer(frame_size=2)
+        self.assertEqual(preroll.drain_into(utterance), 0)
+        self.assertEqual(len(utterance), 0)
+
+class TestAudioServiceRing(unittest.TestCase):
+    def test_callback_feeds_ring(self):
+        service = AudioService()
+        block = np.full((service.frame_size, 1), 5, dtype=np.int16)
+
+        service._audio_callback(block, service.frame_size, None, None)
+
+        self.assertEqual(service.get_stats()["ring_frames_written"], 1)
+        frame = service.buffer.peek()
+        self.assertTrue((frame == 5).all())
+        service.buffer.advance()
+        self.assertIsNone(service.buffer.peek())
+
+    def test_preroll_prepended_to_utterance(self):
+        service = AudioService(preroll_ms=100) # 5 frames
+        service.vad = MagicMock()
+        service.audio_captured = MagicMock()
+
+        service.vad.is_speech.return_value = False
+        for value in range(1, 9):
+            service._process_frame(np.full(320, value, dtype=np.int16))
+
+        service.vad.is_speech.return_value = True
+        for _ in range(20):
+            service._process_frame(np.full(320, 100, dtype=np.int16))
+        service.vad.is_speech.return_value = False
+        for _ in range(30):
+            service._process_frame(np.zeros(320, dtype=np.int16))
+
+        audio = np.frombuffer(service.audio_captured.emit.call_args[0][0], dtype=np.int16)
+        # Last 5 quiet frames (4..8) come first, then the speech
+        self.assertEqual(audio[0], 4)
+        self.assertEqual(audio[5 * 320], 100)
+        self.assertEqual(audio.size, (5 + 20 + 26) * 320)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import MagicMock
+from concurrent.futures import Future
+import threading
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.speculation import SpeculativeAnswer
+from src.backend.audio_stream import AudioService
+
+def done_future(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+class TestSpeculativeAnswer(unittest.TestCase):
+    def setUp(self):
+        self.llm_service = MagicMock()
+
+    def test_adopted_speculation_streams_buffered_chunks(self):
+        def generate(query, record_history=True, cancel_token=None):
+            yield "Hello "
+            yield "there"
+            return True
+        self.llm_service.generate_answer.side_effect = generate
+
+        spec = SpeculativeAnswer(self.llm_service, done_future("Question?")).start()
+
+        self.assertEqual(spec.transcript(), "Question?")
+        self.assertEqual("".join(spec.stream()), "Hello there")
+        self.assertTrue(spec.succeeded)
+        # History is left to the adopter
+        self.assertFalse(self.llm_service.generate_answer.call_args.kwargs["record_history"])
+
+    def test_cancel_stops_generation(self):
+        release = threading.Event()
+        produced = []
+
+        def generate(query, record_history=True, cancel_token=None):
+            for i in range(100):
+                release.wait()
+                produced.append(i)
+                yield str(i)
+            return True
+        self.llm_service.generate_answer.side_effect = generate
+
+        spec = SpeculativeAnswer(self.llm_service, done_future("Question?")).start()
+        spec.transcript()
+        spec.cancel()
+        release.set()
+        list(spec.stream())
+
+        self.assertFalse(spec.succeeded)
+        self.assertLess(len(produced), 100)
+
+    def test_cancel_before_transcript_skips_generation(self):
+        future = Future()
+        spec = SpeculativeAnswer(self.llm_service, future).start()
+        spec.cancel()
+        future.set_result("Question?")
+        list(spec.stream())
+
+        self.llm_service.generate_answer.assert_not_called()
+
+class TestSpeculativeEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.service = AudioService(speculative_silence_ms=200) # 10 frames
+        self.service.vad = MagicMock()
+        self.service.speculative_endpoint = MagicMock()
+        self.service.speculation_cancelled = MagicMock()
+        self.service.audio_captured = MagicMock()
+        self.frame = np.zeros(320, dtype='int16')
+
+    def feed(self, is_speech, count):
+        self.service.vad.is_speech.return_value = is_speech
+        for _ in range(count):
+            self.service._process_frame(self.frame)
+
+    def test_speculation_then_endpoint(self):
+        self.feed(True, 20)
+        self.feed(False, 10)
+        self.service.speculative_endpoint.emit.assert_called_once()
+        self.service.audio_captured.emit.assert_not_called()
+
+        self.feed(False, 20)
+        self.service.audio_captured.emit.assert_called_once()
+        self.service.speculation_cancelled.emit.assert_not_called()
+
+    def test_speech_resumes(self):
+        self.feed(True, 20)
+        self.feed(False, 12)
+        self.feed(True, 1)
+        self.service.speculation_cancelled.emit.assert_called_once()
+        self.assertFalse(self.service.speculating)
+
+    def test_short_utterance_not_speculated(self):
+        # 3 speech + 10 silence frames is under the 300ms minimum
+        self.feed(True, 3)
+        self.feed(False, 10)
+        self.service.speculative_endpoint.emit.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
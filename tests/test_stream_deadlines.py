@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import time
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import make_chunk, real_modules, SilentServer
+from src.backend.cancellation import StallWatchdog
+from src.backend.llm_service import LLMService, BACKUP_MODELS
+
+class StallingStream:
+    """Yields `texts`, then hangs (like a provider that stops sending) until closed."""
+    def __init__(self, texts, stall=True):
+        self.texts = texts
+        self.stall = stall
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for text in self.texts:
+            yield make_chunk(text)
+        if self.stall:
+            self.closed.wait(5)
+            raise ConnectionError("stream closed")
+
+    def close(self):
+        self.closed.set()
+
+class TestStallWatchdog(unittest.TestCase):
+    def test_first_token_deadline(self):
+        expired = threading.Event()
+        watchdog = StallWatchdog(first_token_s=0.05, gap_s=1, on_expire=expired.set).start()
+        self.assertTrue(expired.wait(1))
+        self.assertIn("first token", watchdog.expired)
+
+    def test_tokens_keep_it_alive(self):
+        watchdog = StallWatchdog(first_token_s=0.1, gap_s=0.1).start()
+        for _ in range(5):
+            time.sleep(0.04)
+            watchdog.touch()
+        watchdog.stop()
+        self.assertIsNone(watchdog.expired)
+
+    def test_gap_deadline(self):
+        expired = threading.Event()
+        watchdog = StallWatchdog(first_token_s=1, gap_s=0.05, on_expire=expired.set).start()
+        watchdog.touch()
+        self.assertTrue(expired.wait(1))
+        self.assertIn("no token for", watchdog.expired)
+
+class TestDeadlineFailover(unittest.TestCase):
+    def setUp(self):
+        self.service = LLMService(MagicMock(), openrouter_key="test", connect_timeout_s=2,
+                                  first_token_timeout_s=0.2, stall_timeout_s=0.1)
+        self.service.or_client = MagicMock()
+        self.service.story_engine = MagicMock()
+        self.service.story_engine.find_relevant_story.return_value = None
+        self.service.health.background = False
+
+    def test_mid_stream_stall_is_continued_by_next_model(self):
+        first = StallingStream(["I led ", "the migration"])
+        second = StallingStream([" to Postgres."], stall=False)
+        self.service.or_client.chat.completions.create.side_effect = [first, second]
+
+        start = time.monotonic()
+        chunks = list(self.service.generate_answer("Tell me about a project"))
+        self.assertLess(time.monotonic() - start, 2)
+
+        self.assertEqual(chunks, ["I led ", "the migration", " to Postgres."])
+        self.assertTrue(first.closed.is_set())
+        calls = self.service.or_client.chat.completions.create.call_args_list
+        self.assertEqual(calls[1].kwargs["model"], BACKUP_MODELS[1])
+        # The second model is asked to continue the partial answer, not to start over
+        continuation = calls[1].kwargs["messages"]
+        self.assertEqual(continuation[-2], {"role": "assistant", "content": "I led the migration"})
+        self.assertEqual(self.service.transcript_history[-1]["content"], "I led the migration to Postgres.")
+        self.assertEqual(self.service.get_provider_health()[BACKUP_MODELS[0]]["consecutive_failures"], 1)
+
+    def test_no_first_token_fails_over_from_scratch(self):
+        self.service.or_client.chat.completions.create.side_effect = [
+            StallingStream([]), StallingStream(["Fresh answer"], stall=False)
+        ]
+        self.assertEqual(list(self.service.generate_answer("Q")), ["Fresh answer"])
+        second_messages = self.service.or_client.chat.completions.create.call_args.kwargs["messages"]
+        self.assertEqual(second_messages[-1]["role"], "user")
+        self.assertEqual(second_messages[-1]["content"], "Q")
+
+    def test_timeouts_passed_to_the_client(self):
+        self.service.or_client.chat.completions.create.return_value = [make_chunk("Hi")]
+        list(self.service.generate_answer("Q"))
+        timeout = self.service.or_client.chat.completions.create.call_args.kwargs["timeout"]
+        self.assertEqual(timeout.connect, 2)
+        self.assertEqual(timeout.read, 0.2)
+
+class TestHungProvider(unittest.TestCase):
+    def test_failover_within_the_deadline(self):
+        self.enterContext(real_modules("openai"))
+        server = SilentServer()
+        self.addCleanup(server.close)
+        service = LLMService(MagicMock(), openrouter_key="test", connect_timeout_s=1,
+                             first_token_timeout_s=1, stall_timeout_s=1)
+        self.addCleanup(service.pool.close)
+        service.story_engine = MagicMock()
+        service.story_engine.find_relevant_story.return_value = None
+        service.health.background = False
+
+        hung = service.or_client.with_options(base_url=server.url + "/v1") # Same client settings, silent host
+        healthy = MagicMock()
+        healthy.chat.completions.create.return_value = [make_chunk("Answer")]
+        service._client_for = lambda model: hung if model == BACKUP_MODELS[0] else healthy
+
+        start = time.monotonic()
+        self.assertEqual(list(service.generate_answer("Q")), ["Answer"])
+        self.assertLess(time.monotonic() - start, 2) # One attempt, not one per SDK retry
+        self.assertEqual(server.accepted(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
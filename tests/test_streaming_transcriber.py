@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import numpy as np
+
+# Mock sounddevice BEFORE importing the module
+sys.modules['sounddevice'] = MagicMock()
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.streaming_transcriber import StreamingTranscriber, stitch_transcripts
+from src.backend.audio_stream import AudioService
+
+class TestStitching(unittest.TestCase):
+    def test_plain_join(self):
+        self.assertEqual(stitch_transcripts(["Tell me about", "your last project."]),
+                         "Tell me about your last project.")
+
+    def test_overlap_removed(self):
+        parts = ["Tell me about a time you", "time you disagreed with your manager."]
+        self.assertEqual(stitch_transcripts(parts),
+                         "Tell me about a time you disagreed with your manager.")
+
+    def test_overlap_ignores_case_and_punctuation(self):
+        parts = ["Why do you want this job,", "Job? What excites you?"]
+        self.assertEqual(stitch_transcripts(parts), "Why do you want this job, What excites you?")
+
+class TestStreamingTranscriber(unittest.TestCase):
+    def setUp(self):
+        self.llm_service = MagicMock()
+        self.transcriber = StreamingTranscriber(self.llm_service)
+
+    def tearDown(self):
+        self.transcriber.shutdown()
+
+    def test_windows_then_tail(self):
+        self.llm_service.transcribe.side_effect = ["First part", "second part.", "Tail."]
+
+        self.transcriber.feed(b"a" * 10)
+        self.transcriber.feed(b"b" * 10)
+        text = self.transcriber.finish(b"c" * 10).result(timeout=5)
+
+        self.assertEqual(text, "First part second part. Tail.")
+        self.assertEqual(self.llm_service.transcribe.call_count, 3)
+        # Earlier text is passed along as a prompt
+        last_call = self.llm_service.transcribe.call_args
+        self.assertIn("second part.", last_call.kwargs["prompt"])
+
+    def test_empty_tail_skips_round_trip(self):
+        self.llm_service.transcribe.return_value = "Only window"
+        self.transcriber.feed(b"a" * 10)
+        text = self.transcriber.finish(b"").result(timeout=5)
+
+        self.assertEqual(text, "Only window")
+        self.assertEqual(self.llm_service.transcribe.call_count, 1)
+
+    def test_reset_discards_partials(self):
+        self.llm_service.transcribe.side_effect = ["Dropped", "Kept"]
+        self.transcriber.feed(b"a" * 10)
+        self.transcriber.reset()
+        text = self.transcriber.finish(b"b" * 10).result(timeout=5)
+        self.assertEqual(text, "Kept")
+
+class TestAudioWindows(unittest.TestCase):
+    def test_window_emitted_at_pause(self):
+        service = AudioService(streaming_window_ms=200) # 10 frames
+        service.vad = MagicMock()
+        service.audio_segment = MagicMock()
+        service.audio_captured = MagicMock()
+        frame = np.zeros(320, dtype='int16')
+
+        service.vad.is_speech.return_value = True
+        for _ in range(12):
+            service._process_frame(frame)
+        # Window full but no pause yet
+        service.audio_segment.emit.assert_not_called()
+
+        service.vad.is_speech.return_value = False
+        service._process_frame(frame)
+        service.audio_segment.emit.assert_called_once()
+        self.assertEqual(len(service.audio_segment.emit.call_args[0][0]), 13 * 640)
+
+        # Only trailing silence remains, so the final capture carries no audio
+        for _ in range(30):
+            service._process_frame(frame)
+        service.audio_captured.emit.assert_called_once_with(b'')
+
+    def test_hard_cut_without_pause(self):
+        service = AudioService(streaming_window_ms=200)
+        service.vad = MagicMock()
+        service.vad.is_speech.return_value = True
+        service.audio_segment = MagicMock()
+        frame = np.zeros(320, dtype='int16')
+
+        for _ in range(15):
+            service._process_frame(frame)
+        service.audio_segment.emit.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
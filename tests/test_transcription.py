@@ -0,0 +1,251 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from tests.helpers import FakeClock, real_modules, SilentServer
+from src.backend.transcription import (
+    Transcriber, TranscriptionError, GroqTranscriber, LocalWhisperTranscriber, FailoverTranscriber,
+    CachedTranscriber
+)
+from src.backend.database import DatabaseManager
+from src.backend.streaming_transcriber import StreamingTranscriber
+from src.backend.llm_service import LLMService
+
+class StubSegment:
+    def __init__(self, text):
+        self.text = text
+
+class StubWhisperModel:
+    """Stands in for faster_whisper.WhisperModel."""
+    def __init__(self, model_path):
+        self.model_path = model_path
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((audio, kwargs))
+        return iter([StubSegment(" Tell me about"), StubSegment(" yourself. ")]), None
+
+class StubBackend(Transcriber):
+    def __init__(self, name, results, clock=None, delay=0.0):
+        self.name = name
+        self.results = list(results)
+        self.clock = clock
+        self.delay = delay
+        self.calls = 0
+
+    def transcribe(self, audio_bytes, prompt=None):
+        self.calls += 1
+        if self.clock:
+            self.clock.now += self.delay
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+class TestLocalWhisper(unittest.TestCase):
+    def test_loads_lazily_and_converts_pcm(self):
+        models = []
+        def factory(path):
+            models.append(StubWhisperModel(path))
+            return models[-1]
+
+        local = LocalWhisperTranscriber("/models/whisper-small-int8", model_factory=factory)
+        self.assertEqual(models, []) # Nothing loaded until needed
+
+        pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+        self.assertEqual(local.transcribe(pcm, prompt="Hi."), "Tell me about yourself.")
+        local.transcribe(pcm)
+
+        self.assertEqual(len(models), 1)
+        self.assertEqual(models[0].model_path, "/models/whisper-small-int8")
+        audio, kwargs = models[0].calls[0]
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+        self.assertIn("Hi.", kwargs["initial_prompt"])
+
+    def test_unavailable_without_model_path(self):
+        local = LocalWhisperTranscriber("", model_factory=StubWhisperModel)
+        self.assertFalse(local.available())
+        with self.assertRaises(TranscriptionError):
+            local.transcribe(b"\x00\x00" * 10)
+
+    def test_load_failure_is_a_transcription_error(self):
+        def factory(path):
+            raise OSError("no model.bin")
+        with self.assertRaises(TranscriptionError):
+            LocalWhisperTranscriber("/missing", model_factory=factory).transcribe(b"\x00\x00")
+
+class TestGroqTranscriber(unittest.TestCase):
+    def test_api_error_is_raised_not_returned(self):
+        client = MagicMock()
+        client.audio.transcriptions.create.side_effect = RuntimeError("503")
+        with self.assertRaises(TranscriptionError):
+            GroqTranscriber(lambda: client).transcribe(b"\x00\x00" * 100)
+
+    def test_timeout_bounds_the_whole_call(self):
+        self.enterContext(real_modules("groq"))
+        from groq import Groq
+        server = SilentServer()
+        self.addCleanup(server.close)
+        client = Groq(api_key="test", base_url=server.url) # Default SDK retries
+
+        start = time.monotonic()
+        with self.assertRaises(TranscriptionError):
+            GroqTranscriber(lambda: client, timeout_s=1).transcribe(b"\x00\x00" * 100)
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(server.accepted(), 1)
+
+    def test_missing_client(self):
+        groq = GroqTranscriber(lambda: None)
+        self.assertFalse(groq.available())
+        with self.assertRaises(TranscriptionError):
+            groq.transcribe(b"\x00\x00")
+
+class TestFailover(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.audio = b"\x00\x00" * 16000 # 1 second
+
+    def test_error_fails_over_within_the_call(self):
+        groq = StubBackend("groq", [TranscriptionError("down"), "from groq"])
+        local = StubBackend("local", ["from local", "local again"])
+        failover = FailoverTranscriber([groq, local], cooldown_s=30, clock=self.clock)
+
+        self.assertEqual(failover.transcribe(self.audio), "from local")
+        # Demoted: the next call goes to the local backend first
+        self.assertEqual(failover.transcribe(self.audio), "local again")
+        self.assertEqual(groq.calls, 1)
+
+        # After the cooldown the preferred backend is retried
+        self.clock.now += 31
+        self.assertEqual(failover.transcribe(self.audio), "from groq")
+
+    def test_slow_backend_is_demoted(self):
+        groq = StubBackend("groq", ["slow", "fast again"], clock=self.clock, delay=5.0)
+        local = StubBackend("local", ["local"], clock=self.clock, delay=0.5)
+        failover = FailoverTranscriber([groq, local], slow_s=0.5, overhead_s=1.5, cooldown_s=30, clock=self.clock)
+
+        self.assertEqual(failover.transcribe(self.audio), "slow") # Late but still used
+        self.assertEqual(failover.transcribe(self.audio), "local")
+        self.assertEqual(failover.last_backend, "local")
+        self.assertIsNotNone(failover.get_stats()["latency_ms"]["groq"])
+
+    def test_all_failing_raises(self):
+        failover = FailoverTranscriber([StubBackend("groq", [TranscriptionError("a")]),
+                                        StubBackend("local", [TranscriptionError("b")])], clock=self.clock)
+        with self.assertRaises(TranscriptionError):
+            failover.transcribe(self.audio)
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.audio = np.arange(1600, dtype=np.int16)
+
+    def test_identical_audio_hits(self):
+        backend = StubBackend("groq", ["first", "second"])
+        cache = CachedTranscriber(backend, max_entries=8)
+
+        self.assertEqual(cache.transcribe(memoryview(self.audio)), "first")
+        self.assertEqual(cache.transcribe(self.audio.tobytes()), "first") # Same content, different buffer
+        self.assertEqual(backend.calls, 1)
+        # Prompt is part of the key
+        self.assertEqual(cache.transcribe(self.audio.tobytes(), prompt="Earlier text"), "second")
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["cache_hits"], stats["cache_misses"]), (1, 2))
+        self.assertAlmostEqual(stats["cache_hit_rate"], 1 / 3)
+
+    def test_bounded_lru_and_failures_not_cached(self):
+        backend = StubBackend("groq", ["a", "b", "c", TranscriptionError("down"), "unused"])
+        cache = CachedTranscriber(backend, max_entries=2)
+        clips = [bytes([i]) * 100 for i in range(3)]
+
+        for clip in clips:
+            cache.transcribe(clip)
+        self.assertEqual(cache.get_stats()["cache_entries"], 2)
+        self.assertEqual(cache.transcribe(clips[2]), "c") # Still cached
+
+        with self.assertRaises(TranscriptionError):
+            cache.transcribe(clips[0]) # Evicted, and the backend fails
+        self.assertEqual(cache.transcribe(clips[1]), "b") # The failure evicted nothing
+        self.assertEqual(backend.calls, 4)
+        self.assertEqual(backend.results, ["unused"])
+
+    def test_upload_codec_is_part_of_the_key(self):
+        flac, opus = MagicMock(), MagicMock()
+        flac.name, opus.name = "flac", "opus"
+        self.assertNotEqual(GroqTranscriber(lambda: None, flac).signature(),
+                            GroqTranscriber(lambda: None, opus).signature())
+
+    def test_fallback_transcript_not_reused_once_primary_recovers(self):
+        clock = FakeClock()
+        groq = StubBackend("groq", [TranscriptionError("503"), "accurate"])
+        local = StubBackend("local", ["rough", "unused"])
+        cache = CachedTranscriber(FailoverTranscriber([groq, local], cooldown_s=30, clock=clock))
+        audio = self.audio.tobytes()
+
+        self.assertEqual(cache.transcribe(audio), "rough") # Groq failed, local answered
+        self.assertEqual(cache.transcribe(audio), "rough") # Local is still in charge: hit
+        self.assertEqual(local.calls, 1)
+
+        clock.now = 31 # Groq's cooldown is over
+        self.assertEqual(cache.transcribe(audio), "accurate")
+        self.assertEqual(cache.transcribe(audio), "accurate")
+        self.assertEqual(groq.calls, 2)
+
+    def test_persisted_entries_survive_a_new_cache(self):
+        db_path = "data/test_transcription_cache.db"
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        try:
+            db = DatabaseManager(db_path)
+            CachedTranscriber(StubBackend("groq", ["stored"]), store=db).transcribe(self.audio.tobytes())
+
+            backend = StubBackend("groq", [])
+            cache = CachedTranscriber(backend, store=db)
+            self.assertEqual(cache.transcribe(self.audio.tobytes()), "stored")
+            self.assertEqual(backend.calls, 0)
+            self.assertEqual(cache.get_stats()["cache_store_hits"], 1)
+        finally:
+            if os.path.exists(db_path):
+                os.remove(db_path)
+
+class TestServiceIntegration(unittest.TestCase):
+    def test_failed_transcription_is_not_text(self):
+        service = LLMService(db_manager=None, groq_key="test_groq")
+        service.groq_client = MagicMock()
+        service.groq_client.audio.transcriptions.create.side_effect = RuntimeError("timeout")
+        with self.assertRaises(TranscriptionError):
+            service.transcribe(b"\x00\x00" * 100)
+
+    def test_local_backend_takes_over(self):
+        service = LLMService(db_manager=None, groq_key="test_groq", local_whisper_model_path="/models/small",
+                             transcription_backends=["groq", "local"])
+        service.groq_client = MagicMock()
+        service.groq_client.audio.transcriptions.create.side_effect = RuntimeError("timeout")
+        service.transcriber.backends[1].model_factory = StubWhisperModel
+
+        self.assertEqual(service.transcribe(b"\x00\x00" * 100), "Tell me about yourself.")
+
+    def test_streaming_utterance_fails_when_nothing_transcribed(self):
+        llm_service = MagicMock()
+        llm_service.transcribe.side_effect = TranscriptionError("down")
+        transcriber = StreamingTranscriber(llm_service)
+        try:
+            transcriber.feed(b"a" * 10)
+            with self.assertRaises(TranscriptionError):
+                transcriber.finish(b"b" * 10).result(timeout=5)
+
+            # A lost window doesn't sink the rest of the next utterance
+            llm_service.transcribe.side_effect = [TranscriptionError("blip"), "the tail."]
+            transcriber.feed(b"a" * 10)
+            self.assertEqual(transcriber.finish(b"b" * 10).result(timeout=5), "the tail.")
+        finally:
+            transcriber.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
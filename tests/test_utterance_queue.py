@@ -0,0 +1,67 @@
+import unittest
+from concurrent.futures import Future
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.backend.utterance_queue import UtteranceQueue, MergedTranscript
+from src.backend.transcription import TranscriptionError
+
+def done_future(value=None, error=None):
+    future = Future()
+    if error:
+        future.set_exception(error)
+    else:
+        future.set_result(value)
+    return future
+
+class TestUtteranceQueue(unittest.TestCase):
+    def test_fifo_within_capacity(self):
+        q = UtteranceQueue(max_pending=2, policy="drop_oldest")
+        first, second = done_future("Q1"), done_future("Q2")
+        self.assertFalse(q.push(first))
+        self.assertFalse(q.push(second))
+
+        self.assertIs(q.pop(), first)
+        self.assertIs(q.pop(), second)
+        self.assertIsNone(q.pop())
+
+    def test_drop_oldest(self):
+        q = UtteranceQueue(max_pending=1, policy="drop_oldest")
+        q.push(done_future("Q1"))
+        q.push(done_future("Q2"))
+
+        self.assertEqual(len(q), 1)
+        self.assertEqual(q.pop().result(), "Q2")
+        self.assertEqual(q.get_stats()["dropped"], 1)
+
+    def test_merge_joins_follow_ups(self):
+        q = UtteranceQueue(max_pending=1, policy="merge")
+        q.push(done_future("Tell me about your last project."))
+        q.push(done_future("And what went wrong?"))
+
+        merged = q.pop()
+        self.assertIsInstance(merged, MergedTranscript)
+        self.assertEqual(merged.result(), "Tell me about your last project. And what went wrong?")
+        self.assertEqual(q.get_stats()["merged"], 1)
+
+    def test_merge_skips_failed_parts(self):
+        merged = MergedTranscript([done_future(error=TranscriptionError("down")), done_future("Why us?")])
+        self.assertEqual(merged.result(), "Why us?")
+
+        with self.assertRaises(TranscriptionError):
+            MergedTranscript([done_future(error=TranscriptionError("down"))]).result()
+
+    def test_preempt_requests_cancel(self):
+        q = UtteranceQueue(max_pending=1, policy="preempt")
+        self.assertTrue(q.push(done_future("Q1")))
+        self.assertTrue(q.push(done_future("Q2")))
+        self.assertEqual(q.pop().result(), "Q2")
+
+    def test_disabled_and_unknown_policy(self):
+        self.assertFalse(UtteranceQueue(max_pending=0).enabled)
+        self.assertEqual(UtteranceQueue(policy="lifo").policy, "merge")
+
+if __name__ == '__main__':
+    unittest.main()